@@ -0,0 +1,33 @@
+"""Index created_at for window aggregation queries
+
+Revision ID: 20241114_0003
+Revises: 20241114_0002
+Create Date: 2025-11-14 16:30:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "20241114_0003"
+down_revision: Union[str, None] = "20241114_0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_analysis_logs_created_at",
+        "analysis_logs",
+        ["created_at"],
+    )
+    op.create_index(
+        "ix_filter_audits_created_at",
+        "filter_audits",
+        ["created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_filter_audits_created_at", table_name="filter_audits")
+    op.drop_index("ix_analysis_logs_created_at", table_name="analysis_logs")
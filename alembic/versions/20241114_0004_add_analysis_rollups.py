@@ -0,0 +1,38 @@
+"""Add analysis_rollups table
+
+Revision ID: 20241114_0004
+Revises: 20241114_0003
+Create Date: 2025-11-14 17:10:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "20241114_0004"
+down_revision: Union[str, None] = "20241114_0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "analysis_rollups",
+        sa.Column("id", sa.String(length=36), primary_key=True),
+        sa.Column("resolution", sa.String(length=8), nullable=False),
+        sa.Column("term", sa.String(length=64), nullable=False),
+        sa.Column("bucket", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("label", sa.String(length=32), nullable=False),
+        sa.Column("count", sa.Integer, nullable=False),
+        sa.Column("crisis_sum", sa.Float, nullable=False),
+        sa.Column("crisis_max", sa.Float, nullable=False),
+        sa.Column("high_risk_count", sa.Integer, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.UniqueConstraint("resolution", "term", "bucket", "label", name="uq_analysis_rollups_key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("analysis_rollups")
@@ -0,0 +1,34 @@
+"""Add analysis_log_terms inverted index
+
+Revision ID: 20241114_0005
+Revises: 20241114_0004
+Create Date: 2025-11-14 18:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "20241114_0005"
+down_revision: Union[str, None] = "20241114_0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "analysis_log_terms",
+        sa.Column("term", sa.String(length=64), primary_key=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), primary_key=True),
+        sa.Column(
+            "log_id",
+            sa.String(length=36),
+            sa.ForeignKey("analysis_logs.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("analysis_log_terms")
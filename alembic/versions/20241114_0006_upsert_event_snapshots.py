@@ -0,0 +1,78 @@
+"""Keep one event snapshot per keyword and window and store mergeable state
+
+Revision ID: 20241114_0006
+Revises: 20241114_0005
+Create Date: 2025-11-14 18:40:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "20241114_0006"
+down_revision: Union[str, None] = "20241114_0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+snapshots = sa.table(
+    "event_snapshots",
+    sa.column("id", sa.String(36)),
+    sa.column("window_start", sa.DateTime(timezone=True)),
+    sa.column("window_end", sa.DateTime(timezone=True)),
+    sa.column("hours", sa.Integer),
+)
+
+# Newest snapshot first; older ones with the same key are superseded.
+_DELETE_SUPERSEDED = """
+    DELETE FROM event_snapshots
+    WHERE EXISTS (
+        SELECT 1 FROM event_snapshots AS newer
+        WHERE {same_key}
+          AND (
+            newer.window_end > event_snapshots.window_end
+            OR (newer.window_end = event_snapshots.window_end AND newer.id > event_snapshots.id)
+          )
+    )
+"""
+
+
+def upgrade() -> None:
+    op.add_column(
+        "event_snapshots", sa.Column("hours", sa.Integer, nullable=False, server_default="6")
+    )
+    op.add_column(
+        "event_snapshots",
+        sa.Column("resolution", sa.String(length=8), nullable=False, server_default="hour"),
+    )
+    op.add_column("event_snapshots", sa.Column("state", sa.JSON, nullable=True))
+    # Existing rows carry no window length; derive it from their bounds.
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(snapshots.c.id, snapshots.c.window_start, snapshots.c.window_end)
+    ).all()
+    for snapshot_id, window_start, window_end in rows:
+        hours = max(1, round((window_end - window_start).total_seconds() / 3600))
+        bind.execute(
+            sa.update(snapshots).where(snapshots.c.id == snapshot_id).values(hours=hours)
+        )
+    op.execute(
+        _DELETE_SUPERSEDED.format(
+            same_key="newer.keyword = event_snapshots.keyword"
+            " AND newer.hours = event_snapshots.hours"
+            " AND newer.resolution = event_snapshots.resolution"
+        )
+    )
+    op.create_index(
+        "uq_event_snapshots_window",
+        "event_snapshots",
+        ["keyword", "hours", "resolution"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_event_snapshots_window", table_name="event_snapshots")
+    op.drop_column("event_snapshots", "state")
+    op.drop_column("event_snapshots", "resolution")
+    op.drop_column("event_snapshots", "hours")
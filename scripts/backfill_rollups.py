@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.config.settings import get_settings
+from src.data.rollup_repo import AnalysisRollupRepository, truncate
+from src.models.analysis_log import AnalysisLog
+from src.models.analysis_rollup import AnalysisRollup
+
+
+async def backfill(session_factory, since: datetime | None, batch_size: int, max_terms: int) -> int:
+    """Rebuild ``analysis_rollups`` from ``analysis_logs`` (from ``since`` on, if given)."""
+    async with session_factory() as session:
+        stmt = delete(AnalysisRollup)
+        if since is not None:
+            stmt = stmt.where(AnalysisRollup.bucket >= since)
+        await session.execute(stmt)
+        await session.commit()
+
+    processed = 0
+    cursor: tuple[datetime, object] | None = None
+    while True:
+        async with session_factory() as session:
+            stmt = select(
+                AnalysisLog.id,
+                AnalysisLog.text,
+                AnalysisLog.label,
+                AnalysisLog.crisis_probability,
+                AnalysisLog.created_at,
+            )
+            if since is not None:
+                stmt = stmt.where(AnalysisLog.created_at >= since)
+            if cursor is not None:
+                stmt = stmt.where(tuple_(AnalysisLog.created_at, AnalysisLog.id) > cursor)
+            stmt = stmt.order_by(AnalysisLog.created_at, AnalysisLog.id).limit(batch_size)
+            rows = (await session.execute(stmt)).mappings().all()
+            if not rows:
+                return processed
+            await AnalysisRollupRepository(session, max_terms=max_terms).apply(rows)
+            await session.commit()
+        processed += len(rows)
+        cursor = (rows[-1]["created_at"], rows[-1]["id"])
+        print(f"rolled up {processed} logs (through {cursor[0].isoformat()})")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild analysis_rollups from analysis_logs")
+    parser.add_argument(
+        "--since-hours",
+        type=int,
+        default=None,
+        help="Only rebuild the most recent N hours (default: everything)",
+    )
+    parser.add_argument("--batch-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    since = None
+    if args.since_hours is not None:
+        since = truncate(datetime.utcnow() - timedelta(hours=args.since_hours), "hour")
+    engine = create_async_engine(settings.database.url, future=True)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    total = await backfill(session_factory, since, args.batch_size, settings.rollups.max_terms_per_log)
+    await engine.dispose()
+    print(f"Backfilled rollups from {total} analysis logs.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.data.event_aggregate_repo import EventAggregateRepository
+from src.data.term_index_repo import TermIndexRepository
+from src.db.base import Base
+from src.models.analysis_log import AnalysisLog
+from src.models.analysis_log_term import AnalysisLogTerm
+
+LABELS = ("positive", "neutral", "negative")
+# Fixed-width filler words, so no word is a substring of another and both paths agree.
+VOCABULARY = [f"w{idx:05d}" for idx in range(20000)]
+CJK_PHRASES = ["地震救援", "洪水预警", "台风登陆", "森林火灾"]
+KEYWORDS = {"earthquake": 0.01, "wildfire": 0.001, "地震": 0.005}
+
+
+def _text(rng: random.Random) -> str:
+    words = rng.sample(VOCABULARY, 12)
+    for keyword, rate in KEYWORDS.items():
+        if rng.random() < rate:
+            words.insert(rng.randrange(len(words)), keyword if keyword.isascii() else "地震救援")
+    if rng.random() < 0.05:
+        words.append(rng.choice(CJK_PHRASES))
+    return " ".join(words)
+
+
+async def populate(session_factory, rows: int, days: int, chunk: int = 20000) -> None:
+    rng = random.Random(7)
+    now = datetime.utcnow()
+    done = 0
+    while done < rows:
+        logs = []
+        for _ in range(min(chunk, rows - done)):
+            probability = rng.random()
+            logs.append(
+                {
+                    "id": uuid.uuid4(),
+                    "request_id": "bench",
+                    "text_hash": "bench",
+                    "text": _text(rng),
+                    "label": rng.choice(LABELS),
+                    "empathy_score": 0.0,
+                    "crisis_probability": probability,
+                    "evidence": [],
+                    "model_version": "bench",
+                    "created_at": now - timedelta(seconds=rng.uniform(0, days * 86400)),
+                    "updated_at": now,
+                }
+            )
+        async with session_factory() as session:
+            await session.execute(insert(AnalysisLog), logs)
+            terms = TermIndexRepository(session, max_terms=512).term_rows(logs)
+            await session.execute(insert(AnalysisLogTerm), terms)
+            await session.commit()
+        done += len(logs)
+        print(f"populated {done}/{rows} logs", flush=True)
+
+
+async def measure(session_factory, keyword: str, hours: int, indexed: bool, repeat: int):
+    window_start = datetime.utcnow() - timedelta(hours=hours)
+    timings = []
+    count = 0
+    for _ in range(repeat):
+        async with session_factory() as session:
+            repo = EventAggregateRepository(
+                session, term_index=TermIndexRepository(session) if indexed else None
+            )
+            start = time.perf_counter()
+            summary = await repo.crisis_summary(keyword, window_start)
+            await repo.label_counts(keyword, window_start)
+            await repo.top_quotes(keyword, window_start)
+            timings.append((time.perf_counter() - start) * 1000)
+            count = summary.count
+    return statistics.median(timings), count
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare event keyword lookup through analysis_log_terms with the ilike scan"
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=30, help="Spread of created_at values")
+    parser.add_argument("--hours", type=int, default=72, help="Event window queried")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--db", type=Path, default=None, help="Reuse or create this SQLite file")
+    args = parser.parse_args()
+
+    db_path = args.db or Path(tempfile.mkdtemp()) / "term_index_bench.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", future=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    if not await _has_rows(session_factory):
+        await populate(session_factory, args.rows, args.days)
+
+    print(f"\n{'keyword':<12}{'ilike ms':>12}{'index ms':>12}{'speedup':>10}{'rows':>10}")
+    for keyword in KEYWORDS:
+        scan_ms, scan_count = await measure(session_factory, keyword, args.hours, False, args.repeat)
+        index_ms, index_count = await measure(session_factory, keyword, args.hours, True, args.repeat)
+        note = "" if scan_count == index_count else f"  (ilike matched {scan_count})"
+        print(
+            f"{keyword:<12}{scan_ms:>12.1f}{index_ms:>12.1f}{scan_ms / index_ms:>9.1f}x"
+            f"{index_count:>10}{note}"
+        )
+    await engine.dispose()
+
+
+async def _has_rows(session_factory) -> bool:
+    async with session_factory() as session:
+        return await session.scalar(select(AnalysisLog.id).limit(1)) is not None
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.config.settings import get_settings
+from src.data.term_index_repo import TermIndexRepository
+from src.models.analysis_log import AnalysisLog
+from src.models.analysis_log_term import AnalysisLogTerm
+
+
+async def rebuild(session_factory, batch_size: int, max_terms: int) -> int:
+    """Rebuild ``analysis_log_terms`` from every row of ``analysis_logs``."""
+    async with session_factory() as session:
+        await session.execute(delete(AnalysisLogTerm))
+        await session.commit()
+
+    processed = 0
+    cursor: tuple[datetime, object] | None = None
+    while True:
+        async with session_factory() as session:
+            stmt = select(AnalysisLog.id, AnalysisLog.text, AnalysisLog.created_at)
+            if cursor is not None:
+                stmt = stmt.where(tuple_(AnalysisLog.created_at, AnalysisLog.id) > cursor)
+            stmt = stmt.order_by(AnalysisLog.created_at, AnalysisLog.id).limit(batch_size)
+            rows = (await session.execute(stmt)).mappings().all()
+            if not rows:
+                return processed
+            await TermIndexRepository(session, max_terms=max_terms).index(rows)
+            await session.commit()
+        processed += len(rows)
+        cursor = (rows[-1]["created_at"], rows[-1]["id"])
+        print(f"indexed {processed} logs (through {cursor[0].isoformat()})")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild analysis_log_terms from analysis_logs")
+    parser.add_argument("--batch-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    engine = create_async_engine(settings.database.url, future=True)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    total = await rebuild(session_factory, args.batch_size, settings.term_index.max_terms_per_log)
+    await engine.dispose()
+    print(f"Indexed terms of {total} analysis logs.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -7,6 +7,7 @@ from .event import router as event_router
 from .search import router as search_router
 from .chat import router as chat_router
 from .suggest import router as suggest_router
+from .admin import router as admin_router
 
 __all__ = ["register_routes"]
 
@@ -19,3 +20,4 @@ def register_routes(app: FastAPI) -> None:
     app.include_router(search_router, tags=["search"])
     app.include_router(chat_router, tags=["chat"])
     app.include_router(suggest_router, tags=["suggest"])
+    app.include_router(admin_router, tags=["admin"])
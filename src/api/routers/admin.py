@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Query
+
+from src.core.nlp.rule_matcher import get_rule_matcher
+from src.schemas.admin import RuleLintFinding, RuleProfileResponse, SlowRule
+
+router = APIRouter(prefix="/api/admin")
+
+
+@router.get(
+    "/rules/profile",
+    response_model=RuleProfileResponse,
+    summary="Slowest rules by sampled evaluation time, plus linter findings",
+)
+async def rule_profile(limit: int = Query(10, ge=1, le=100)) -> RuleProfileResponse:
+    matcher = get_rule_matcher()
+    profiler = matcher.profiler
+    return RuleProfileResponse(
+        rule_version=matcher.version or None,
+        rule_count=len(matcher.rules),
+        sample_rate=matcher.profile_sample_rate,
+        sampled_evaluations=profiler.sampled_evaluations,
+        slow_rules=[
+            SlowRule(
+                rule_id=rule_id,
+                samples=stats.samples,
+                hits=stats.hits,
+                mean_ms=round(stats.mean_seconds * 1000, 4),
+                max_ms=round(stats.max_seconds * 1000, 4),
+                total_ms=round(stats.total_seconds * 1000, 4),
+            )
+            for rule_id, stats in profiler.top(limit)
+        ],
+        lint_mode=matcher.lint_mode,
+        lint_findings=[RuleLintFinding(**finding.as_dict()) for finding in matcher.lint_findings],
+    )
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import time
+
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from src.schemas.analyze import AnalyzeTextRequest, AnalyzeTextResponse
+from src.schemas.analyze import (
+    AnalyzeBatchRequest,
+    AnalyzeBatchResponse,
+    AnalyzeTextRequest,
+    AnalyzeTextResponse,
+)
 from src.services.analyzer import AnalyzerService, get_analyzer_service
 
 router = APIRouter(prefix="/api")
@@ -22,3 +29,17 @@ async def analyze_text_endpoint(
 
     result = await service.analyze_text(payload.text)
     return AnalyzeTextResponse.from_result(result)
+
+
+@router.post(
+    "/analyze_batch",
+    response_model=AnalyzeBatchResponse,
+    summary="Analyze a list of texts in one call",
+)
+async def analyze_batch_endpoint(
+    payload: AnalyzeBatchRequest,
+    service: AnalyzerService = Depends(get_analyzer_service),
+) -> AnalyzeBatchResponse:
+    start = time.perf_counter()
+    items = await service.analyze_batch(payload.texts)
+    return AnalyzeBatchResponse.from_items(items, (time.perf_counter() - start) * 1000)
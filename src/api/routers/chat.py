@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
 
 from src.data.chat_message_repo import ChatMessageRepository
 from src.db.session import get_session
+from src.db.write_behind import get_write_behind
 from src.schemas.chat import ChatMessagePayload
 from src.services.analyzer import AnalyzerService, get_analyzer_service
 from src.services.chat_gateway import ChatGateway
@@ -15,7 +16,7 @@ async def get_gateway(
     analyzer: AnalyzerService = Depends(get_analyzer_service),
     session=Depends(get_session),
 ) -> ChatGateway:
-    repo = ChatMessageRepository(session)
+    repo = ChatMessageRepository(session, writer=get_write_behind())
     return ChatGateway(analyzer=analyzer, repo=repo)
 
 
@@ -3,7 +3,8 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from src.schemas.event import EventRequest, EventInsight
-from src.services.event_analyzer import EventAnalyzerService, get_event_analyzer_service
+from src.services.event_analyzer import EventAnalyzerFactory, get_event_analyzer_factory
+from src.services.event_precompute import get_event_precompute
 
 router = APIRouter(prefix="/api")
 
@@ -15,9 +16,14 @@ router = APIRouter(prefix="/api")
 )
 async def analyze_event_endpoint(
     payload: EventRequest,
-    service: EventAnalyzerService = Depends(get_event_analyzer_service),
+    open_service: EventAnalyzerFactory = Depends(get_event_analyzer_factory),
 ) -> EventInsight:
     if not payload.keyword.strip():
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Keyword is required")
 
-    return await service.analyze_event(payload.keyword.strip(), payload.hours)
+    keyword = payload.keyword.strip()
+    scheduler = get_event_precompute()
+    if scheduler is not None:
+        return await scheduler.get(keyword, payload.hours, payload.resolution)
+    async with open_service() as service:
+        return await service.analyze_event(keyword, payload.hours, payload.resolution)
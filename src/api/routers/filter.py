@@ -2,7 +2,14 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from src.schemas.filter import FilterRequest, FilterResponse, FilterDecision, FilterEvidence
+from src.schemas.filter import (
+    FilterBatchRequest,
+    FilterBatchResponse,
+    FilterDecision,
+    FilterEvidence,
+    FilterRequest,
+    FilterResponse,
+)
 from src.services.filter import FilterService, get_filter_service
 
 router = APIRouter(prefix="/api")
@@ -20,10 +27,25 @@ async def filter_endpoint(
     if not payload.text.strip():
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Text is empty")
 
-    decision, allow, matches, analyzer_result = await service.filter_text(payload.text)
+    decision, allow, matches, analyzer_result = await service.filter_text(
+        payload.text, bypass_cache=payload.bypass_cache
+    )
 
     evidence = [
         FilterEvidence(**match.model_dump())
         for match in matches
     ]
     return FilterResponse.from_decision(decision, allow, evidence, analyzer_result)
+
+
+@router.post(
+    "/filter_batch",
+    response_model=FilterBatchResponse,
+    summary="Filter a page of texts with one bulk audit write",
+)
+async def filter_batch_endpoint(
+    payload: FilterBatchRequest,
+    service: FilterService = Depends(get_filter_service),
+) -> FilterBatchResponse:
+    batch = await service.filter_batch(payload.texts, bypass_cache=payload.bypass_cache)
+    return FilterBatchResponse.from_batch(batch)
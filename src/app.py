@@ -8,10 +8,17 @@ from prometheus_client import make_asgi_app
 
 from src.api.routers import register_routes
 from src.config.settings import AppSettings, get_settings
+from src.core.executors import shutdown_executors
 from src.core.logging.config import configure_logging, get_logger
+from src.core.nlp.llm_transport import close_llm_transport, get_llm_transport
+from src.core.nlp.process_stages import shutdown_stage_pool
+from src.core.nlp.rule_matcher import start_rule_watcher, stop_rule_watcher
+from src.db.audit_spool import start_audit_loader, stop_audit_loader
+from src.db.write_behind import get_write_behind, stop_write_behind
 from src.middleware.logging import LoggingMiddleware
 from src.middleware.metrics import MetricsMiddleware
 from src.security.auth import APIKeyMiddleware, RateLimitMiddleware
+from src.services.event_precompute import start_event_precompute, stop_event_precompute
 
 
 def create_app(settings: AppSettings | None = None) -> FastAPI:
@@ -26,7 +33,21 @@ def create_app(settings: AppSettings | None = None) -> FastAPI:
             environment=settings.app_env,
             api_prefix=settings.api_prefix,
         )
+        get_llm_transport()
+        start_rule_watcher()
+        write_behind = get_write_behind()
+        if write_behind is not None:
+            write_behind.start()
+        start_audit_loader()
+        start_event_precompute()
         yield
+        await stop_event_precompute()
+        stop_rule_watcher()
+        await stop_write_behind()
+        await stop_audit_loader()
+        await close_llm_transport()
+        shutdown_stage_pool()
+        shutdown_executors()
         logger.info("app.shutdown")
 
     app = FastAPI(title=settings.app_name, debug=settings.debug, lifespan=lifespan)
@@ -34,6 +34,132 @@ class LLMSettings(BaseSettings):
     model: str = Field("gpt-4o-mini", description="LLM model name")
     timeout_seconds: float = Field(6.0, ge=1.0, description="LLM request timeout")
     enabled: bool = Field(True, description="Whether to attempt LLM classification when configured")
+    max_connections: int = Field(20, ge=1, description="Connection pool size of the shared LLM client")
+    max_keepalive_connections: int = Field(10, ge=0, description="Idle connections kept open")
+    keepalive_expiry_seconds: float = Field(30.0, ge=0, description="Idle connection lifetime")
+    http2: bool = Field(True, description="Use HTTP/2 when the h2 package is installed")
+    latency_budget_ms: float = Field(
+        2000.0, gt=0, description="Per-request wait for the LLM before using keyword results"
+    )
+    retry_attempts: int = Field(2, ge=1, description="Attempts per LLM call for transient errors")
+    breaker_failure_threshold: int = Field(5, ge=1, description="Consecutive failures that open the circuit")
+    breaker_reset_seconds: float = Field(30.0, gt=0, description="Open time before a half-open probe")
+    batch_enabled: bool = Field(False, description="Micro-batch concurrent classify calls")
+    batch_max_size: int = Field(16, ge=1, description="Max items per micro-batch")
+    batch_max_wait_ms: float = Field(5.0, ge=0, description="Max time an item waits for its batch")
+
+
+class CacheSettings(BaseSettings):
+    enabled: bool = Field(True, description="Cache analyzer results by text hash and model version")
+    max_entries: int = Field(10_000, ge=1, description="In-process LRU capacity")
+    ttl_seconds: float = Field(600.0, gt=0, description="In-process entry lifetime")
+    disk_path: str | None = Field(
+        default=None, description="SQLite file shared by all workers (e.g., ./data/analysis_cache.db)"
+    )
+    disk_ttl_seconds: float = Field(3600.0, gt=0, description="Shared tier entry lifetime")
+
+
+class PipelineSettings(BaseSettings):
+    executor_workers: int = Field(4, ge=1, description="Threads for CPU-bound keyword/rule stages")
+    max_concurrency: int = Field(16, ge=1, description="Concurrent items per batch analysis")
+    execution_mode: Literal["thread", "process"] = Field(
+        "thread", description="Run keyword/rule stages on threads or on a process pool"
+    )
+    process_workers: int = Field(0, ge=0, description="Process pool size (0 = CPU count)")
+
+
+class RulesSettings(BaseSettings):
+    watch_enabled: bool = Field(True, description="Reload rules in the background when files change")
+    poll_interval_seconds: float = Field(
+        2.0, gt=0, description="Polling interval when filesystem notifications are unavailable"
+    )
+    cache_dir: str | None = Field(
+        None, description="Directory for compiled ruleset artifacts keyed by content hash"
+    )
+    lint_mode: Literal["off", "warn", "quarantine", "reject"] = Field(
+        "warn", description="What to do with regexes that show super-linear backtracking"
+    )
+    lint_budget_ms: float = Field(10.0, gt=0, description="Max adversarial-input search time per regex")
+    lint_timeout_ms: float = Field(1000.0, gt=0, description="Hard cap for benchmarking a single regex")
+    profile_sample_rate: float = Field(
+        0.01, ge=0, le=1, description="Fraction of rule matches timed per rule"
+    )
+
+
+class FilterSettings(BaseSettings):
+    short_circuit_actions: list[str] = Field(
+        default_factory=lambda: ["escalate", "block"],
+        description="Rule actions that decide /api/filter without the full analyzer",
+    )
+    defer_analysis: bool = Field(
+        True, description="Run and log the full analysis in the background after a short-circuit"
+    )
+    deferred_concurrency: int = Field(4, ge=1, description="Deferred full analyses running at once")
+    deferred_max_pending: int = Field(
+        1000, ge=1, description="Deferred analyses queued or running before new ones are skipped"
+    )
+    decision_cache_enabled: bool = Field(True, description="Serve repeated texts from cached decisions")
+    decision_cache_max_entries: int = Field(10000, ge=1)
+    decision_cache_ttl_seconds: int = Field(300, ge=1)
+
+
+class WriteBehindSettings(BaseSettings):
+    enabled: bool = Field(False, description="Queue analysis logs and chat messages for batched inserts")
+    max_queue_size: int = Field(10000, ge=1, description="Rows held before producers must wait")
+    batch_size: int = Field(500, ge=1, description="Rows per multi-row INSERT")
+    flush_interval_ms: int = Field(200, ge=1, description="Max time a row waits before a flush")
+
+
+class AuditSpoolSettings(BaseSettings):
+    enabled: bool = Field(False, description="Append filter audits to a local durable log before loading")
+    directory: str = Field(
+        "./data/audit_spool", description="Base directory; each worker process claims its own worker-N slot"
+    )
+    segment_max_bytes: int = Field(64 * 1024 * 1024, ge=1024, description="Size at which a segment is sealed")
+    fsync_interval_ms: float = Field(2.0, ge=0, description="Time a group fsync waits for more appends")
+    load_batch_size: int = Field(1000, ge=1, description="Rows per bulk INSERT into filter_audits")
+    load_interval_seconds: float = Field(1.0, gt=0, description="Pause between loader passes")
+
+
+class RollupSettings(BaseSettings):
+    enabled: bool = Field(
+        False, description="Maintain analysis_rollups on every log write and serve event series from them"
+    )
+    max_terms_per_log: int = Field(64, ge=1, description="Distinct terms of one text counted in the rollups")
+
+
+class TermIndexSettings(BaseSettings):
+    enabled: bool = Field(
+        False, description="Index analysis_logs terms on write and resolve event keywords through the index"
+    )
+    max_terms_per_log: int = Field(512, ge=1, description="Distinct terms of one text added to the index")
+
+
+class EventSettings(BaseSettings):
+    incremental_snapshots: bool = Field(
+        True, description="Extend the stored snapshot with newer logs instead of recomputing the window"
+    )
+    full_refresh_seconds: float = Field(
+        900.0, gt=0, description="Recompute a snapshot from scratch at least this often"
+    )
+    settle_seconds: float = Field(
+        2.0, ge=0, description="Event windows end this long before now so late-committed logs still count"
+    )
+    precompute_enabled: bool = Field(
+        False, description="Keep the most requested event windows refreshed in the background"
+    )
+    precompute_interval_seconds: float = Field(30.0, gt=0, description="Pause between refresh rounds")
+    precompute_jitter_seconds: float = Field(
+        5.0, ge=0, description="Random extra pause so workers do not refresh in lockstep"
+    )
+    precompute_hot_keys: int = Field(20, ge=1, description="Hottest keyword windows refreshed per round")
+    precompute_max_concurrency: int = Field(4, ge=1, description="Refreshes running at the same time")
+    precompute_fresh_seconds: float = Field(
+        60.0, gt=0, description="Age up to which a precomputed insight or snapshot is served as is"
+    )
+    precompute_decay: float = Field(
+        0.5, gt=0, lt=1, description="Factor applied to request counts after every round"
+    )
 
 
 class AppSettings(BaseSettings):
@@ -46,6 +172,15 @@ class AppSettings(BaseSettings):
     security: SecuritySettings = SecuritySettings(api_key="demo-key")
     observability: ObservabilitySettings = ObservabilitySettings()
     llm: LLMSettings = LLMSettings()
+    cache: CacheSettings = CacheSettings()
+    pipeline: PipelineSettings = PipelineSettings()
+    rules: RulesSettings = RulesSettings()
+    filter: FilterSettings = FilterSettings()
+    write_behind: WriteBehindSettings = WriteBehindSettings()
+    audit_spool: AuditSpoolSettings = AuditSpoolSettings()
+    rollups: RollupSettings = RollupSettings()
+    term_index: TermIndexSettings = TermIndexSettings()
+    events: EventSettings = EventSettings()
 
     model_registry_path: str = Field("./models")
     rules_path: str = Field("./rules")
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Generic, TypeVar
+
+from prometheus_client import Counter
+
+CACHE_REQUESTS = Counter(
+    "dep_cache_requests_total",
+    "Cache lookups by cache, tier and outcome",
+    labelnames=("cache", "tier", "result"),
+)
+CACHE_EVICTIONS = Counter(
+    "dep_cache_evictions_total",
+    "Cache entries dropped by cache, tier and reason",
+    labelnames=("cache", "tier", "reason"),
+)
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Bounded in-process LRU cache whose entries also expire after ``ttl_seconds``."""
+
+    def __init__(self, name: str, max_entries: int, ttl_seconds: float) -> None:
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                CACHE_REQUESTS.labels(self.name, "memory", "miss").inc()
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                CACHE_EVICTIONS.labels(self.name, "memory", "expired").inc()
+                CACHE_REQUESTS.labels(self.name, "memory", "miss").inc()
+                return None
+            self._entries.move_to_end(key)
+        CACHE_REQUESTS.labels(self.name, "memory", "hit").inc()
+        return value
+
+    def set(self, key: str, value: V) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                CACHE_EVICTIONS.labels(self.name, "memory", "capacity").inc()
+
+    def clear(self, reason: str = "invalidated") -> None:
+        with self._lock:
+            dropped = len(self._entries)
+            self._entries.clear()
+        if dropped:
+            CACHE_EVICTIONS.labels(self.name, "memory", reason).inc(dropped)
+
+
+class SQLiteCache:
+    """Shared on-disk cache tier; safe to use from several worker processes."""
+
+    _PURGE_EVERY = 500
+
+    def __init__(self, name: str, path: str, ttl_seconds: float) -> None:
+        self.name = name
+        self.path = Path(path).resolve()
+        self.ttl_seconds = ttl_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            "key TEXT PRIMARY KEY, version TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        CACHE_REQUESTS.labels(self.name, "disk", "hit" if row else "miss").inc()
+        return row[0] if row else None
+
+    def set(self, key: str, version: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, version, value, expires_at) VALUES (?, ?, ?, ?)",
+                (key, version, value, time.time() + self.ttl_seconds),
+            )
+            self._writes += 1
+            if self._writes % self._PURGE_EVERY == 0:
+                purged = self._conn.execute(
+                    "DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),)
+                ).rowcount
+                if purged:
+                    CACHE_EVICTIONS.labels(self.name, "disk", "expired").inc(purged)
+            self._conn.commit()
+
+    def drop_other_versions(self, version: str) -> None:
+        with self._lock:
+            dropped = self._conn.execute(
+                "DELETE FROM cache_entries WHERE version != ?", (version,)
+            ).rowcount
+            self._conn.commit()
+        if dropped:
+            CACHE_EVICTIONS.labels(self.name, "disk", "invalidated").inc(dropped)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
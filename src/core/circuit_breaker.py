@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+import time
+from enum import Enum
+
+from prometheus_client import Gauge
+
+from src.core.logging.config import get_logger
+
+CIRCUIT_STATE = Gauge(
+    "dep_circuit_breaker_state",
+    "Circuit breaker state (0=closed, 1=half_open, 2=open)",
+    labelnames=("name",),
+)
+
+
+class CircuitState(str, Enum):
+    closed = "closed"
+    half_open = "half_open"
+    open = "open"
+
+
+_STATE_VALUES = {CircuitState.closed: 0, CircuitState.half_open: 1, CircuitState.open: 2}
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures.
+
+    While open every call is rejected. Once ``reset_timeout_seconds`` have
+    passed, exactly one caller is granted a probe (half-open); its outcome
+    closes the circuit again or re-opens it for another timeout.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout_seconds: float = 30.0) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self._state = CircuitState.closed
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+        self.logger = get_logger(__name__)
+        CIRCUIT_STATE.labels(name).set(0)
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    def allow_request(self) -> bool:
+        return self._state is CircuitState.closed
+
+    def try_acquire_probe(self) -> bool:
+        """Move an expired open circuit to half-open; True for the single prober."""
+        with self._lock:
+            if self._state is not CircuitState.open:
+                return False
+            if time.monotonic() - self._opened_at < self.reset_timeout_seconds:
+                return False
+            self._set_state(CircuitState.half_open)
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            if self._state is not CircuitState.closed:
+                self._set_state(CircuitState.closed)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state is CircuitState.half_open or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                if self._state is not CircuitState.open:
+                    self._set_state(CircuitState.open)
+
+    def _set_state(self, state: CircuitState) -> None:
+        self.logger.warning("circuit_breaker.transition", name=self.name, old=self._state.value, new=state.value)
+        self._state = state
+        CIRCUIT_STATE.labels(self.name).set(_STATE_VALUES[state])
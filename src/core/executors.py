@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config.settings import get_settings
+
+_cpu_executor: ThreadPoolExecutor | None = None
+
+
+def get_cpu_executor() -> ThreadPoolExecutor:
+    """Bounded executor for CPU-bound pipeline stages, kept off the event loop thread."""
+    global _cpu_executor
+    if _cpu_executor is None:
+        _cpu_executor = ThreadPoolExecutor(
+            max_workers=get_settings().pipeline.executor_workers,
+            thread_name_prefix="dep-cpu",
+        )
+    return _cpu_executor
+
+
+def shutdown_executors() -> None:
+    global _cpu_executor
+    if _cpu_executor is not None:
+        _cpu_executor.shutdown(wait=True, cancel_futures=True)
+        _cpu_executor = None
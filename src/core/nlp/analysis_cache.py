@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+from functools import lru_cache
+
+from src.config.settings import get_settings
+from src.core.cache import SQLiteCache, TTLCache
+from src.core.nlp.types import AnalyzerResult
+
+
+class AnalysisCache:
+    """Two-tier cache of analyzer results keyed by text hash and model versions.
+
+    The in-process LRU answers repeats within a worker; the optional SQLite tier
+    is shared by every worker pointing at the same file. A change of the
+    pipeline version token (new manifest or LLM model) drops stale entries.
+    The ``*_async`` accessors run the SQLite work on a worker thread, so a
+    busy database file does not stall the event loop.
+    """
+
+    def __init__(self, memory: TTLCache[AnalyzerResult], disk: SQLiteCache | None = None) -> None:
+        self.memory = memory
+        self.disk = disk
+        self._version: str | None = None
+
+    @staticmethod
+    def _key(text_hash: str, version: str) -> str:
+        return f"{version}:{text_hash}"
+
+    def _ensure_version(self, version: str) -> None:
+        if version == self._version:
+            return
+        if self._version is not None:
+            self.memory.clear("invalidated")
+            if self.disk is not None:
+                self.disk.drop_other_versions(version)
+        self._version = version
+
+    def get(self, text_hash: str, version: str) -> AnalyzerResult | None:
+        self._ensure_version(version)
+        key = self._key(text_hash, version)
+        result = self.memory.get(key)
+        if result is not None or self.disk is None:
+            return result
+        raw = self.disk.get(key)
+        if raw is None:
+            return None
+        result = AnalyzerResult.model_validate_json(raw)
+        self.memory.set(key, result)
+        return result
+
+    def set(self, result: AnalyzerResult, version: str) -> None:
+        self._ensure_version(version)
+        key = self._key(result.text_hash, version)
+        self.memory.set(key, result)
+        if self.disk is not None:
+            self.disk.set(key, version, result.model_dump_json())
+
+    async def get_async(self, text_hash: str, version: str) -> AnalyzerResult | None:
+        if version != self._version:
+            await asyncio.to_thread(self._ensure_version, version)
+        key = self._key(text_hash, version)
+        result = self.memory.get(key)
+        if result is not None or self.disk is None:
+            return result
+        raw = await asyncio.to_thread(self.disk.get, key)
+        if raw is None:
+            return None
+        result = AnalyzerResult.model_validate_json(raw)
+        self.memory.set(key, result)
+        return result
+
+    async def set_async(self, result: AnalyzerResult, version: str) -> None:
+        if version != self._version:
+            await asyncio.to_thread(self._ensure_version, version)
+        key = self._key(result.text_hash, version)
+        self.memory.set(key, result)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, version, result.model_dump_json())
+
+
+@lru_cache
+def get_analysis_cache() -> AnalysisCache | None:
+    settings = get_settings().cache
+    if not settings.enabled:
+        return None
+    memory: TTLCache[AnalyzerResult] = TTLCache(
+        "analysis", max_entries=settings.max_entries, ttl_seconds=settings.ttl_seconds
+    )
+    disk = (
+        SQLiteCache("analysis", settings.disk_path, ttl_seconds=settings.disk_ttl_seconds)
+        if settings.disk_path
+        else None
+    )
+    return AnalysisCache(memory, disk)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+from src.config.settings import get_settings
+from src.core.cache import TTLCache
+from src.core.nlp.rule_matcher import get_rule_matcher
+from src.core.nlp.types import AnalyzerResult, RuleMatch
+from src.schemas.filter import FilterDecision
+
+
+@dataclass(frozen=True)
+class CachedDecision:
+    decision: FilterDecision
+    allow: bool
+    reason: str
+    matches: list[RuleMatch]
+    analyzer_result: AnalyzerResult
+
+
+class DecisionCache:
+    """In-process cache of filter decisions keyed by text hash, model and ruleset versions.
+
+    Entries of other versions are dropped as soon as a lookup carries a new
+    version; rule reloads also clear the cache eagerly via ``invalidate``.
+    """
+
+    def __init__(self, memory: TTLCache[CachedDecision]) -> None:
+        self.memory = memory
+        self._version: str | None = None
+
+    def _ensure_version(self, version: str) -> None:
+        if version != self._version:
+            if self._version is not None:
+                self.memory.clear("invalidated")
+            self._version = version
+
+    def get(self, text_hash: str, version: str) -> CachedDecision | None:
+        self._ensure_version(version)
+        return self.memory.get(f"{version}:{text_hash}")
+
+    def set(self, text_hash: str, version: str, entry: CachedDecision) -> None:
+        self._ensure_version(version)
+        self.memory.set(f"{version}:{text_hash}", entry)
+
+    def invalidate(self, reason: str = "invalidated") -> None:
+        self.memory.clear(reason)
+
+
+@lru_cache
+def get_decision_cache() -> DecisionCache | None:
+    settings = get_settings().filter
+    if not settings.decision_cache_enabled:
+        return None
+    cache = DecisionCache(
+        TTLCache(
+            "decision",
+            max_entries=settings.decision_cache_max_entries,
+            ttl_seconds=settings.decision_cache_ttl_seconds,
+        )
+    )
+    get_rule_matcher().on_reload(lambda version: cache.invalidate("rules_reloaded"))
+    return cache
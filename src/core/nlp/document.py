@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+from src.core.nlp.types import hash_text
+
+_TOKEN_RE = re.compile(r"\S+")
+
+
+@dataclass(frozen=True)
+class Token:
+    text: str
+    lower: str
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class Document:
+    """Text pre-processed once per request and shared by every pipeline stage."""
+
+    text: str
+    normalized: str
+    tokens: tuple[Token, ...]
+    text_hash: str
+
+    @classmethod
+    def from_text(cls, text: str) -> "Document":
+        tokens = tuple(
+            Token(text=m.group(), lower=m.group().lower(), start=m.start(), end=m.end())
+            for m in _TOKEN_RE.finditer(text)
+        )
+        return cls(text=text, normalized=text.lower(), tokens=tokens, text_hash=hash_text(text))
+
+
+def as_document(text: str | Document) -> Document:
+    return text if isinstance(text, Document) else Document.from_text(text)
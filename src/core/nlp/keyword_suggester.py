@@ -4,24 +4,30 @@ import json
 import re
 from typing import List
 
-import httpx
-
 from src.config.settings import get_settings
 from src.core.logging.config import get_logger
+from src.core.nlp.llm_transport import LLMTransport, get_llm_transport
 
 
 class KeywordSuggester:
     """Suggests event keywords from text using LLM when available, with heuristic fallback."""
 
-    def __init__(self) -> None:
+    def __init__(self, transport: LLMTransport | None = None) -> None:
         settings = get_settings()
         self.base_url = settings.llm.base_url
         self.api_key = settings.llm.api_key
         self.model = settings.llm.model
         self.enabled = settings.llm.enabled and bool(self.base_url and self.api_key)
         self.timeout = settings.llm.timeout_seconds
+        self._transport = transport
         self.logger = get_logger(__name__)
 
+    @property
+    def transport(self) -> LLMTransport:
+        if self._transport is None:
+            self._transport = get_llm_transport()
+        return self._transport
+
     def suggest(self, text: str, max_keywords: int = 3) -> list[str]:
         if self.enabled:
             try:
@@ -47,12 +53,9 @@ class KeywordSuggester:
             "stream": False,
             "response_format": {"type": "json_object"},
         }
-        headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
-
-        with httpx.Client(base_url=self.base_url, timeout=self.timeout) as client:
-            resp = client.post("/chat/completions", json=payload, headers=headers)
-            resp.raise_for_status()
-            content = resp.json()
+        resp = self.transport.post("/chat/completions", json=payload)
+        resp.raise_for_status()
+        content = resp.json()
         message_content = content["choices"][0]["message"]["content"]
         data = json.loads(message_content) if isinstance(message_content, str) else message_content
         keywords = data.get("keywords") or []
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton that finds every registered pattern in one pass."""
+
+    def __init__(self) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[int, ...]] = [()]
+        self._ids: dict[str, int] = {}
+        self._always: set[int] = set()
+        self._compiled = False
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, pattern: str) -> int:
+        """Register ``pattern`` and return its id; identical patterns share an id."""
+        if pattern in self._ids:
+            return self._ids[pattern]
+        pattern_id = len(self._ids)
+        self._ids[pattern] = pattern_id
+        self._compiled = False
+        if not pattern:
+            # `"" in text` is always true; keep that behaviour without a root output.
+            self._always.add(pattern_id)
+            return pattern_id
+        node = 0
+        for char in pattern:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            node = nxt
+        self._out[node] = self._out[node] + (pattern_id,)
+        return pattern_id
+
+    def compile(self) -> None:
+        queue: deque[int] = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+        self._compiled = True
+
+    def find_ids(self, text: str) -> set[int]:
+        """Return the distinct ids of patterns occurring anywhere in ``text``."""
+        if not self._compiled:
+            self.compile()
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set(self._always)
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+
+class LexiconHits:
+    """Keyword hits of one text, grouped by ``(model, label)`` in manifest order."""
+
+    def __init__(self, grouped: dict[tuple[str, str], list[str]]) -> None:
+        self._grouped = grouped
+
+    def terms(self, model: str, label: str = "") -> list[str]:
+        return list(self._grouped.get((model, label), []))
+
+    def count(self, model: str, label: str = "") -> int:
+        return len(self._grouped.get((model, label), ()))
+
+
+class LexiconEngine:
+    """Compiles manifest keyword lists of several models into one automaton.
+
+    Keywords are matched as substrings of the lowercased text, which is what the
+    scorers did with ``kw.lower() in text.lower()`` before; scan cost depends on
+    the text length and the number of hits, not on the lexicon size.
+    """
+
+    def __init__(self) -> None:
+        self._automaton = KeywordAutomaton()
+        # pattern id -> [(model, label, position in manifest list, original term)]
+        self._payloads: dict[int, list[tuple[str, str, int, str]]] = {}
+        self._sizes: dict[tuple[str, str], int] = {}
+
+    def add_terms(
+        self,
+        model: str,
+        label: str,
+        terms: Iterable[str],
+        *,
+        lowercase: bool = True,
+    ) -> None:
+        position = self._sizes.get((model, label), 0)
+        for term in terms:
+            pattern = term.lower() if lowercase else term
+            pattern_id = self._automaton.add(pattern)
+            self._payloads.setdefault(pattern_id, []).append((model, label, position, term))
+            position += 1
+        self._sizes[(model, label)] = position
+
+    def compile(self) -> "LexiconEngine":
+        self._automaton.compile()
+        return self
+
+    def scan(self, text: str) -> LexiconHits:
+        return self.scan_lowered(text.lower())
+
+    def scan_lowered(self, text_lower: str) -> LexiconHits:
+        positioned: dict[tuple[str, str], list[tuple[int, str]]] = {}
+        for pattern_id in self._automaton.find_ids(text_lower):
+            for model, label, position, term in self._payloads.get(pattern_id, ()):
+                positioned.setdefault((model, label), []).append((position, term))
+        grouped = {key: [term for _, term in sorted(items)] for key, items in positioned.items()}
+        return LexiconHits(grouped)
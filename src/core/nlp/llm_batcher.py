@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from prometheus_client import Histogram
+
+from src.config.settings import get_settings
+from src.core.logging.config import get_logger
+from src.core.nlp.llm_transport import LLMTransport
+from src.core.nlp.types import LLMClassificationResult, parse_classification
+
+LLM_BATCH_SIZE = Histogram(
+    "dep_llm_batch_size",
+    "Items per micro-batched LLM classification request",
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+
+BATCH_PROMPT = (
+    "You are a sentiment and crisis risk classifier. "
+    "The user message is a JSON array of {\"index\": int, \"text\": str} items. "
+    "Classify every item and respond with a strict JSON object: "
+    '{"results": [{"index": int, "label": "positive|neutral|negative", '
+    '"crisis_probability": float between 0 and 1, "rationale": "short reason"}]}'
+)
+
+
+class LLMBatcher:
+    """Coalesces concurrent classify calls into one multi-item chat completion.
+
+    Items wait at most ``max_wait_ms`` (or until ``max_batch_size`` are queued)
+    before being sent together. Each caller gets its own result back, or
+    ``None`` when its entry is missing or malformed so it can fall back to the
+    keyword models.
+    """
+
+    def __init__(
+        self,
+        transport: LLMTransport,
+        model: str,
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+    ) -> None:
+        self.transport = transport
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # In-flight sends; callers only hold their futures, so keep the tasks alive here.
+        self._sends: set[asyncio.Task] = set()
+        self.logger = get_logger(__name__)
+
+    async def classify(self, text: str) -> LLMClassificationResult | None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop, self._pending, self._timer = loop, [], None
+        future: asyncio.Future = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._send(batch))
+            self._sends.add(task)
+            task.add_done_callback(self._sends.discard)
+
+    async def _send(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        LLM_BATCH_SIZE.observe(len(batch))
+        try:
+            resp = await self.transport.apost("/chat/completions", json=self._payload(batch))
+            resp.raise_for_status()
+            results = self._parse(resp.json())
+        except Exception as exc:
+            # Transport failures reach every caller so the circuit breaker sees them.
+            self.logger.warning("llm.batch.failed", size=len(batch), error=str(exc))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for index, (_, future) in enumerate(batch):
+            if not future.done():
+                future.set_result(results.get(index))
+
+    def _payload(self, batch: list[tuple[str, asyncio.Future]]) -> dict:
+        items = [{"index": index, "text": text} for index, (text, _) in enumerate(batch)]
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": BATCH_PROMPT},
+                {"role": "user", "content": json.dumps(items, ensure_ascii=False)},
+            ],
+            "stream": False,
+            "response_format": {"type": "json_object"},
+        }
+
+    def _parse(self, content: dict) -> dict[int, LLMClassificationResult]:
+        message_content = content["choices"][0]["message"]["content"]
+        data = json.loads(message_content) if isinstance(message_content, str) else message_content
+        entries = data.get("results", []) if isinstance(data, dict) else data
+        parsed: dict[int, LLMClassificationResult] = {}
+        for entry in entries:
+            try:
+                parsed[int(entry["index"])] = parse_classification(entry)
+            except Exception as exc:
+                self.logger.warning("llm.batch.item_parse_error", error=str(exc))
+        return parsed
+
+
+_batcher: LLMBatcher | None = None
+
+
+def get_llm_batcher(transport: LLMTransport) -> LLMBatcher:
+    """Process-wide batcher so concurrent requests end up in the same batches."""
+    global _batcher
+    if _batcher is None or _batcher.transport is not transport:
+        settings = get_settings().llm
+        _batcher = LLMBatcher(
+            transport,
+            model=settings.model,
+            max_batch_size=settings.batch_max_size,
+            max_wait_ms=settings.batch_max_wait_ms,
+        )
+    return _batcher
@@ -1,38 +1,144 @@
 from __future__ import annotations
 
+import asyncio
 import json
-from dataclasses import dataclass
-from typing import Literal
 
 import httpx
+from prometheus_client import Counter
 
 from src.config.settings import get_settings
+from src.core.circuit_breaker import CircuitBreaker
 from src.core.logging.config import get_logger
+from src.core.nlp.llm_batcher import LLMBatcher, get_llm_batcher
+from src.core.nlp.llm_transport import LLMTransport, get_llm_transport
+from src.core.nlp.types import LLMClassificationResult, parse_classification
 
+LLM_CLASSIFICATIONS = Counter(
+    "dep_llm_classifications_total",
+    "LLM classification requests made by the analyzer",
+)
+LLM_FALLBACKS = Counter(
+    "dep_llm_fallbacks_total",
+    "Classifications answered by the keyword models instead of the LLM",
+    labelnames=("reason",),
+)
 
-@dataclass
-class LLMClassificationResult:
-    label: Literal["positive", "neutral", "negative"]
-    crisis_probability: float
-    rationale: str | None = None
+_breaker: CircuitBreaker | None = None
+_background_tasks: set[asyncio.Task] = set()
+
+
+def get_llm_breaker() -> CircuitBreaker:
+    global _breaker
+    if _breaker is None:
+        settings = get_settings().llm
+        _breaker = CircuitBreaker(
+            "llm",
+            failure_threshold=settings.breaker_failure_threshold,
+            reset_timeout_seconds=settings.breaker_reset_seconds,
+        )
+    return _breaker
 
 
 class LLMClassifier:
-    """LLM-backed sentiment + crisis scorer. Falls back silently on errors."""
+    """LLM-backed sentiment + crisis scorer. Falls back silently on errors.
+
+    Each call gets ``latency_budget_ms``; when the LLM has not answered by then,
+    or the shared circuit breaker is open, ``None`` is returned right away so
+    the pipeline uses its keyword result.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, transport: LLMTransport | None = None) -> None:
         settings = get_settings()
         self.base_url = settings.llm.base_url
         self.api_key = settings.llm.api_key
         self.model = settings.llm.model
         self.enabled = settings.llm.enabled and bool(self.base_url and self.api_key)
         self.timeout = settings.llm.timeout_seconds
+        self.batch_enabled = settings.llm.batch_enabled
+        self.budget = settings.llm.latency_budget_ms / 1000
+        self.breaker = get_llm_breaker()
+        self._transport = transport
+        self._batcher: LLMBatcher | None = None
         self.logger = get_logger(__name__)
 
+    @property
+    def transport(self) -> LLMTransport:
+        if self._transport is None:
+            self._transport = get_llm_transport()
+        return self._transport
+
+    @property
+    def batcher(self) -> LLMBatcher:
+        if self._batcher is None:
+            self._batcher = get_llm_batcher(self.transport)
+        return self._batcher
+
     def classify(self, text: str) -> LLMClassificationResult | None:
         if not self.enabled:
             return None
+        LLM_CLASSIFICATIONS.inc()
+        if not self.breaker.allow_request() and not self.breaker.try_acquire_probe():
+            return self._fallback("circuit_open")
+        try:
+            resp = self.transport.post(
+                "/chat/completions", json=self._payload(text), timeout=self.timeout, budget=self.budget
+            )
+            resp.raise_for_status()
+            content = resp.json()
+        except httpx.TimeoutException:
+            self.breaker.record_failure()
+            return self._fallback("timeout")
+        except Exception as exc:  # pragma: no cover - external I/O
+            self.logger.warning("llm.classify.failed", error=str(exc))
+            self.breaker.record_failure()
+            return self._fallback("error")
+        self.breaker.record_success()
+        return self._parse(content) or self._fallback("parse_error")
+
+    async def classify_async(self, text: str) -> LLMClassificationResult | None:
+        if not self.enabled:
+            return None
+        LLM_CLASSIFICATIONS.inc()
+        if not self.breaker.allow_request():
+            if self.breaker.try_acquire_probe():
+                task = asyncio.get_running_loop().create_task(self._probe(text))
+                _background_tasks.add(task)
+                task.add_done_callback(_background_tasks.discard)
+            return self._fallback("circuit_open")
+        try:
+            result = await asyncio.wait_for(self._classify_remote(text), timeout=self.budget)
+        except asyncio.TimeoutError:
+            self.breaker.record_failure()
+            return self._fallback("timeout")
+        except Exception as exc:  # pragma: no cover - external I/O
+            self.logger.warning("llm.classify.failed", error=str(exc))
+            self.breaker.record_failure()
+            return self._fallback("error")
+        self.breaker.record_success()
+        return result or self._fallback("parse_error")
+
+    async def _classify_remote(self, text: str) -> LLMClassificationResult | None:
+        if self.batch_enabled:
+            return await self.batcher.classify(text)
+        resp = await self.transport.apost("/chat/completions", json=self._payload(text))
+        resp.raise_for_status()
+        return self._parse(resp.json())
+
+    async def _probe(self, text: str) -> None:
+        """Half-open trial call made off the request path."""
+        try:
+            await asyncio.wait_for(self._classify_remote(text), timeout=self.timeout)
+        except Exception as exc:
+            self.logger.info("llm.probe.failed", error=str(exc) or type(exc).__name__)
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
 
+    def _fallback(self, reason: str) -> None:
+        LLM_FALLBACKS.labels(reason).inc()
+        return None
+
+    def _payload(self, text: str) -> dict:
         prompt = (
             "You are a sentiment and crisis risk classifier. "
             "Given a message, respond with a strict JSON object containing: "
@@ -40,8 +146,7 @@ class LLMClassifier:
             '"crisis_probability": float between 0 and 1, '
             '"rationale": "short reason"}'
         )
-
-        payload = {
+        return {
             "model": self.model,
             "messages": [
                 {"role": "system", "content": prompt},
@@ -51,34 +156,14 @@ class LLMClassifier:
             "response_format": {"type": "json_object"},
         }
 
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
-
-        try:
-            with httpx.Client(base_url=self.base_url, timeout=self.timeout) as client:
-                resp = client.post("/chat/completions", json=payload, headers=headers)
-                resp.raise_for_status()
-                content = resp.json()
-        except Exception as exc:  # pragma: no cover - external I/O
-            self.logger.warning("llm.classify.failed", error=str(exc))
-            return None
-
+    def _parse(self, content: dict) -> LLMClassificationResult | None:
         try:
             message_content = content["choices"][0]["message"]["content"]
             data = message_content
             if isinstance(message_content, str):
                 data = json.loads(message_content)
-            label = data.get("label", "neutral")
-            crisis_prob = float(data.get("crisis_probability", 0.0))
-            rationale = data.get("rationale")
-            if label not in {"positive", "neutral", "negative"}:
-                label = "neutral"
-            crisis_prob = max(0.0, min(1.0, crisis_prob))
-            return LLMClassificationResult(
-                label=label, crisis_probability=crisis_prob, rationale=rationale
-            )
+            return parse_classification(data)
         except Exception as exc:  # pragma: no cover - parsing guard
             self.logger.warning("llm.classify.parse_error", error=str(exc))
             return None
+
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import importlib.util
+import time
+from typing import Any
+
+import httpx
+from prometheus_client import Counter
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    Retrying,
+    retry_if_exception_type,
+    retry_if_result,
+    stop_after_attempt,
+    stop_after_delay,
+    wait_random_exponential,
+)
+
+from src.config.settings import LLMSettings, get_settings
+from src.core.logging.config import get_logger
+
+LLM_HTTP_REQUESTS = Counter(
+    "dep_llm_http_requests_total",
+    "Requests sent over the shared LLM transport",
+    labelnames=("client",),
+)
+LLM_HTTP_CONNECTIONS = Counter(
+    "dep_llm_http_connections_opened_total",
+    "New TCP connections opened by the shared LLM transport",
+    labelnames=("client",),
+)
+
+TRANSIENT_STATUS = {429, 500, 502, 503, 504}
+
+
+def _is_transient_response(response: httpx.Response) -> bool:
+    return response.status_code in TRANSIENT_STATUS
+
+
+def _last_outcome(state: RetryCallState) -> httpx.Response:
+    return state.outcome.result()
+
+
+class LLMTransport:
+    """Keep-alive HTTP clients shared by every LLM caller in the process.
+
+    Created in the app lifespan and closed on shutdown. Requests minus opened
+    connections gives the number of requests served on a reused connection.
+    Transport errors and 429/5xx answers are retried with jittered backoff;
+    a ``budget`` bounds all attempts and the waits between them together.
+    """
+
+    def __init__(
+        self,
+        settings: LLMSettings | None = None,
+        transport: httpx.BaseTransport | None = None,
+        async_transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        settings = settings or get_settings().llm
+        self.http2 = settings.http2 and importlib.util.find_spec("h2") is not None
+        limits = httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry_seconds,
+        )
+        options: dict[str, Any] = {
+            "base_url": settings.base_url or "",
+            "timeout": settings.timeout_seconds,
+            "headers": {
+                "Authorization": f"Bearer {settings.api_key}",
+                "Content-Type": "application/json",
+            },
+        }
+        self.client = httpx.Client(limits=limits, http2=self.http2, transport=transport, **options)
+        self.async_client = httpx.AsyncClient(
+            limits=limits, http2=self.http2, transport=async_transport, **options
+        )
+        self.retry_attempts = settings.retry_attempts
+        self.requests = 0
+        self.connections_opened = 0
+        self.logger = get_logger(__name__)
+
+    def post(
+        self, path: str, json: dict, timeout: float | None = None, budget: float | None = None
+    ) -> httpx.Response:
+        kwargs: dict[str, Any] = {"json": json, "extensions": {"trace": self._trace}}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        deadline = time.monotonic() + budget if budget is not None else None
+
+        def send() -> httpx.Response:
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise httpx.TimeoutException("LLM latency budget exhausted")
+                kwargs["timeout"] = min(timeout, remaining) if timeout is not None else remaining
+            self._count_request("sync")
+            return self.client.post(path, **kwargs)
+
+        return Retrying(**self._retry_options(deadline))(send)
+
+    async def apost(self, path: str, json: dict, timeout: float | None = None) -> httpx.Response:
+        kwargs: dict[str, Any] = {"json": json, "extensions": {"trace": self._atrace}}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+
+        async def send() -> httpx.Response:
+            self._count_request("async")
+            return await self.async_client.post(path, **kwargs)
+
+        return await AsyncRetrying(**self._retry_options())(send)
+
+    def _retry_options(self, deadline: float | None = None) -> dict[str, Any]:
+        stop = stop_after_attempt(self.retry_attempts)
+        wait = wait_random_exponential(multiplier=0.05, max=1.0)
+        if deadline is not None:
+            backoff = wait
+            stop = stop | stop_after_delay(max(0.0, deadline - time.monotonic()))
+
+            def capped(state: RetryCallState) -> float:
+                # Never sleep past the deadline; the next attempt then fails fast.
+                return min(backoff(state), max(0.0, deadline - time.monotonic()))
+
+            wait = capped
+        return {
+            "stop": stop,
+            "wait": wait,
+            "retry": retry_if_exception_type(httpx.TransportError) | retry_if_result(_is_transient_response),
+            "retry_error_callback": _last_outcome,
+        }
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "connections_reused": max(0, self.requests - self.connections_opened),
+        }
+
+    async def aclose(self) -> None:
+        self.client.close()
+        await self.async_client.aclose()
+        self.logger.info("llm_transport.closed", **self.stats())
+
+    def _count_request(self, client: str) -> None:
+        self.requests += 1
+        LLM_HTTP_REQUESTS.labels(client).inc()
+
+    def _trace(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+            LLM_HTTP_CONNECTIONS.labels("sync").inc()
+
+    async def _atrace(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+            LLM_HTTP_CONNECTIONS.labels("async").inc()
+
+
+_transport: LLMTransport | None = None
+
+
+def get_llm_transport() -> LLMTransport:
+    global _transport
+    if _transport is None:
+        _transport = LLMTransport()
+    return _transport
+
+
+async def close_llm_transport() -> None:
+    global _transport
+    if _transport is not None:
+        await _transport.aclose()
+        _transport = None
@@ -1,17 +1,27 @@
 from __future__ import annotations
 
+import hashlib
 import json
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Protocol
 
 from src.config.settings import get_settings
 from src.core.logging.config import get_logger
+from src.core.nlp.lexicon import LexiconEngine
 
 
 class ModelRegistryError(RuntimeError):
     pass
 
 
+class LexiconModel(Protocol):
+    model_name: str
+    version: str
+    manifest: dict[str, Any]
+
+    def register_terms(self, engine: LexiconEngine) -> None: ...
+
+
 class ModelRegistry:
     """Loads lightweight manifest metadata for demo models."""
 
@@ -19,6 +29,8 @@ class ModelRegistry:
         settings = get_settings()
         self.base_path = Path(base_path or settings.model_registry_path).resolve()
         self._cache: dict[str, dict[str, Any]] = {}
+        self._lexicons: dict[tuple[str, ...], LexiconEngine] = {}
+        self._fingerprints: dict[tuple[str, ...], str] = {}
         self._logger = get_logger(__name__)
 
     def _manifest_path(self, model_name: str, version: str) -> Path:
@@ -60,5 +72,36 @@ class ModelRegistry:
         self._cache[cache_key] = default
         return default
 
+    def register_manifest(self, model_name: str, version: str, manifest: dict[str, Any]) -> None:
+        """Serve ``manifest`` without reading it from disk (used by worker processes)."""
+        self._cache[f"{model_name}:{version}"] = manifest
+
+    def get_lexicon(self, models: Iterable[LexiconModel]) -> LexiconEngine:
+        """Return one compiled keyword automaton covering all ``models``."""
+        models = list(models)
+        cache_key = tuple(f"{model.model_name}:{model.version}" for model in models)
+        engine = self._lexicons.get(cache_key)
+        if engine is None:
+            engine = LexiconEngine()
+            for model in models:
+                model.register_terms(engine)
+            self._lexicons[cache_key] = engine.compile()
+            self._logger.info("model_registry.lexicon_compiled", models=list(cache_key))
+        return engine
+
+    def fingerprint(self, models: Iterable[LexiconModel]) -> str:
+        """Content hash of the manifests served to ``models``; changes with any new version."""
+        models = list(models)
+        cache_key = tuple(f"{model.model_name}:{model.version}" for model in models)
+        fingerprint = self._fingerprints.get(cache_key)
+        if fingerprint is None:
+            digest = hashlib.sha256()
+            for key, model in zip(cache_key, models):
+                digest.update(key.encode("utf-8"))
+                digest.update(json.dumps(model.manifest, sort_keys=True).encode("utf-8"))
+            fingerprint = digest.hexdigest()[:16]
+            self._fingerprints[cache_key] = fingerprint
+        return fingerprint
+
 
 registry = ModelRegistry()
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
-import math
+import asyncio
 import time
-from typing import Any
+from dataclasses import dataclass
+from typing import Awaitable, Callable
 
+from src.config.settings import get_settings
+from src.core.executors import get_cpu_executor
 from src.core.logging.config import get_logger
-from src.core.nlp.llm_classifier import LLMClassifier
+from src.core.nlp.analysis_cache import AnalysisCache, get_analysis_cache
+from src.core.nlp.document import Document, as_document
+from src.core.nlp.lexicon import LexiconEngine, LexiconHits
+from src.core.nlp.llm_classifier import LLMClassificationResult, LLMClassifier
 from src.core.nlp.model_registry import ModelRegistry, registry
+from src.core.nlp.process_stages import get_stage_pool, process_mode_enabled
 from src.core.nlp.types import (
+    AnalyzerBatchItem,
     AnalyzerResult,
     CrisisResult,
     EmpathyResult,
@@ -16,7 +24,6 @@ from src.core.nlp.types import (
     SentimentLabel,
     SentimentResult,
     clamp,
-    hash_text,
     build_request_id,
     normalize_scores,
 )
@@ -38,20 +45,27 @@ class SentimentClassifier:
                 "negative": ["hate", "angry", "terrible", "bad", "伤心", "愤怒"],
             },
         }
+        self.model_name = model_name
+        self.version = version
         self.manifest = registry.get_manifest(model_name, version, default_manifest)
+        self.lexicon = registry.get_lexicon([self])
 
-    def predict(self, text: str) -> SentimentResult:
-        text_lower = text.lower()
+    def register_terms(self, engine: LexiconEngine) -> None:
+        for label_name, keywords in self.manifest.get("keywords", {}).items():
+            engine.add_terms(self.model_name, label_name, keywords)
+
+    def predict(self, text: str | Document, hits: LexiconHits | None = None) -> SentimentResult:
+        if hits is None:
+            hits = self.lexicon.scan_lowered(as_document(text).normalized)
         scores = {
             SentimentLabel.positive: 0.1,
             SentimentLabel.neutral: 0.1,
             SentimentLabel.negative: 0.1,
         }
-        for label_name, keywords in self.manifest.get("keywords", {}).items():
+        for label_name in self.manifest.get("keywords", {}):
             label = SentimentLabel(label_name)
-            for kw in keywords:
-                if kw.lower() in text_lower:
-                    scores[label] += 1.0
+            for _ in hits.terms(self.model_name, label_name):
+                scores[label] += 1.0
         if scores[SentimentLabel.positive] == scores[SentimentLabel.negative]:
             scores[SentimentLabel.neutral] += 0.5
 
@@ -71,12 +85,18 @@ class EmpathyScorer:
         default_manifest = {
             "keywords": ["sorry", "理解", "care", "support", "抱歉", "感谢", "empathy"]
         }
+        self.model_name = model_name
+        self.version = version
         self.manifest = registry.get_manifest(model_name, version, default_manifest)
+        self.lexicon = registry.get_lexicon([self])
 
-    def score(self, text: str) -> EmpathyResult:
-        matches = [
-            kw for kw in self.manifest.get("keywords", []) if kw.lower() in text.lower()
-        ]
+    def register_terms(self, engine: LexiconEngine) -> None:
+        engine.add_terms(self.model_name, "keywords", self.manifest.get("keywords", []))
+
+    def score(self, text: str | Document, hits: LexiconHits | None = None) -> EmpathyResult:
+        if hits is None:
+            hits = self.lexicon.scan_lowered(as_document(text).normalized)
+        matches = hits.terms(self.model_name, "keywords")
         score = clamp(len(matches) / 3.0)
         rationale = (
             "Detected empathic cues: " + ", ".join(matches) if matches else "Neutral tone"
@@ -95,16 +115,21 @@ class CrisisDetector:
             "keywords": ["suicide", "kill myself", "暴力", "恐吓", "爆炸", "伤害"],
             "boost": ["now", "immediately", "立刻"],
         }
+        self.model_name = model_name
+        self.version = version
         self.manifest = registry.get_manifest(model_name, version, default_manifest)
+        self.lexicon = registry.get_lexicon([self])
 
-    def predict(self, text: str) -> RuleMatch:
-        text_lower = text.lower()
-        indicators = [
-            kw
-            for kw in self.manifest.get("keywords", [])
-            if kw.lower() in text_lower
-        ]
-        boost = any(term in text_lower for term in self.manifest.get("boost", []))
+    def register_terms(self, engine: LexiconEngine) -> None:
+        engine.add_terms(self.model_name, "keywords", self.manifest.get("keywords", []))
+        # Boost terms were never lowercased, so they are matched verbatim.
+        engine.add_terms(self.model_name, "boost", self.manifest.get("boost", []), lowercase=False)
+
+    def predict(self, text: str | Document, hits: LexiconHits | None = None) -> RuleMatch:
+        if hits is None:
+            hits = self.lexicon.scan_lowered(as_document(text).normalized)
+        indicators = hits.terms(self.model_name, "keywords")
+        boost = hits.count(self.model_name, "boost") > 0
         probability = clamp(len(indicators) * (1.5 if boost else 1) / 3.0)
         return RuleMatch(
             rule_id="crisis_model",
@@ -117,19 +142,168 @@ class CrisisDetector:
         )
 
 
+@dataclass
+class KeywordScores:
+    """Output of the CPU-bound keyword stage for one document."""
+
+    hits: LexiconHits
+    sentiment: SentimentResult
+    empathy: EmpathyResult
+    crisis: RuleMatch
+    evidence: list[EvidenceChunk]
+
+
 class NLPPipeline:
-    def __init__(self, model_registry: ModelRegistry | None = None) -> None:
+    def __init__(
+        self,
+        model_registry: ModelRegistry | None = None,
+        cache: AnalysisCache | None = None,
+    ) -> None:
         self.registry = model_registry or registry
         self.sentiment = SentimentClassifier(self.registry)
         self.empathy = EmpathyScorer(self.registry)
         self.crisis = CrisisDetector(self.registry)
+        self.lexicon = self.registry.get_lexicon([self.sentiment, self.empathy, self.crisis])
+        sentiment_keywords = self.sentiment.manifest.get("keywords", {})
+        self._sentiment_words = {
+            w.lower()
+            for w in sentiment_keywords.get("positive", []) + sentiment_keywords.get("negative", [])
+        }
+        self._crisis_words = {w.lower() for w in self.crisis.manifest.get("keywords", [])}
         self.logger = get_logger(__name__)
         self.llm = LLMClassifier()
+        self.cache = cache if cache is not None else get_analysis_cache()
+        manifests = self.registry.fingerprint([self.sentiment, self.empathy, self.crisis])
+        self.version_token = f"{manifests}:{self.llm.model if self.llm.enabled else 'keywords'}"
+        self._max_concurrency = get_settings().pipeline.max_concurrency
+
+    def analyze(self, text: str | Document) -> AnalyzerResult:
+        return self._analyze(text)[0]
 
-    def analyze(self, text: str) -> AnalyzerResult:
+    def _analyze(self, text: str | Document) -> tuple[AnalyzerResult, bool]:
         start = time.perf_counter()
-        llm_result = self.llm.classify(text)
+        doc = as_document(text)
+        cached = self.cached_result(doc, start)
+        if cached is not None:
+            return cached, True
+        llm_result = self.llm.classify(doc.text)
+        result = self.remember(self.assemble(doc, self.score_keywords(doc), llm_result, start), llm_result)
+        return result, self._settled(llm_result)
+
+    async def analyze_async(self, text: str | Document) -> AnalyzerResult:
+        """Event-loop friendly analyze: async LLM call, keyword scoring on the CPU executor."""
+        return (await self.analyze_settled_async(text))[0]
+
+    async def analyze_settled_async(
+        self,
+        text: str | Document,
+        keywords: Awaitable[KeywordScores] | None = None,
+    ) -> tuple[AnalyzerResult, bool]:
+        """``analyze_async`` plus whether the result is settled (see :meth:`_settled`).
+
+        ``keywords`` reuses a keyword scoring the caller already started.
+        """
+        start = time.perf_counter()
+        doc = as_document(text)
+        cached = await self.cached_result_async(doc, start)
+        if cached is not None:
+            return cached, True
+        keywords_future = keywords if keywords is not None else self.score_keywords_async(doc)
+        try:
+            llm_result = await self.llm.classify_async(doc.text)
+        finally:
+            scores = await keywords_future
+        result = await self.remember_async(self.assemble(doc, scores, llm_result, start), llm_result)
+        return result, self._settled(llm_result)
+
+    def _settled(self, llm_result: LLMClassificationResult | None) -> bool:
+        """False for a keyword fallback caused by a failed LLM call."""
+        return llm_result is not None or not self.llm.enabled
+
+    async def analyze_keywords_async(self, text: str | Document) -> AnalyzerResult:
+        """Keyword-model-only analysis: no LLM call, used when rules already decided."""
+        start = time.perf_counter()
+        doc = as_document(text)
+        cached = await self.cached_result_async(doc, start)
+        if cached is not None:
+            return cached
+        return await self.remember_async(
+            self.assemble(doc, await self.score_keywords_async(doc), None, start), None
+        )
+
+    def score_keywords_async(self, doc: Document) -> asyncio.Future[KeywordScores]:
+        if process_mode_enabled():
+            return asyncio.wrap_future(get_stage_pool().submit_keywords(self, doc.text))
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(get_cpu_executor(), self.score_keywords, doc)
+
+    def worker_manifests(self) -> list[tuple[str, str, dict]]:
+        return [
+            (model.model_name, model.version, model.manifest)
+            for model in (self.sentiment, self.empathy, self.crisis)
+        ]
+
+    def cached_result(self, doc: Document, start: float) -> AnalyzerResult | None:
+        if self.cache is None:
+            return None
+        return self._restamp(self.cache.get(doc.text_hash, self.version_token), doc, start)
+
+    async def cached_result_async(self, doc: Document, start: float) -> AnalyzerResult | None:
+        """``cached_result`` without blocking the event loop on the SQLite tier."""
+        if self.cache is None:
+            return None
+        return self._restamp(await self.cache.get_async(doc.text_hash, self.version_token), doc, start)
+
+    def remember(
+        self, result: AnalyzerResult, llm_result: LLMClassificationResult | None
+    ) -> AnalyzerResult:
+        # A keyword fallback caused by an LLM failure is not worth pinning in the cache.
+        if self.cache is not None and self._settled(llm_result):
+            self.cache.set(result, self.version_token)
+        return result
+
+    async def remember_async(
+        self, result: AnalyzerResult, llm_result: LLMClassificationResult | None
+    ) -> AnalyzerResult:
+        if self.cache is not None and self._settled(llm_result):
+            await self.cache.set_async(result, self.version_token)
+        return result
+
+    @staticmethod
+    def _restamp(cached: AnalyzerResult | None, doc: Document, start: float) -> AnalyzerResult | None:
+        if cached is None:
+            return None
+        return cached.model_copy(
+            update={
+                "request_id": build_request_id(),
+                "text": doc.text,
+                "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+            }
+        )
+
+    def score_keywords(self, doc: Document) -> KeywordScores:
+        hits = self.lexicon.scan_lowered(doc.normalized)
+        evidence = []
+        for token in doc.tokens:
+            if token.lower in self._sentiment_words:
+                evidence.append(EvidenceChunk(text=token.text, label="sentiment", weight=0.5))
+            if token.lower in self._crisis_words:
+                evidence.append(EvidenceChunk(text=token.text, label="crisis", weight=1.0))
+        return KeywordScores(
+            hits=hits,
+            sentiment=self.sentiment.predict(doc, hits),
+            empathy=self.empathy.score(doc, hits),
+            crisis=self.crisis.predict(doc, hits),
+            evidence=evidence,
+        )
 
+    def assemble(
+        self,
+        doc: Document,
+        keywords: KeywordScores,
+        llm_result: LLMClassificationResult | None,
+        start: float,
+    ) -> AnalyzerResult:
         if llm_result:
             sentiment = SentimentResult(
                 label=SentimentLabel(llm_result.label),
@@ -140,7 +314,6 @@ class NLPPipeline:
                     SentimentLabel.negative: 1.0 if llm_result.label == "negative" else 0.0,
                 },
             )
-            empathy = self.empathy.score(text)
             crisis = RuleMatch(
                 rule_id="llm_crisis",
                 description="LLM-evaluated crisis probability",
@@ -151,40 +324,21 @@ class NLPPipeline:
                 metadata={"probability": llm_result.crisis_probability, "rationale": llm_result.rationale},
             )
         else:
-            sentiment = self.sentiment.predict(text)
-            empathy = self.empathy.score(text)
-            crisis = self.crisis.predict(text)
-
-        evidence = []
-        positive_words = [
-            w.lower()
-            for w in self.sentiment.manifest.get("keywords", {}).get("positive", [])
-        ]
-        negative_words = [
-            w.lower()
-            for w in self.sentiment.manifest.get("keywords", {}).get("negative", [])
-        ]
-        crisis_words = [w.lower() for w in self.crisis.manifest.get("keywords", [])]
-
-        for token in text.split():
-            lower = token.lower()
-            if lower in positive_words + negative_words:
-                evidence.append(EvidenceChunk(text=token, label="sentiment", weight=0.5))
-            if lower in crisis_words:
-                evidence.append(EvidenceChunk(text=token, label="crisis", weight=1.0))
+            sentiment = keywords.sentiment
+            crisis = keywords.crisis
+        empathy = keywords.empathy
 
         request_id = build_request_id()
-        text_hash = hash_text(text)
         latency_ms = (time.perf_counter() - start) * 1000
 
         result = AnalyzerResult(
             request_id=request_id,
-            text=text,
-            text_hash=text_hash,
+            text=doc.text,
+            text_hash=doc.text_hash,
             sentiment=sentiment,
             empathy=empathy,
             crisis=crisis_to_result(crisis),
-            evidence=evidence,
+            evidence=keywords.evidence,
             model_version=self.sentiment.manifest.get("version", "1.0.0"),
             latency_ms=round(latency_ms, 2),
         )
@@ -199,6 +353,63 @@ class NLPPipeline:
         )
         return result
 
+    def analyze_batch(self, texts: list[str]) -> list[AnalyzerBatchItem]:
+        """Analyze ``texts`` in input order; a failing item does not fail the batch."""
+        start = time.perf_counter()
+        items = [self._batch_item(index, text) for index, text in enumerate(texts)]
+        self._log_batch(items, start)
+        return items
+
+    async def analyze_batch_async(
+        self,
+        texts: list[str],
+        analyze: Callable[[str], Awaitable[tuple[AnalyzerResult, bool]]] | None = None,
+    ) -> list[AnalyzerBatchItem]:
+        """Analyze ``texts`` concurrently; ``analyze`` replaces ``analyze_settled_async`` per item."""
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def run(index: int, text: str) -> AnalyzerBatchItem:
+            async with semaphore:
+                return await self._batch_item_async(index, text, analyze or self.analyze_settled_async)
+
+        items = list(await asyncio.gather(*(run(i, text) for i, text in enumerate(texts))))
+        self._log_batch(items, start)
+        return items
+
+    def _batch_item(self, index: int, text: str) -> AnalyzerBatchItem:
+        if not text.strip():
+            return AnalyzerBatchItem(index=index, error="Text is empty")
+        try:
+            result, settled = self._analyze(text)
+            return AnalyzerBatchItem(index=index, result=result, settled=settled)
+        except Exception as exc:
+            self.logger.warning("nlp_pipeline.batch_item_failed", index=index, error=str(exc))
+            return AnalyzerBatchItem(index=index, error=str(exc))
+
+    async def _batch_item_async(
+        self,
+        index: int,
+        text: str,
+        analyze: Callable[[str], Awaitable[tuple[AnalyzerResult, bool]]],
+    ) -> AnalyzerBatchItem:
+        if not text.strip():
+            return AnalyzerBatchItem(index=index, error="Text is empty")
+        try:
+            result, settled = await analyze(text)
+            return AnalyzerBatchItem(index=index, result=result, settled=settled)
+        except Exception as exc:
+            self.logger.warning("nlp_pipeline.batch_item_failed", index=index, error=str(exc))
+            return AnalyzerBatchItem(index=index, error=str(exc))
+
+    def _log_batch(self, items: list[AnalyzerBatchItem], start: float) -> None:
+        self.logger.debug(
+            "nlp_pipeline.analyze_batch",
+            size=len(items),
+            failed=sum(1 for item in items if item.error),
+            latency_ms=round((time.perf_counter() - start) * 1000, 2),
+        )
+
 
 def crisis_to_result(match: RuleMatch) -> CrisisResult:
     probability = float(match.metadata.get("probability", 0.0))
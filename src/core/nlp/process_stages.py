@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from typing import TYPE_CHECKING, Any
+
+from src.config.settings import get_settings
+from src.core.logging.config import get_logger
+from src.core.nlp.document import Document
+from src.core.nlp.rule_profiler import ProfileRecorder
+from src.core.nlp.types import RuleMatch
+
+if TYPE_CHECKING:
+    from src.core.nlp.pipeline import KeywordScores, NLPPipeline
+    from src.core.nlp.rule_matcher import RuleMatcher
+
+ManifestPayload = list[tuple[str, str, dict[str, Any]]]
+
+# Worker-process state, populated once by `_init_worker`.
+_worker_pipeline: NLPPipeline | None = None
+_worker_matcher: RuleMatcher | None = None
+
+
+def _init_worker(manifests: ManifestPayload | None, rules: list[dict[str, Any]] | None) -> None:
+    global _worker_pipeline, _worker_matcher
+    from src.core.nlp.model_registry import ModelRegistry
+    from src.core.nlp.pipeline import NLPPipeline
+    from src.core.nlp.rule_matcher import RuleMatcher
+
+    if manifests is not None:
+        worker_registry = ModelRegistry()
+        for model_name, version, manifest in manifests:
+            worker_registry.register_manifest(model_name, version, manifest)
+        _worker_pipeline = NLPPipeline(model_registry=worker_registry)
+    if rules is not None:
+        _worker_matcher = RuleMatcher(rules=rules)
+
+
+def _score_keywords(text: str) -> KeywordScores:
+    assert _worker_pipeline is not None, "worker started without manifests"
+    return _worker_pipeline.score_keywords(Document.from_text(text))
+
+
+def _match_rules(
+    text: str, metadata: dict[str, Any] | None, profile_sample_rate: float
+) -> tuple[list[RuleMatch], ProfileRecorder]:
+    assert _worker_matcher is not None, "worker started without rules"
+    recorder = ProfileRecorder()
+    _worker_matcher.profiler = recorder
+    _worker_matcher.profile_sample_rate = profile_sample_rate
+    return _worker_matcher.match(text, metadata), recorder
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+class StagePool:
+    """Process pool for the CPU-bound keyword and rule stages.
+
+    Workers receive the manifests and ruleset once through the pool
+    initializer, so each call only ships the text and the result. The pool is
+    restarted when the pipeline version or ruleset version it was built for
+    changes; :meth:`warm_rules` does that ahead of requests on a rules swap.
+    Rule matches come back with the worker's profile records for the parent.
+    """
+
+    def __init__(self, max_workers: int | None = None) -> None:
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool: ProcessPoolExecutor | None = None
+        self._key: tuple[str | None, str | None] = (None, None)
+        self._manifests: tuple[str, ManifestPayload] | None = None
+        self._rules: tuple[str, list[dict[str, Any]]] | None = None
+        self._lock = threading.Lock()
+        self.logger = get_logger(__name__)
+
+    def submit_keywords(self, pipeline: NLPPipeline, text: str) -> Future:
+        with self._lock:
+            if self._manifests is None or self._manifests[0] != pipeline.version_token:
+                self._manifests = (pipeline.version_token, pipeline.worker_manifests())
+            pool = self._ensure_pool()
+        return pool.submit(_score_keywords, text)
+
+    def submit_rules(self, matcher: RuleMatcher, text: str, metadata: dict[str, Any] | None) -> Future:
+        with self._lock:
+            pool = self._pool_for_rules(matcher)
+        return pool.submit(_match_rules, text, metadata, matcher.profile_sample_rate)
+
+    def warm_rules(self, matcher: RuleMatcher) -> None:
+        """Rebuild the pool for ``matcher``'s current ruleset and wait for its workers."""
+        with self._lock:
+            pool = self._pool_for_rules(matcher)
+        wait([pool.submit(_ready) for _ in range(self.max_workers)])
+        self.logger.info("stage_pool.warmed", rules_version=matcher.version)
+
+    def _pool_for_rules(self, matcher: RuleMatcher) -> ProcessPoolExecutor:
+        if self._rules is None or self._rules[0] != matcher.version:
+            self._rules = (matcher.version, matcher.rules)
+        return self._ensure_pool()
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        key = (
+            self._manifests[0] if self._manifests else None,
+            self._rules[0] if self._rules else None,
+        )
+        if self._pool is None or key != self._key:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(
+                    self._manifests[1] if self._manifests else None,
+                    self._rules[1] if self._rules else None,
+                ),
+            )
+            self._key = key
+            self.logger.info("stage_pool.started", workers=self.max_workers, versions=list(key))
+        return self._pool
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+                self._key = (None, None)
+
+
+_stage_pool: StagePool | None = None
+
+
+def process_mode_enabled() -> bool:
+    return get_settings().pipeline.execution_mode == "process"
+
+
+def get_stage_pool() -> StagePool:
+    global _stage_pool
+    if _stage_pool is None:
+        _stage_pool = StagePool(get_settings().pipeline.process_workers or None)
+    return _stage_pool
+
+
+def shutdown_stage_pool() -> None:
+    global _stage_pool
+    if _stage_pool is not None:
+        _stage_pool.shutdown()
+        _stage_pool = None
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import re
+import time
+from typing import Any, Iterable
+
+from src.core.logging.config import get_logger
+from src.core.nlp.lexicon import KeywordAutomaton
+from src.core.nlp.rule_profiler import RuleProfiler
+
+# Regexes are OR-ed together in groups of this size; a group whose union does
+# not match is skipped without running its members one by one.
+REGEX_GROUP_SIZE = 32
+
+_BACKREF_RE = re.compile(r"\\[1-9]|\(\?P=")
+
+PatternRef = tuple[int, int]  # (rule index, pattern index)
+
+logger = get_logger(__name__)
+
+
+class _RegexGroup:
+    def __init__(self, members: list[tuple[PatternRef, re.Pattern[str]]]) -> None:
+        self.members = members
+        self.union = self._build_union([compiled.pattern for _, compiled in members])
+
+    @staticmethod
+    def _build_union(patterns: list[str]) -> re.Pattern[str] | None:
+        if len(patterns) < 2 or any(_BACKREF_RE.search(p) for p in patterns):
+            return None
+        try:
+            return re.compile("|".join(f"(?:{p})" for p in patterns), flags=re.IGNORECASE)
+        except re.error:
+            # Inline global flags and similar constructs cannot be combined.
+            return None
+
+    def matches(self, text: str) -> Iterable[PatternRef]:
+        if self.union is not None and self.union.search(text) is None:
+            return ()
+        return [ref for ref, compiled in self.members if compiled.search(text)]
+
+
+class CompiledRules:
+    """Ruleset compiled for matching in time proportional to the text length.
+
+    All ``contains`` values go into one Aho-Corasick automaton scanned over the
+    lowercased text; regexes are compiled once and prefiltered by group unions.
+    Hits are mapped back to ``(rule, pattern)`` positions so callers can rebuild
+    evidence in the original rule and pattern order.
+    """
+
+    def __init__(self, rules: Iterable[dict[str, Any]]) -> None:
+        self._automaton = KeywordAutomaton()
+        self._rule_ids: list[str] = []
+        self._contains: dict[int, list[PatternRef]] = {}
+        regexes: list[tuple[PatternRef, re.Pattern[str]]] = []
+        for rule_idx, rule in enumerate(rules):
+            self._rule_ids.append(str(rule.get("id")))
+            for pattern_idx, pattern in enumerate(rule.get("patterns", [])):
+                ptype = pattern.get("type", "contains")
+                value = pattern.get("value", "")
+                if not value:
+                    continue
+                ref = (rule_idx, pattern_idx)
+                if ptype == "contains":
+                    pattern_id = self._automaton.add(str(value).lower())
+                    self._contains.setdefault(pattern_id, []).append(ref)
+                elif ptype == "regex":
+                    try:
+                        regexes.append((ref, re.compile(str(value), flags=re.IGNORECASE)))
+                    except re.error as exc:
+                        logger.warning(
+                            "rule_engine.invalid_regex",
+                            rule_id=rule.get("id"),
+                            pattern=str(value),
+                            error=str(exc),
+                        )
+        self._automaton.compile()
+        self._regexes = regexes
+        self._groups = [
+            _RegexGroup(regexes[i : i + REGEX_GROUP_SIZE])
+            for i in range(0, len(regexes), REGEX_GROUP_SIZE)
+        ]
+        self.contains_count = sum(len(refs) for refs in self._contains.values())
+        self.regex_count = len(regexes)
+
+    def hits(
+        self, text: str, normalized: str, profiler: RuleProfiler | None = None
+    ) -> dict[int, list[int]]:
+        """Return ``{rule index: sorted matched pattern indexes}``.
+
+        With a ``profiler`` every regex is timed on its own (skipping the group
+        prefilter) and the cost is attributed to its rule; results are identical.
+        """
+        found: dict[int, list[int]] = {}
+        scan_start = time.perf_counter()
+        for pattern_id in self._automaton.find_ids(normalized):
+            for rule_idx, pattern_idx in self._contains.get(pattern_id, ()):
+                found.setdefault(rule_idx, []).append(pattern_idx)
+        if profiler is None:
+            for group in self._groups:
+                for rule_idx, pattern_idx in group.matches(text):
+                    found.setdefault(rule_idx, []).append(pattern_idx)
+        else:
+            scan_seconds = time.perf_counter() - scan_start
+            timings: dict[str, float] = {}
+            for (rule_idx, pattern_idx), compiled in self._regexes:
+                start = time.perf_counter()
+                matched = compiled.search(text) is not None
+                rule_id = self._rule_ids[rule_idx]
+                timings[rule_id] = timings.get(rule_id, 0.0) + time.perf_counter() - start
+                if matched:
+                    found.setdefault(rule_idx, []).append(pattern_idx)
+            profiler.record_evaluation(timings, scan_seconds)
+        for pattern_idxs in found.values():
+            pattern_idxs.sort()
+        return found
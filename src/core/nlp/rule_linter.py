@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import multiprocessing
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from src.config.settings import get_settings
+from src.core.logging.config import get_logger
+
+logger = get_logger(__name__)
+
+# A group that itself contains a quantifier and is quantified again, e.g.
+# `(a+)+`, `(\w*\s?)*` or `(?:x|y+){2,}`: the classic catastrophic shape, but
+# also plenty of safe ones such as `(\d{3}-)+`. A match only picks harder
+# benchmark inputs; the timing decides.
+_NESTED_QUANTIFIER_RE = re.compile(r"\(((?:[^()\\]|\\.)*[+*}](?:[^()\\]|\\.)*)\)(?:[+*]|\{\d*,\d*\})")
+_CLASS_SAMPLES = {"w": "a", "d": "0", "s": " ", "W": "!", "D": "a", "S": "a"}
+
+_SUFFIXES = ("\x00", "!")
+_MAX_GROWTH = 64
+
+
+class RuleLintError(ValueError):
+    """Raised when a ruleset contains regexes rejected by the linter."""
+
+
+@dataclass(frozen=True)
+class LintFinding:
+    rule_id: str
+    pattern: str
+    reason: str
+    elapsed_ms: float | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "rule_id": self.rule_id,
+            "pattern": self.pattern,
+            "reason": self.reason,
+            "elapsed_ms": self.elapsed_ms,
+        }
+
+
+def _group_sample(body: str) -> str:
+    """One string the body of a quantified group plausibly matches."""
+    body = re.sub(r"^\?(?:[:=!]|<[=!])", "", body).split("|")[0]
+    body = re.sub(r"\{\d*,?\d*\}|[+*?]", "", body)
+    sample = []
+    escaped = False
+    for ch in body:
+        if escaped:
+            sample.append(_CLASS_SAMPLES.get(ch, "" if ch in "bBAZ" else ch))
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif ch == ".":
+            sample.append("a")
+        elif ch not in "^$[]()":
+            sample.append(ch)
+    return "".join(sample)
+
+
+def adversarial_inputs(pattern: str, length: int) -> list[str]:
+    """Long runs of characters the pattern accepts, followed by a non-matching tail."""
+    literals = [ch for ch in dict.fromkeys(pattern) if ch.isalnum() or ch == " "]
+    seeds = list(dict.fromkeys(literals[:4] + ["a", " ", "0"]))
+    if len(literals) >= 2:
+        seeds.append(literals[0] + literals[1])
+    return _runs(seeds, length)
+
+
+def targeted_inputs(pattern: str, length: int) -> list[str]:
+    """Runs of the unit each nested-quantifier group repeats, for the suspicious groups only."""
+    units = (_group_sample(match.group(1)) for match in _NESTED_QUANTIFIER_RE.finditer(pattern))
+    return _runs([unit for unit in dict.fromkeys(units) if unit], length)
+
+
+def _runs(seeds: list[str], length: int) -> list[str]:
+    return [(seed * length)[:length] + suffix for seed in seeds for suffix in _SUFFIXES]
+
+
+def _measure(compiled: re.Pattern[str], texts: list[str]) -> float:
+    worst = 0.0
+    for text in texts:
+        start = time.perf_counter()
+        compiled.search(text)
+        worst = max(worst, time.perf_counter() - start)
+    return worst
+
+
+def benchmark_pattern(pattern: str, input_length: int) -> tuple[float, float, float, float]:
+    """Return worst search times in seconds at a quarter of and at ``input_length``.
+
+    The first pair covers generic inputs, the second the targeted inputs
+    (zero when the pattern has no nested quantifier).
+    """
+    compiled = re.compile(pattern, flags=re.IGNORECASE)
+    quarter = max(1, input_length // 4)
+    return (
+        _measure(compiled, adversarial_inputs(pattern, quarter)),
+        _measure(compiled, adversarial_inputs(pattern, input_length)),
+        _measure(compiled, targeted_inputs(pattern, quarter)),
+        _measure(compiled, targeted_inputs(pattern, input_length)),
+    )
+
+
+def _benchmark_worker(conn: Any, patterns: list[str], input_length: int) -> None:
+    for pattern in patterns:
+        conn.send(benchmark_pattern(pattern, input_length))
+    conn.close()
+
+
+def _benchmark_isolated(
+    patterns: list[str], input_length: int, timeout: float
+) -> dict[str, tuple[float, float, float, float] | None]:
+    """Benchmark ``patterns`` in a child process; ``None`` marks a pattern that timed out.
+
+    A catastrophic regex holds the GIL until it finishes, so it cannot be
+    bounded in-process; the child is killed and restarted after the culprit.
+    Patterns missing from the result could not be benchmarked at all.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    results: dict[str, tuple[float, float, float, float] | None] = {}
+    remaining = list(patterns)
+    while remaining:
+        parent, child = ctx.Pipe(duplex=False)
+        proc = ctx.Process(target=_benchmark_worker, args=(child, remaining, input_length), daemon=True)
+        proc.start()
+        child.close()
+        try:
+            while remaining:
+                if not parent.poll(timeout):
+                    results[remaining.pop(0)] = None
+                    break
+                results[remaining.pop(0)] = parent.recv()
+        except EOFError:
+            # The child died without a verdict; that is an environment problem,
+            # not evidence against the pattern.
+            logger.warning("rule_linter.benchmark_unavailable", pending=len(remaining))
+            remaining = []
+        finally:
+            if proc.is_alive():
+                proc.kill()
+            proc.join()
+            parent.close()
+    return results
+
+
+def _steep(short: float, full: float) -> bool:
+    # Linear patterns grow ~4x between the two input lengths, quadratic ~16x.
+    return full > 0.001 and short > 0 and full / short > _MAX_GROWTH
+
+
+class RuleLinter:
+    """Finds regexes with super-linear backtracking before they reach traffic.
+
+    Each regex is benchmarked against adversarial inputs in an isolated
+    process. A static nested-quantifier check only adds inputs aimed at the
+    suspicious group; those are judged by growth rate, not the absolute
+    budget, since they deliberately hit the pattern's worst case. Only the
+    benchmark produces findings. Verdicts are memoised per pattern, so
+    reloads only benchmark new or edited regexes.
+    """
+
+    def __init__(
+        self,
+        budget_ms: float = 10.0,
+        input_length: int = 2048,
+        timeout_ms: float = 1000.0,
+    ) -> None:
+        self.budget_ms = budget_ms
+        self.input_length = input_length
+        self.timeout_ms = timeout_ms
+        self._verdicts: dict[str, tuple[str, float | None] | None] = {}
+
+    def lint(self, rules: Iterable[dict[str, Any]]) -> list[LintFinding]:
+        regexes: list[tuple[str, str]] = []
+        for rule in rules:
+            for pattern in rule.get("patterns", []):
+                value = pattern.get("value", "")
+                if pattern.get("type", "contains") == "regex" and value:
+                    regexes.append((str(rule.get("id")), str(value)))
+
+        unknown = [p for p in dict.fromkeys(value for _, value in regexes) if p not in self._verdicts]
+        benchmarkable: list[str] = []
+        for pattern in unknown:
+            try:
+                re.compile(pattern, flags=re.IGNORECASE)
+            except re.error as exc:
+                self._verdicts[pattern] = (f"invalid regex: {exc}", None)
+                continue
+            benchmarkable.append(pattern)
+        if benchmarkable:
+            timings = _benchmark_isolated(benchmarkable, self.input_length, self.timeout_ms / 1000)
+            for pattern, timing in timings.items():
+                if timing is None:
+                    self._verdicts[pattern] = ("benchmark timed out", self.timeout_ms)
+                    continue
+                short, full, targeted_short, targeted_full = timing
+                elapsed_ms = round(max(full, targeted_full) * 1000, 3)
+                if full * 1000 > self.budget_ms or _steep(short, full) or _steep(targeted_short, targeted_full):
+                    self._verdicts[pattern] = ("super-linear backtracking", elapsed_ms)
+                else:
+                    self._verdicts[pattern] = None
+
+        findings = []
+        for rule_id, pattern in regexes:
+            verdict = self._verdicts.get(pattern)
+            if verdict is not None:
+                findings.append(LintFinding(rule_id, pattern, verdict[0], verdict[1]))
+        return findings
+
+
+def quarantine(
+    rules: tuple[dict[str, Any], ...], findings: list[LintFinding]
+) -> tuple[dict[str, Any], ...]:
+    """Drop flagged regex patterns from their rules; rules left without patterns are dropped."""
+    flagged = {(finding.rule_id, finding.pattern) for finding in findings}
+    kept: list[dict[str, Any]] = []
+    for rule in rules:
+        original = rule.get("patterns", [])
+        patterns = [
+            pattern
+            for pattern in original
+            if pattern.get("type", "contains") != "regex"
+            or (str(rule.get("id")), str(pattern.get("value", ""))) not in flagged
+        ]
+        if len(patterns) == len(original):
+            kept.append(rule)
+        elif patterns:
+            kept.append({**rule, "patterns": patterns})
+    return tuple(kept)
+
+
+_linter: RuleLinter | None = None
+
+
+def get_rule_linter() -> RuleLinter:
+    global _linter
+    if _linter is None:
+        settings = get_settings().rules
+        _linter = RuleLinter(budget_ms=settings.lint_budget_ms, timeout_ms=settings.lint_timeout_ms)
+    return _linter
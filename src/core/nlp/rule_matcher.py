@@ -1,90 +1,489 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
-import re
+import os
+import pickle
+import random
+import threading
 import time
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 import yaml
 
 from src.config.settings import get_settings
+from src.core.executors import get_cpu_executor
 from src.core.logging.config import get_logger
+from src.core.nlp.document import Document, as_document
+from src.core.nlp.process_stages import get_stage_pool, process_mode_enabled
+from src.core.nlp.rule_engine import CompiledRules
+from src.core.nlp.rule_linter import (
+    LintFinding,
+    RuleLinter,
+    RuleLintError,
+    get_rule_linter,
+    quarantine,
+)
+from src.core.nlp.rule_profiler import RULES_QUARANTINED, ProfileRecorder, rule_profiler
 from src.core.nlp.types import RuleMatch
 
 
+_RULE_SUFFIXES = {".json", ".yaml", ".yml"}
+
+Fingerprint = dict[str, tuple[int, int]]
+CompiledArtifact = tuple[tuple[dict[str, Any], ...], CompiledRules, tuple[LintFinding, ...]]
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    """Immutable snapshot of the loaded rules; replaced as a whole on reload."""
+
+    rules: tuple[dict[str, Any], ...] = ()
+    fingerprint: Fingerprint = field(default_factory=dict)
+    version: str = ""
+    loaded_at: float = 0.0
+    compiled: CompiledRules = field(default_factory=lambda: CompiledRules(()))
+    lint_findings: tuple[LintFinding, ...] = ()
+
+
+def _rule_files(rules_path: Path) -> list[Path]:
+    return sorted(
+        file
+        for file in rules_path.glob("**/*")
+        if file.suffix.lower() in _RULE_SUFFIXES and file.is_file()
+    )
+
+
+def scan_fingerprint(rules_path: Path) -> Fingerprint:
+    fingerprint: Fingerprint = {}
+    for file in _rule_files(rules_path):
+        stat = file.stat()
+        fingerprint[str(file)] = (stat.st_mtime_ns, stat.st_size)
+    return fingerprint
+
+
+def _rules_version(rules: tuple[dict[str, Any], ...]) -> str:
+    payload = json.dumps(list(rules), sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def read_rule_sources(rules_path: Path) -> tuple[str, dict[Path, bytes], Fingerprint]:
+    """Read every rule file and return ``(content version, sources, fingerprint)``.
+
+    The version hashes relative paths and file bytes only, so every worker
+    loading the same rule pack derives the same value.
+    """
+    digest = hashlib.sha256()
+    sources: dict[Path, bytes] = {}
+    fingerprint: Fingerprint = {}
+    for file in _rule_files(rules_path):
+        stat = file.stat()
+        raw = file.read_bytes()
+        relative = file.relative_to(rules_path).as_posix().encode("utf-8")
+        digest.update(len(relative).to_bytes(4, "big") + relative)
+        digest.update(len(raw).to_bytes(8, "big") + raw)
+        sources[file] = raw
+        fingerprint[str(file)] = (stat.st_mtime_ns, stat.st_size)
+    return digest.hexdigest()[:16], sources, fingerprint
+
+
+def parse_rules(sources: dict[Path, bytes]) -> tuple[dict[str, Any], ...]:
+    rules: list[dict[str, Any]] = []
+    for file, raw in sources.items():
+        text = raw.decode("utf-8")
+        data = json.loads(text) if file.suffix.lower() == ".json" else yaml.safe_load(text)
+        for rule in (data or {}).get("rules", []):
+            rule["source_file"] = str(file)
+            rules.append(rule)
+    return tuple(rules)
+
+
+class CompiledRulesetCache:
+    """On-disk cache of compiled rulesets keyed by rules path and content version.
+
+    Restarted or newly scaled-out workers unpickle the compiled artifact instead
+    of re-parsing YAML and rebuilding the automaton. Artifacts of older
+    versions of the same rules path are pruned when a new one is written.
+    """
+
+    FORMAT = 3
+
+    def __init__(self, cache_dir: str | Path, lint_mode: str = "off") -> None:
+        self.cache_dir = Path(cache_dir).resolve()
+        self.lint_mode = lint_mode
+        self.logger = get_logger(__name__)
+
+    def _prefix(self, rules_path: Path) -> str:
+        scope = f"{self.FORMAT}:{self.lint_mode}:{rules_path}".encode("utf-8")
+        return f"ruleset-{hashlib.sha256(scope).hexdigest()[:12]}"
+
+    def path_for(self, rules_path: Path, version: str) -> Path:
+        return self.cache_dir / f"{self._prefix(rules_path)}-{version}.pickle"
+
+    def load(self, rules_path: Path, version: str) -> CompiledArtifact | None:
+        path = self.path_for(rules_path, version)
+        if not path.exists():
+            return None
+        try:
+            with path.open("rb") as fh:
+                rules, compiled, findings = pickle.load(fh)
+        except Exception as exc:
+            self.logger.warning("rule_cache.load_failed", path=str(path), error=str(exc))
+            return None
+        return rules, compiled, findings
+
+    def store(self, rules_path: Path, version: str, artifact: CompiledArtifact) -> None:
+        path = self.path_for(rules_path, version)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            with tmp.open("wb") as fh:
+                pickle.dump(artifact, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+            for stale in self.cache_dir.glob(f"{self._prefix(rules_path)}-*.pickle"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+        except OSError as exc:
+            self.logger.warning("rule_cache.store_failed", path=str(path), error=str(exc))
+
+
+def compile_rules(
+    rules: tuple[dict[str, Any], ...],
+    linter: RuleLinter | None = None,
+    lint_mode: str = "off",
+) -> CompiledArtifact:
+    """Lint and compile parsed rules; raises :class:`RuleLintError` in ``reject`` mode."""
+    findings: list[LintFinding] = []
+    if linter is not None and lint_mode != "off":
+        findings = linter.lint(rules)
+        for finding in findings:
+            logger.warning("rule_linter.flagged", mode=lint_mode, **finding.as_dict())
+        if findings and lint_mode == "reject":
+            raise RuleLintError(
+                f"{len(findings)} regex pattern(s) rejected: "
+                + ", ".join(sorted({finding.rule_id for finding in findings}))
+            )
+        if findings and lint_mode == "quarantine":
+            rules = quarantine(rules, findings)
+    return rules, CompiledRules(rules), tuple(findings)
+
+
+def build_ruleset(
+    rules_path: Path,
+    version: str,
+    sources: dict[Path, bytes],
+    fingerprint: Fingerprint,
+    cache: CompiledRulesetCache | None = None,
+    linter: RuleLinter | None = None,
+    lint_mode: str = "off",
+) -> RuleSet:
+    artifact = cache.load(rules_path, version) if cache is not None else None
+    if artifact is None:
+        artifact = compile_rules(parse_rules(sources), linter, lint_mode)
+        if cache is not None:
+            cache.store(rules_path, version, artifact)
+    rules, compiled, findings = artifact
+    return RuleSet(
+        rules=rules,
+        fingerprint=fingerprint,
+        version=version,
+        loaded_at=time.time(),
+        compiled=compiled,
+        lint_findings=findings,
+    )
+
+
+def load_ruleset(
+    rules_path: Path,
+    cache: CompiledRulesetCache | None = None,
+    linter: RuleLinter | None = None,
+    lint_mode: str = "off",
+) -> RuleSet:
+    version, sources, fingerprint = read_rule_sources(rules_path)
+    return build_ruleset(rules_path, version, sources, fingerprint, cache, linter, lint_mode)
+
+
 class RuleMatcher:
-    """Loads YAML/JSON rules and performs keyword or regex matching."""
+    """Loads YAML/JSON rules and performs keyword or regex matching.
 
-    def __init__(self, rules_path: str | None = None) -> None:
+    ``match`` only reads the current :class:`RuleSet` reference and never
+    touches the filesystem; a :class:`RuleWatcher` (or an explicit
+    ``reload_if_changed``) builds the next ruleset and swaps it in.
+    """
+
+    def __init__(
+        self,
+        rules_path: str | None = None,
+        rules: list[dict[str, Any]] | None = None,
+        cache_dir: str | None = None,
+        lint_mode: str | None = None,
+    ) -> None:
         settings = get_settings()
         self.rules_path = Path(rules_path or settings.rules_path).resolve()
-        self._rules: list[dict[str, Any]] = []
-        self._last_loaded_at: float = 0.0
-        self._fingerprint: dict[str, float] = {}
+        self.lint_mode = settings.rules.lint_mode if lint_mode is None else lint_mode
+        self._linter = get_rule_linter() if self.lint_mode != "off" else None
+        cache_dir = cache_dir or settings.rules.cache_dir
+        self._cache = CompiledRulesetCache(cache_dir, self.lint_mode) if cache_dir else None
+        self.profiler = rule_profiler
+        self.profile_sample_rate = settings.rules.profile_sample_rate
+        self._static = rules is not None
+        self._listeners: list[Callable[[str], None]] = []
+        self._reload_lock = threading.Lock()
         self.logger = get_logger(__name__)
-        self.reload()
+        if rules is not None:
+            frozen = tuple(rules)
+            self._ruleset = RuleSet(
+                rules=frozen,
+                version=_rules_version(frozen),
+                loaded_at=time.time(),
+                compiled=CompiledRules(frozen),
+            )
+        else:
+            self._ruleset = RuleSet()
+            self.reload()
+            if process_mode_enabled():
+                # Respawn the stage pool with the new rules now, not on the next request.
+                self.on_reload(lambda version: get_stage_pool().warm_rules(self))
 
-    def reload(self) -> None:
-        self._rules = []
-        self._fingerprint = {}
-        if not self.rules_path.exists():
-            self.logger.warning("rule_matcher.no_rules_path", path=str(self.rules_path))
-            return
+    @property
+    def rules(self) -> list[dict[str, Any]]:
+        return list(self._ruleset.rules)
+
+    @property
+    def version(self) -> str:
+        return self._ruleset.version
+
+    @property
+    def lint_findings(self) -> tuple[LintFinding, ...]:
+        return self._ruleset.lint_findings
 
-        for file in self.rules_path.glob("**/*"):
-            if file.suffix.lower() not in {".json", ".yaml", ".yml"}:
-                continue
-            with file.open("r", encoding="utf-8") as fh:
-                data = json.load(fh) if file.suffix.lower() == ".json" else yaml.safe_load(fh)
-            for rule in data.get("rules", []):
-                rule["source_file"] = str(file)
-                self._rules.append(rule)
-            self._fingerprint[str(file)] = file.stat().st_mtime
-
-        self._last_loaded_at = time.time()
+    def reload(self) -> bool:
+        """Build a new ruleset and publish it; keep the current one if loading fails.
+
+        Files whose content hash matches the published version are not re-parsed.
+        A :class:`RuleLintError` with no ruleset loaded yet is re-raised: there
+        is nothing to keep, and serving with zero rules would let all text pass.
+        """
+        with self._reload_lock:
+            current = self._ruleset
+            if not self.rules_path.exists():
+                self.logger.warning("rule_matcher.no_rules_path", path=str(self.rules_path))
+                self._ruleset = RuleSet(loaded_at=time.time())
+                return True
+            try:
+                version, sources, fingerprint = read_rule_sources(self.rules_path)
+                if version == current.version:
+                    self._ruleset = replace(current, fingerprint=fingerprint)
+                    return True
+                ruleset = build_ruleset(
+                    self.rules_path,
+                    version,
+                    sources,
+                    fingerprint,
+                    self._cache,
+                    self._linter,
+                    self.lint_mode,
+                )
+            except RuleLintError as exc:
+                if not current.loaded_at:
+                    raise
+                self.logger.error(
+                    "rule_matcher.reload_rejected",
+                    path=str(self.rules_path),
+                    error=str(exc),
+                    kept_version=current.version,
+                )
+                return False
+            except (OSError, ValueError, TypeError, AttributeError, yaml.YAMLError) as exc:
+                self.logger.error(
+                    "rule_matcher.reload_failed",
+                    path=str(self.rules_path),
+                    error=str(exc),
+                    kept_version=current.version,
+                )
+                return False
+            self._ruleset = ruleset
+        RULES_QUARANTINED.set(len(ruleset.lint_findings) if self.lint_mode == "quarantine" else 0)
         self.logger.info(
             "rule_matcher.loaded",
-            count=len(self._rules),
+            count=len(ruleset.rules),
             path=str(self.rules_path),
+            version=ruleset.version,
+            lint_findings=len(ruleset.lint_findings),
         )
+        for listener in list(self._listeners):
+            try:
+                listener(ruleset.version)
+            except Exception as exc:
+                self.logger.warning("rule_matcher.listener_failed", error=str(exc))
+        return True
 
-    def reload_if_changed(self) -> None:
-        if not self.rules_path.exists():
-            return
-        for file in self.rules_path.glob("**/*"):
-            if file.suffix.lower() not in {".json", ".yaml", ".yml"}:
-                continue
-            mtime = file.stat().st_mtime
-            if self._fingerprint.get(str(file)) != mtime:
-                self.reload()
-                break
-
-    def match(self, text: str, metadata: dict[str, Any] | None = None) -> list[RuleMatch]:
-        self.reload_if_changed()
+    def on_reload(self, listener: Callable[[str], None]) -> None:
+        """Call ``listener(new_version)`` whenever a new ruleset is published."""
+        self._listeners.append(listener)
+
+    def reload_if_changed(self) -> bool:
+        if self._static or not self.rules_path.exists():
+            return False
+        if scan_fingerprint(self.rules_path) == self._ruleset.fingerprint:
+            return False
+        previous = self.version
+        self.reload()
+        return self.version != previous
+
+    async def match_async(
+        self, text: str | Document, metadata: dict[str, Any] | None = None
+    ) -> list[RuleMatch]:
+        """Run ``match`` off the event loop, on the process pool in process mode."""
+        doc = as_document(text)
+        if process_mode_enabled():
+            return self._from_worker(
+                await asyncio.wrap_future(get_stage_pool().submit_rules(self, doc.text, metadata))
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_cpu_executor(), self.match, doc, metadata)
+
+    async def match_many_async(self, docs: list[Document]) -> list[list[RuleMatch]]:
+        """Match a batch against one ruleset snapshot in a single executor job."""
+        if process_mode_enabled():
+            pool = get_stage_pool()
+            results = await asyncio.gather(
+                *(asyncio.wrap_future(pool.submit_rules(self, doc.text, None)) for doc in docs)
+            )
+            return [self._from_worker(result) for result in results]
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_cpu_executor(), self.match_many, docs)
+
+    def _from_worker(self, result: tuple[list[RuleMatch], ProfileRecorder]) -> list[RuleMatch]:
+        matches, recorder = result
+        recorder.replay(self.profiler)
+        return matches
+
+    def match_many(self, docs: list[Document]) -> list[list[RuleMatch]]:
+        ruleset = self._ruleset
+        return [self.match(doc, ruleset=ruleset) for doc in docs]
+
+    def match(
+        self,
+        text: str | Document,
+        metadata: dict[str, Any] | None = None,
+        ruleset: RuleSet | None = None,
+    ) -> list[RuleMatch]:
+        ruleset = ruleset or self._ruleset
+        doc = as_document(text)
         metadata = metadata or {}
         matches: list[RuleMatch] = []
-        for rule in self._rules:
-            evidence: list[str] = []
-            for pattern in rule.get("patterns", []):
-                ptype = pattern.get("type", "contains")
-                value = pattern.get("value", "")
-                if not value:
-                    continue
-                if ptype == "contains" and value.lower() in text.lower():
-                    evidence.append(value)
-                elif ptype == "regex" and re.search(value, text, flags=re.IGNORECASE):
-                    evidence.append(value)
-            if evidence:
-                matches.append(
-                    RuleMatch(
-                        rule_id=rule["id"],
-                        description=rule.get("description", ""),
-                        action=rule.get("action", "review"),
-                        severity=rule.get("severity", "medium"),
-                        tags=rule.get("tags", []),
-                        evidence=evidence,
-                        metadata={**metadata, "source_file": rule.get("source_file")},
-                    )
+        sampled = self.profile_sample_rate > 0 and random.random() < self.profile_sample_rate
+        hits = ruleset.compiled.hits(doc.text, doc.normalized, self.profiler if sampled else None)
+        for rule_idx in sorted(hits):
+            rule = ruleset.rules[rule_idx]
+            patterns = rule["patterns"]
+            evidence = [patterns[pattern_idx].get("value", "") for pattern_idx in hits[rule_idx]]
+            matches.append(
+                RuleMatch(
+                    rule_id=rule["id"],
+                    description=rule.get("description", ""),
+                    action=rule.get("action", "review"),
+                    severity=rule.get("severity", "medium"),
+                    tags=rule.get("tags", []),
+                    evidence=evidence,
+                    metadata={**metadata, "source_file": rule.get("source_file")},
                 )
+            )
+        if matches:
+            self.profiler.record_hits(match.rule_id for match in matches)
         return matches
+
+
+class RuleWatcher:
+    """Background thread that reloads a :class:`RuleMatcher` when rule files change.
+
+    Uses ``watchfiles`` (inotify/FSEvents) when it is installed and falls back
+    to polling the file fingerprint every ``poll_interval`` seconds.
+    """
+
+    def __init__(self, matcher: RuleMatcher, poll_interval: float = 2.0) -> None:
+        self.matcher = matcher
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.logger = get_logger(__name__)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="dep-rule-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        try:
+            from watchfiles import watch
+        except ImportError:
+            watch = None
+        if watch is not None and self.matcher.rules_path.exists():
+            self.logger.info("rule_watcher.started", mode="notify", path=str(self.matcher.rules_path))
+            try:
+                for _ in watch(
+                    self.matcher.rules_path,
+                    stop_event=self._stop,
+                    rust_timeout=int(self.poll_interval * 1000),
+                    yield_on_timeout=True,
+                ):
+                    self._check()
+                return
+            except Exception as exc:  # pragma: no cover - platform specific watcher failures
+                self.logger.warning("rule_watcher.notify_failed", error=str(exc))
+        self.logger.info("rule_watcher.started", mode="poll", path=str(self.matcher.rules_path))
+        while not self._stop.wait(self.poll_interval):
+            self._check()
+
+    def _check(self) -> None:
+        try:
+            self.matcher.reload_if_changed()
+        except OSError as exc:
+            self.logger.warning("rule_watcher.check_failed", error=str(exc))
+
+
+_rule_matcher: RuleMatcher | None = None
+_rule_watcher: RuleWatcher | None = None
+
+
+def get_rule_matcher() -> RuleMatcher:
+    global _rule_matcher
+    if _rule_matcher is None:
+        _rule_matcher = RuleMatcher()
+    return _rule_matcher
+
+
+def start_rule_watcher() -> RuleWatcher | None:
+    global _rule_watcher
+    settings = get_settings().rules
+    if not settings.watch_enabled:
+        return None
+    if _rule_watcher is None:
+        _rule_watcher = RuleWatcher(get_rule_matcher(), settings.poll_interval_seconds)
+    _rule_watcher.start()
+    return _rule_watcher
+
+
+def stop_rule_watcher() -> None:
+    global _rule_watcher
+    if _rule_watcher is not None:
+        _rule_watcher.stop()
+        _rule_watcher = None
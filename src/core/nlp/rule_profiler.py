@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Iterable
+
+from prometheus_client import Counter, Gauge, Histogram
+
+_SECONDS_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+RULE_EVAL_SECONDS = Histogram(
+    "dep_rule_eval_seconds",
+    "Sampled regex evaluation time per rule",
+    labelnames=("rule_id",),
+    buckets=_SECONDS_BUCKETS,
+)
+RULE_SCAN_SECONDS = Histogram(
+    "dep_rule_automaton_seconds",
+    "Sampled time of the shared contains-pattern automaton scan",
+    buckets=_SECONDS_BUCKETS,
+)
+RULE_HITS = Counter("dep_rule_hits_total", "Rule matches by rule id", labelnames=("rule_id",))
+RULES_QUARANTINED = Gauge(
+    "dep_rules_quarantined", "Regex patterns flagged by the rule linter in the active ruleset"
+)
+
+
+@dataclass
+class RuleStats:
+    samples: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    hits: int = 0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.samples if self.samples else 0.0
+
+
+class RuleProfiler:
+    """Collects sampled per-rule evaluation times and hit counts.
+
+    Timings come from sampled ``RuleMatcher.match`` calls, where every regex is
+    evaluated on its own instead of behind its group prefilter so the cost can
+    be attributed to a single rule.
+    """
+
+    def __init__(self) -> None:
+        self._stats: dict[str, RuleStats] = {}
+        self._lock = threading.Lock()
+        self.sampled_evaluations = 0
+
+    def record_evaluation(self, timings: dict[str, float], scan_seconds: float) -> None:
+        RULE_SCAN_SECONDS.observe(scan_seconds)
+        for rule_id, seconds in timings.items():
+            RULE_EVAL_SECONDS.labels(rule_id).observe(seconds)
+        with self._lock:
+            self.sampled_evaluations += 1
+            for rule_id, seconds in timings.items():
+                stats = self._stats.setdefault(rule_id, RuleStats())
+                stats.samples += 1
+                stats.total_seconds += seconds
+                stats.max_seconds = max(stats.max_seconds, seconds)
+
+    def record_hits(self, rule_ids: Iterable[str]) -> None:
+        rule_ids = list(rule_ids)
+        for rule_id in rule_ids:
+            RULE_HITS.labels(rule_id).inc()
+        with self._lock:
+            for rule_id in rule_ids:
+                self._stats.setdefault(rule_id, RuleStats()).hits += 1
+
+    def top(self, limit: int = 10) -> list[tuple[str, RuleStats]]:
+        """Return the slowest rules by mean sampled evaluation time."""
+        with self._lock:
+            ranked = [
+                (rule_id, RuleStats(**vars(stats)))
+                for rule_id, stats in self._stats.items()
+                if stats.samples
+            ]
+        ranked.sort(key=lambda item: (item[1].mean_seconds, item[1].max_seconds), reverse=True)
+        return ranked[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self.sampled_evaluations = 0
+
+
+class ProfileRecorder:
+    """Stands in for the profiler in a stage-pool worker process.
+
+    The worker's records travel back with its matches and are replayed into
+    the parent's profiler, so profiling and metrics also cover process mode.
+    """
+
+    def __init__(self) -> None:
+        self.evaluations: list[tuple[dict[str, float], float]] = []
+        self.hits: list[str] = []
+
+    def record_evaluation(self, timings: dict[str, float], scan_seconds: float) -> None:
+        self.evaluations.append((timings, scan_seconds))
+
+    def record_hits(self, rule_ids: Iterable[str]) -> None:
+        self.hits.extend(rule_ids)
+
+    def replay(self, profiler: RuleProfiler) -> None:
+        for timings, scan_seconds in self.evaluations:
+            profiler.record_evaluation(timings, scan_seconds)
+        if self.hits:
+            profiler.record_hits(self.hits)
+
+
+rule_profiler = RuleProfiler()
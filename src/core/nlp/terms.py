@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import re
+
+# CJK ideographs have no word boundaries, so runs are split into overlapping bigrams.
+_CJK = r"\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+_TERM_RE = re.compile(rf"(?P<cjk>[{_CJK}]+)|(?P<word>[^\W_{_CJK}]+)")
+_CJK_CHAR_RE = re.compile(rf"[{_CJK}]")
+
+MAX_TERM_LENGTH = 64
+
+
+def extract_terms(text: str, limit: int | None = None, *, cjk_unigrams: bool = False) -> list[str]:
+    """Return the distinct lowercased terms of ``text`` in first-seen order.
+
+    Latin-script words are kept whole, so a lookup by term matches whole words
+    only (``hate`` does not find ``hated``). CJK runs become character bigrams
+    (a single ideograph stays a unigram); ``cjk_unigrams`` also emits every
+    ideograph of longer runs, so single-character keywords can be found in them.
+    """
+    seen: dict[str, None] = {}
+    for match in _TERM_RE.finditer(text.lower()):
+        run = match.group("cjk")
+        if run is None:
+            candidates = [match.group("word")[:MAX_TERM_LENGTH]]
+        elif len(run) == 1:
+            candidates = [run]
+        elif cjk_unigrams:
+            candidates = [run[i : i + n] for i in range(len(run)) for n in (1, 2) if i + n <= len(run)]
+        else:
+            candidates = [run[i : i + 2] for i in range(len(run) - 1)]
+        for term in candidates:
+            seen.setdefault(term, None)
+            if limit is not None and len(seen) >= limit:
+                return list(seen)
+    return list(seen)
+
+
+def single_term(keyword: str) -> str | None:
+    """Return the term ``keyword`` consists of, or ``None`` if it spans several.
+
+    A lone ideograph is also ``None``: without ``cjk_unigrams`` longer runs
+    containing it only yield bigrams, so it is not a whole term of those texts.
+    """
+    terms = extract_terms(keyword)
+    if len(terms) == 1 and terms[0] == keyword.strip().lower() and not _CJK_CHAR_RE.fullmatch(terms[0]):
+        return terms[0]
+    return None
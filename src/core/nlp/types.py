@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import hashlib
 import uuid
+from dataclasses import dataclass
 from enum import Enum
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -49,6 +50,31 @@ class AnalyzerResult(BaseModel):
     latency_ms: float
 
 
+class AnalyzerBatchItem(BaseModel):
+    index: int
+    result: AnalyzerResult | None = None
+    error: str | None = None
+    # False when ``result`` is a keyword fallback for a failed LLM call.
+    settled: bool = True
+
+
+@dataclass
+class LLMClassificationResult:
+    label: Literal["positive", "neutral", "negative"]
+    crisis_probability: float
+    rationale: str | None = None
+
+
+def parse_classification(data: dict) -> LLMClassificationResult:
+    label = data.get("label", "neutral")
+    crisis_prob = float(data.get("crisis_probability", 0.0))
+    rationale = data.get("rationale")
+    if label not in {"positive", "neutral", "negative"}:
+        label = "neutral"
+    crisis_prob = max(0.0, min(1.0, crisis_prob))
+    return LLMClassificationResult(label=label, crisis_probability=crisis_prob, rationale=rationale)
+
+
 def hash_text(text: str) -> str:
     return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
 
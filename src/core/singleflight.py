@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Generic, TypeVar
+
+from prometheus_client import Counter
+
+SINGLEFLIGHT_CALLS = Counter(
+    "dep_singleflight_calls_total",
+    "Coalesced work by group and role (leader ran it, follower awaited it)",
+    labelnames=("group", "role"),
+)
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Coalesces concurrent calls with the same key into one execution.
+
+    The first caller starts the work as its own task; callers arriving while it
+    is in flight await the same task. Cancelling one waiter does not cancel the
+    shared work; it is cancelled only once every waiter has gone.
+    """
+
+    def __init__(self, group: str) -> None:
+        self.group = group
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._waiters: dict[asyncio.Task, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Return ``(result, shared)``; ``shared`` is True for followers."""
+        task = self._inflight.get(key)
+        shared = task is not None and not task.done()
+        if not shared:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+        SINGLEFLIGHT_CALLS.labels(self.group, "follower" if shared else "leader").inc()
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task), shared
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if not task.done():
+                    task.cancel()
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from prometheus_client import Histogram
+
+STAGE_SECONDS = Histogram(
+    "dep_stage_seconds",
+    "Stage duration by graph, stage and final status",
+    labelnames=("graph", "stage", "status"),
+)
+
+StageFn = Callable[["StageContext"], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    fn: StageFn
+    after: tuple[str, ...] = ()
+    optional: tuple[str, ...] = ()
+
+
+@dataclass
+class StageRun:
+    results: dict[str, Any] = field(default_factory=dict)
+    status: dict[str, str] = field(default_factory=dict)
+    durations_ms: dict[str, float] = field(default_factory=dict)
+
+    def ran(self, name: str) -> bool:
+        return self.status.get(name) == "done"
+
+    def completed(self) -> list[str]:
+        return [name for name, status in self.status.items() if status == "done"]
+
+
+class StageContext:
+    """What a running stage sees: finished dependency results and sibling control."""
+
+    def __init__(self, run: StageRun, tasks: dict[str, asyncio.Task]) -> None:
+        self._run = run
+        self._tasks = tasks
+
+    def __getitem__(self, name: str) -> Any:
+        return self._run.results.get(name) if self._run.ran(name) else None
+
+    def status(self, name: str) -> str:
+        return self._run.status.get(name, "pending")
+
+    def cancel(self, name: str) -> None:
+        """Cancel a stage that is no longer needed; no-op once it has finished."""
+        task = self._tasks.get(name)
+        if task is not None and not task.done():
+            task.cancel()
+
+
+class StageGraph:
+    """Runs declared async stages concurrently, each as soon as its dependencies finish.
+
+    A stage receives a :class:`StageContext` with the results of the stages it
+    declared in ``after`` (required) and ``optional``. When a required
+    dependency fails, is cancelled or is skipped, the stage is skipped; an
+    optional dependency in that state simply reads as ``None``. The first stage
+    failure is re-raised from :meth:`run` once every stage has settled.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._stages: dict[str, Stage] = {}
+
+    def stage(
+        self,
+        name: str,
+        fn: StageFn,
+        *,
+        after: tuple[str, ...] = (),
+        optional: tuple[str, ...] = (),
+    ) -> "StageGraph":
+        for dep in after + optional:
+            if dep not in self._stages:
+                raise ValueError(f"stage {name!r} depends on undeclared stage {dep!r}")
+        self._stages[name] = Stage(name, fn, after, optional)
+        return self
+
+    async def run(self) -> StageRun:
+        run = StageRun()
+        tasks: dict[str, asyncio.Task] = {}
+        ctx = StageContext(run, tasks)
+        for name in self._stages:
+            run.status[name] = "pending"
+        for stage in self._stages.values():
+            tasks[stage.name] = asyncio.create_task(self._run_stage(stage, run, ctx, tasks))
+        try:
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+        finally:
+            for task in tasks.values():
+                task.cancel()
+        for name, task in tasks.items():
+            if task.cancelled() and run.status[name] == "pending":
+                run.status[name] = "cancelled"
+        for name, status in run.status.items():
+            if status == "failed":
+                raise run.results[name]
+        return run
+
+    async def _run_stage(
+        self,
+        stage: Stage,
+        run: StageRun,
+        ctx: StageContext,
+        tasks: dict[str, asyncio.Task],
+    ) -> None:
+        deps = stage.after + stage.optional
+        if deps:
+            await asyncio.wait([tasks[dep] for dep in deps])
+        if any(run.status.get(dep) != "done" for dep in stage.after):
+            run.status[stage.name] = "skipped"
+            return
+        start = time.perf_counter()
+        try:
+            run.results[stage.name] = await stage.fn(ctx)
+            status = "done"
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        except Exception as exc:
+            run.results[stage.name] = exc
+            status = "failed"
+        finally:
+            elapsed = time.perf_counter() - start
+            run.status[stage.name] = status
+            run.durations_ms[stage.name] = round(elapsed * 1000, 2)
+            STAGE_SECONDS.labels(self.name, stage.name, status).observe(elapsed)
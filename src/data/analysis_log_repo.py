@@ -1,33 +1,72 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.nlp.types import AnalyzerResult
+from src.data.rollup_repo import AnalysisRollupRepository
+from src.data.term_index_repo import TermIndexRepository
+from src.db.write_behind import WriteBehindQueue, with_defaults
 from src.models.analysis_log import AnalysisLog
 
 
 class AnalysisLogRepository:
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        writer: WriteBehindQueue | None = None,
+        rollups: AnalysisRollupRepository | None = None,
+        term_index: TermIndexRepository | None = None,
+    ) -> None:
         self.session = session
+        self.writer = writer
+        self.rollups = rollups
+        self.term_index = term_index
 
     async def create_from_result(self, result: AnalyzerResult) -> AnalysisLog:
-        log = AnalysisLog(
-            request_id=result.request_id,
-            text_hash=result.text_hash,
-            text=result.text,
-            label=result.sentiment.label.value,
-            empathy_score=result.empathy.score,
-            crisis_probability=result.crisis.probability,
-            evidence=[chunk.model_dump() for chunk in result.evidence],
-            model_version=result.model_version,
-            rule_version=result.rule_version,
-        )
+        row = with_defaults(self._row_from_result(result))
+        if self.writer is not None:
+            # Rollups and terms for queued rows are written by the write-behind flush.
+            await self.writer.put(AnalysisLog, row)
+            return AnalysisLog(**row)
+        log = AnalysisLog(**row)
         self.session.add(log)
         await self.session.flush()
+        await self._derive([row])
         await self.session.commit()
         return log
 
+    async def bulk_create_from_results(self, results: list[AnalyzerResult]) -> int:
+        """Insert all ``results`` with one multi-row INSERT and a single commit."""
+        if not results:
+            return 0
+        rows = [with_defaults(self._row_from_result(result)) for result in results]
+        await self.session.execute(insert(AnalysisLog), rows)
+        await self._derive(rows)
+        await self.session.commit()
+        return len(results)
+
+    async def _derive(self, rows: list[dict]) -> None:
+        """Update the derived tables in the same transaction as the logs."""
+        if self.rollups is not None:
+            await self.rollups.apply(rows)
+        if self.term_index is not None:
+            await self.term_index.index(rows)
+
+    @staticmethod
+    def _row_from_result(result: AnalyzerResult) -> dict:
+        return {
+            "request_id": result.request_id,
+            "text_hash": result.text_hash,
+            "text": result.text,
+            "label": result.sentiment.label.value,
+            "empathy_score": result.empathy.score,
+            "crisis_probability": result.crisis.probability,
+            "evidence": [chunk.model_dump() for chunk in result.evidence],
+            "model_version": result.model_version,
+            "rule_version": result.rule_version,
+        }
+
     async def get_by_request_id(self, request_id: str) -> AnalysisLog | None:
         result = await self.session.execute(
             select(AnalysisLog).where(AnalysisLog.request_id == request_id)
@@ -3,14 +3,28 @@ from __future__ import annotations
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.db.write_behind import WriteBehindQueue, with_defaults
 from src.models.chat_message import ChatMessage
 
 
 class ChatMessageRepository:
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, writer: WriteBehindQueue | None = None) -> None:
         self.session = session
+        self.writer = writer
 
     async def add_message(self, message: ChatMessage) -> ChatMessage:
+        if self.writer is not None:
+            row = with_defaults(
+                {
+                    column.key: getattr(message, column.key)
+                    for column in ChatMessage.__table__.columns
+                    if getattr(message, column.key) is not None
+                }
+            )
+            for key in ("id", "created_at", "updated_at"):
+                setattr(message, key, row[key])
+            await self.writer.put(ChatMessage, row)
+            return message
         self.session.add(message)
         await self.session.flush()
         await self.session.commit()
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.nlp.terms import extract_terms
+from src.data.term_index_repo import TermIndexRepository
+from src.models.analysis_log import AnalysisLog
+
+HIGH_RISK_THRESHOLD = 0.7
+
+_PG_UNITS = {"minute": "minute", "hour": "hour", "day": "day"}
+_SQLITE_FORMATS = {
+    "minute": "%Y-%m-%d %H:%M:00",
+    "hour": "%Y-%m-%d %H:00:00",
+    "day": "%Y-%m-%d 00:00:00",
+}
+
+
+@dataclass(frozen=True)
+class CrisisAggregate:
+    count: int
+    max_probability: float
+    avg_probability: float
+    high_risk_count: int
+
+
+class EventAggregateRepository:
+    """Window aggregates over ``analysis_logs`` computed in the database.
+
+    Only grouped counts, a single aggregate row and the top quotes leave the
+    database, instead of every log in the window. With a ``term_index`` the
+    keyword is resolved through ``analysis_log_terms`` instead of an ``ilike``
+    scan over every log; Latin-script keywords then match whole words only
+    (``hate`` no longer finds ``hated``), while CJK keywords of any length
+    still match as substrings.
+    """
+
+    def __init__(self, session: AsyncSession, term_index: TermIndexRepository | None = None) -> None:
+        self.session = session
+        self.term_index = term_index
+
+    def _window(self, stmt, keyword: str, window_start: datetime, window_end: datetime | None):
+        stmt = stmt.where(AnalysisLog.created_at >= window_start)
+        if window_end is not None:
+            stmt = stmt.where(AnalysisLog.created_at < window_end)
+        if not keyword:
+            return stmt
+        terms = extract_terms(keyword) if self.term_index is not None else []
+        if not terms:
+            return stmt.where(AnalysisLog.text.ilike(f"%{keyword}%"))
+        stmt = stmt.where(AnalysisLog.id.in_(self.term_index.matching_ids(terms, window_start, window_end)))
+        if len(terms) > 1:
+            # The index ignores term order; recheck the phrase on the few candidates.
+            stmt = stmt.where(AnalysisLog.text.ilike(f"%{keyword}%"))
+        return stmt
+
+    def _bucket(self, resolution: str):
+        if self.session.bind.dialect.name == "postgresql":
+            return func.date_trunc(_PG_UNITS[resolution], AnalysisLog.created_at)
+        return func.strftime(_SQLITE_FORMATS[resolution], AnalysisLog.created_at)
+
+    async def crisis_summary(
+        self, keyword: str, window_start: datetime, *, window_end: datetime | None = None
+    ) -> CrisisAggregate:
+        stmt = self._window(
+            select(
+                func.count(),
+                func.max(AnalysisLog.crisis_probability),
+                func.avg(AnalysisLog.crisis_probability),
+                func.sum(case((AnalysisLog.crisis_probability >= HIGH_RISK_THRESHOLD, 1), else_=0)),
+            ),
+            keyword,
+            window_start,
+            window_end,
+        )
+        count, max_prob, avg_prob, high_risk = (await self.session.execute(stmt)).one()
+        return CrisisAggregate(
+            count=count,
+            max_probability=float(max_prob or 0.0),
+            avg_probability=float(avg_prob or 0.0),
+            high_risk_count=int(high_risk or 0),
+        )
+
+    async def label_counts(
+        self,
+        keyword: str,
+        window_start: datetime,
+        resolution: str = "hour",
+        *,
+        window_end: datetime | None = None,
+    ) -> dict[datetime, dict[str, int]]:
+        bucket = self._bucket(resolution).label("bucket")
+        stmt = self._window(
+            select(bucket, AnalysisLog.label, func.count()).group_by(bucket, AnalysisLog.label),
+            keyword,
+            window_start,
+            window_end,
+        )
+        buckets: dict[datetime, dict[str, int]] = {}
+        for bucket_at, label, count in await self.session.execute(stmt):
+            if isinstance(bucket_at, str):
+                bucket_at = datetime.fromisoformat(bucket_at)
+            buckets.setdefault(bucket_at, {})[label] = count
+        return buckets
+
+    async def top_quotes(
+        self,
+        keyword: str,
+        window_start: datetime,
+        limit: int = 5,
+        *,
+        window_end: datetime | None = None,
+        whole_term: bool = False,
+    ):
+        """Highest-risk logs mentioning ``keyword``.
+
+        ``whole_term`` restricts the quotes to logs that have ``keyword`` among
+        their ``extract_terms``, the way the rollups count them, also when the
+        term index is off and the lookup is a substring ``ilike``.
+        """
+        stmt = self._window(
+            select(
+                AnalysisLog.text,
+                AnalysisLog.label,
+                AnalysisLog.crisis_probability,
+                AnalysisLog.created_at,
+            ),
+            keyword,
+            window_start,
+            window_end,
+        ).order_by(AnalysisLog.crisis_probability.desc(), AnalysisLog.created_at)
+        if not whole_term or self.term_index is not None:
+            return (await self.session.execute(stmt.limit(limit))).all()
+        rows = []
+        result = await self.session.stream(stmt)
+        async for row in result:
+            if keyword in extract_terms(row.text):
+                rows.append(row)
+                if len(rows) == limit:
+                    break
+        await result.close()
+        return rows
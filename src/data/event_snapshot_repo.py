@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import uuid
 from datetime import datetime
 
 from sqlalchemy import select
@@ -12,11 +13,11 @@ class EventSnapshotRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
-    async def get_latest(self, keyword: str) -> EventSnapshot | None:
-        stmt = (
-            select(EventSnapshot)
-            .where(EventSnapshot.keyword == keyword)
-            .order_by(EventSnapshot.window_end.desc())
+    async def get(self, keyword: str, hours: int, resolution: str) -> EventSnapshot | None:
+        stmt = select(EventSnapshot).where(
+            EventSnapshot.keyword == keyword,
+            EventSnapshot.hours == hours,
+            EventSnapshot.resolution == resolution,
         )
         result = await self.session.execute(stmt)
         return result.scalars().first()
@@ -24,23 +25,42 @@ class EventSnapshotRepository:
     async def save_snapshot(
         self,
         keyword: str,
+        hours: int,
+        resolution: str,
         window_start: datetime,
         window_end: datetime,
         emotion_series: list[dict],
         crisis_summary: dict,
         representative_quotes: list[dict],
         network_graph: dict,
-    ) -> EventSnapshot:
-        snapshot = EventSnapshot(
+        state: dict | None = None,
+    ) -> None:
+        """Insert or replace the snapshot for ``keyword`` at this window length and resolution."""
+        if self.session.bind.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        now = datetime.utcnow()
+        values = {
+            "window_start": window_start,
+            "window_end": window_end,
+            "emotion_series": emotion_series,
+            "crisis_summary": crisis_summary,
+            "representative_quotes": representative_quotes,
+            "network_graph": network_graph,
+            "state": state,
+            "updated_at": now,
+        }
+        stmt = insert(EventSnapshot).values(
+            id=uuid.uuid4(),
             keyword=keyword,
-            window_start=window_start,
-            window_end=window_end,
-            emotion_series=emotion_series,
-            crisis_summary=crisis_summary,
-            representative_quotes=representative_quotes,
-            network_graph=network_graph,
+            hours=hours,
+            resolution=resolution,
+            created_at=now,
+            **values,
         )
-        self.session.add(snapshot)
-        await self.session.flush()
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["keyword", "hours", "resolution"], set_=values
+        )
+        await self.session.execute(stmt)
         await self.session.commit()
-        return snapshot
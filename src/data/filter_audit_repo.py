@@ -1,15 +1,20 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+import asyncio
+
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.nlp.types import AnalyzerResult
+from src.db.audit_spool import AuditSpool
+from src.db.write_behind import with_defaults
 from src.models.filter_audit import FilterAudit
 
 
 class FilterAuditRepository:
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, spool: AuditSpool | None = None) -> None:
         self.session = session
+        self.spool = spool
 
     async def create(
         self,
@@ -20,30 +25,80 @@ class FilterAuditRepository:
         allow: bool,
         matched_rules: list[dict],
         analyzer_result: AnalyzerResult,
+        stages: list[str] | None = None,
+        stage_ms: dict[str, float] | None = None,
     ) -> FilterAudit:
-        audit = FilterAudit(
+        row = self.build_row(
             request_id=request_id,
             text_hash=text_hash,
             decision=decision,
             reason=reason,
             allow=allow,
             matched_rules=matched_rules,
-            analyzer_snapshot={
+            analyzer_result=analyzer_result,
+            stages=stages,
+            stage_ms=stage_ms,
+        )
+        if self.spool is not None:
+            row = with_defaults(row)
+            await self.spool.append(row)
+            return FilterAudit(**row)
+        audit = FilterAudit(**row)
+        self.session.add(audit)
+        await self.session.flush()
+        await self.session.commit()
+        return audit
+
+    async def bulk_create(self, rows: list[dict]) -> int:
+        """Insert rows from :meth:`build_row` with one multi-row INSERT and a single commit."""
+        if not rows:
+            return 0
+        if self.spool is not None:
+            await self.spool.append_many([with_defaults(row) for row in rows])
+            return len(rows)
+        await self.session.execute(insert(FilterAudit), rows)
+        await self.session.commit()
+        return len(rows)
+
+    @staticmethod
+    def build_row(
+        request_id: str,
+        text_hash: str,
+        decision: str,
+        reason: str,
+        allow: bool,
+        matched_rules: list[dict],
+        analyzer_result: AnalyzerResult,
+        stages: list[str] | None = None,
+        stage_ms: dict[str, float] | None = None,
+    ) -> dict:
+        return {
+            "request_id": request_id,
+            "text_hash": text_hash,
+            "decision": decision,
+            "reason": reason,
+            "allow": allow,
+            "matched_rules": matched_rules,
+            "analyzer_snapshot": {
                 "label": analyzer_result.sentiment.label.value,
                 "confidence": analyzer_result.sentiment.confidence,
                 "empathy_score": analyzer_result.empathy.score,
                 "crisis_probability": analyzer_result.crisis.probability,
                 "model_version": analyzer_result.model_version,
                 "rule_version": analyzer_result.rule_version,
+                "stages": stages or [],
+                "stage_ms": stage_ms or {},
             },
-        )
-        self.session.add(audit)
-        await self.session.flush()
-        await self.session.commit()
-        return audit
+        }
 
     async def get_by_request_id(self, request_id: str) -> FilterAudit | None:
         result = await self.session.execute(
             select(FilterAudit).where(FilterAudit.request_id == request_id)
         )
-        return result.scalar_one_or_none()
+        audit = result.scalar_one_or_none()
+        if audit is None and self.spool is not None:
+            # Spooled but not loaded yet: answer from the log instead of reporting a miss.
+            row = await asyncio.to_thread(self.spool.find, request_id)
+            if row is not None:
+                audit = FilterAudit(**row)
+        return audit
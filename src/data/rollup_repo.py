@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Literal
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.settings import get_settings
+from src.core.nlp.terms import extract_terms
+from src.data.event_aggregate_repo import HIGH_RISK_THRESHOLD
+from src.models.analysis_rollup import AnalysisRollup
+
+Resolution = Literal["minute", "hour", "day"]
+
+# Resolutions stored in the table; "day" is downsampled from "hour" on read.
+STORED_RESOLUTIONS = ("minute", "hour")
+# Counts logs with more than ``max_terms`` terms; never produced by ``extract_terms``.
+TRUNCATED_TERM = "#truncated"
+
+
+def truncate(timestamp: datetime, resolution: Resolution) -> datetime:
+    timestamp = timestamp.replace(second=0, microsecond=0)
+    if resolution in ("hour", "day"):
+        timestamp = timestamp.replace(minute=0)
+    if resolution == "day":
+        timestamp = timestamp.replace(hour=0)
+    return timestamp
+
+
+@dataclass
+class RollupCell:
+    count: int = 0
+    crisis_sum: float = 0.0
+    crisis_max: float = 0.0
+    high_risk_count: int = 0
+
+    def merge(self, count: int, crisis_sum: float, crisis_max: float, high_risk_count: int) -> None:
+        self.count += count
+        self.crisis_sum += crisis_sum
+        self.crisis_max = max(self.crisis_max, crisis_max)
+        self.high_risk_count += high_risk_count
+
+
+class AnalysisRollupRepository:
+    """Incrementally maintained aggregates of ``analysis_logs`` per term and time bucket."""
+
+    def __init__(self, session: AsyncSession, max_terms: int = 64) -> None:
+        self.session = session
+        self.max_terms = max_terms
+
+    def rollup_rows(self, logs: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Collapse log rows into one delta row per (resolution, term, bucket, label)."""
+        cells: dict[tuple[str, str, datetime, str], RollupCell] = {}
+        now = datetime.utcnow()
+        for log in logs:
+            created_at = log.get("created_at") or now
+            probability = float(log["crisis_probability"])
+            high_risk = int(probability >= HIGH_RISK_THRESHOLD)
+            terms = extract_terms(log["text"], limit=self.max_terms + 1)
+            if len(terms) > self.max_terms:
+                # Terms past the cap go uncounted; mark the bucket so reads fall back.
+                terms[self.max_terms :] = [TRUNCATED_TERM]
+            terms.insert(0, "")
+            for resolution in STORED_RESOLUTIONS:
+                bucket = truncate(created_at, resolution)
+                for term in terms:
+                    key = (resolution, term, bucket, log["label"])
+                    cells.setdefault(key, RollupCell()).merge(1, probability, probability, high_risk)
+        return [
+            {
+                "id": uuid.uuid4(),
+                "created_at": now,
+                "updated_at": now,
+                "resolution": resolution,
+                "term": term,
+                "bucket": bucket,
+                "label": label,
+                "count": cell.count,
+                "crisis_sum": cell.crisis_sum,
+                "crisis_max": cell.crisis_max,
+                "high_risk_count": cell.high_risk_count,
+            }
+            for (resolution, term, bucket, label), cell in cells.items()
+        ]
+
+    async def apply(self, logs: Iterable[dict[str, Any]]) -> int:
+        """Add ``logs`` to the rollups with one upsert; the caller commits."""
+        rows = self.rollup_rows(logs)
+        if not rows:
+            return 0
+        if self.session.bind.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+
+            greatest = func.greatest
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+            greatest = func.max
+        stmt = insert(AnalysisRollup)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["resolution", "term", "bucket", "label"],
+            set_={
+                "count": AnalysisRollup.count + stmt.excluded["count"],
+                "crisis_sum": AnalysisRollup.crisis_sum + stmt.excluded.crisis_sum,
+                "crisis_max": greatest(AnalysisRollup.crisis_max, stmt.excluded.crisis_max),
+                "high_risk_count": AnalysisRollup.high_risk_count + stmt.excluded.high_risk_count,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        await self.session.execute(stmt, rows)
+        return len(rows)
+
+    async def read(
+        self,
+        term: str,
+        window_start: datetime,
+        resolution: Resolution = "hour",
+    ) -> dict[datetime, dict[str, RollupCell]]:
+        """Return ``{bucket: {label: cell}}`` for ``term`` from ``window_start`` on.
+
+        Hour and day views use hour rows for whole hours and minute rows for the
+        partial first hour, so the window edge is exact to the minute.
+        """
+        first_minute = truncate(window_start, "minute")
+        if resolution == "minute":
+            condition = and_(
+                AnalysisRollup.resolution == "minute", AnalysisRollup.bucket >= first_minute
+            )
+        else:
+            first_hour = truncate(window_start, "hour")
+            if first_hour < first_minute:
+                first_hour += timedelta(hours=1)
+            condition = or_(
+                and_(
+                    AnalysisRollup.resolution == "minute",
+                    AnalysisRollup.bucket >= first_minute,
+                    AnalysisRollup.bucket < first_hour,
+                ),
+                and_(AnalysisRollup.resolution == "hour", AnalysisRollup.bucket >= first_hour),
+            )
+        stmt = select(
+            AnalysisRollup.bucket,
+            AnalysisRollup.label,
+            AnalysisRollup.count,
+            AnalysisRollup.crisis_sum,
+            AnalysisRollup.crisis_max,
+            AnalysisRollup.high_risk_count,
+        ).where(AnalysisRollup.term == term, condition)
+        buckets: dict[datetime, dict[str, RollupCell]] = {}
+        for bucket, label, count, crisis_sum, crisis_max, high_risk in await self.session.execute(stmt):
+            cells = buckets.setdefault(truncate(bucket, resolution), {})
+            cells.setdefault(label, RollupCell()).merge(count, crisis_sum, crisis_max, high_risk)
+        return buckets
+
+    async def truncated_since(self, window_start: datetime) -> bool:
+        """Whether a log from ``window_start`` on had terms past ``max_terms``.
+
+        Those terms are missing from the rollups, so the window has to be
+        aggregated from the raw logs instead.
+        """
+        stmt = (
+            select(AnalysisRollup.id)
+            .where(
+                AnalysisRollup.term == TRUNCATED_TERM,
+                AnalysisRollup.resolution == "minute",
+                AnalysisRollup.bucket >= truncate(window_start, "minute"),
+            )
+            .limit(1)
+        )
+        return await self.session.scalar(stmt) is not None
+
+
+def rollups_for(session: AsyncSession) -> AnalysisRollupRepository | None:
+    """A rollup repository on ``session`` when ``ROLLUPS__ENABLED`` is set, else ``None``."""
+    settings = get_settings().rollups
+    if not settings.enabled:
+        return None
+    return AnalysisRollupRepository(session, max_terms=settings.max_terms_per_log)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Iterable
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.settings import get_settings
+from src.core.nlp.terms import extract_terms
+from src.models.analysis_log_term import AnalysisLogTerm
+
+
+class TermIndexRepository:
+    """Maintains and queries the ``analysis_log_terms`` inverted index.
+
+    CJK text is indexed by unigrams as well as bigrams, so a keyword of any
+    length resolves; Latin-script keywords match whole words only.
+    """
+
+    def __init__(self, session: AsyncSession, max_terms: int = 64) -> None:
+        self.session = session
+        self.max_terms = max_terms
+
+    def term_rows(self, logs: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        now = datetime.utcnow()
+        return [
+            {"term": term, "created_at": log.get("created_at") or now, "log_id": log["id"]}
+            for log in logs
+            for term in extract_terms(log["text"], limit=self.max_terms, cjk_unigrams=True)
+        ]
+
+    async def index(self, logs: Iterable[dict[str, Any]]) -> int:
+        """Add the terms of ``logs`` (rows with ``id``, ``text``, ``created_at``); the caller commits."""
+        rows = self.term_rows(logs)
+        if not rows:
+            return 0
+        if self.session.bind.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        await self.session.execute(insert(AnalysisLogTerm).on_conflict_do_nothing(), rows)
+        return len(rows)
+
+    @staticmethod
+    def matching_ids(
+        terms: list[str], window_start: datetime, window_end: datetime | None = None
+    ) -> Select:
+        """Ids of logs in ``[window_start, window_end)`` that contain every one of ``terms``."""
+        stmt = select(AnalysisLogTerm.log_id).where(
+            AnalysisLogTerm.term.in_(terms), AnalysisLogTerm.created_at >= window_start
+        )
+        if window_end is not None:
+            stmt = stmt.where(AnalysisLogTerm.created_at < window_end)
+        if len(terms) > 1:
+            stmt = stmt.group_by(AnalysisLogTerm.log_id).having(
+                func.count(AnalysisLogTerm.term) == len(terms)
+            )
+        return stmt
+
+
+def term_index_for(session: AsyncSession) -> TermIndexRepository | None:
+    """A term index repository on ``session`` when ``TERM_INDEX__ENABLED`` is set, else ``None``."""
+    settings = get_settings().term_index
+    if not settings.enabled:
+        return None
+    return TermIndexRepository(session, max_terms=settings.max_terms_per_log)
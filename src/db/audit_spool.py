@@ -0,0 +1,406 @@
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import itertools
+import json
+import os
+import struct
+import time
+import uuid
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.settings import get_settings
+from src.core.logging.config import get_logger
+from src.db.session import AsyncSessionLocal
+from src.models.filter_audit import FilterAudit
+
+# Each record is framed as: payload length (4 bytes) | crc32 of payload (4 bytes) | payload.
+_HEADER = struct.Struct(">II")
+_SEGMENT_GLOB = "segment-*.log"
+_CHECKPOINT = "checkpoint.json"
+_SLOT_GLOB = "worker-*"
+_LOCK = "spool.lock"
+
+SPOOL_APPENDS = Counter("dep_audit_spool_appends_total", "Audit records appended to the spool")
+SPOOL_FSYNC_SECONDS = Histogram("dep_audit_spool_fsync_seconds", "Duration of one group fsync")
+SPOOL_GROUP_SIZE = Histogram(
+    "dep_audit_spool_group_size",
+    "Records made durable by one fsync",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+SPOOL_LOADED = Counter("dep_audit_spool_loaded_total", "Audit records ingested into filter_audits")
+SPOOL_CORRUPT = Counter(
+    "dep_audit_spool_corrupt_total", "Segments whose tail failed the length/CRC check"
+)
+SPOOL_BACKLOG = Gauge("dep_audit_spool_backlog_bytes", "Spooled bytes not yet loaded")
+
+logger = get_logger(__name__)
+
+
+def _segment_name(seq: int) -> str:
+    return f"segment-{seq:010d}.log"
+
+
+def _segment_seq(path: Path) -> int:
+    return int(path.stem.split("-", 1)[1])
+
+
+def list_segments(directory: Path) -> list[Path]:
+    return sorted(directory.glob(_SEGMENT_GLOB), key=_segment_seq)
+
+
+def encode_record(row: dict[str, Any]) -> bytes:
+    payload = json.dumps(row, default=str, ensure_ascii=False).encode("utf-8")
+    return _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def decode_row(payload: bytes) -> dict[str, Any]:
+    row = json.loads(payload)
+    row["id"] = uuid.UUID(row["id"])
+    for key in ("created_at", "updated_at"):
+        row[key] = datetime.fromisoformat(row[key])
+    return row
+
+
+def read_records(path: Path, offset: int = 0) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Yield ``(end offset, row)`` for each intact record after ``offset``.
+
+    Stops at the first short or corrupt record: for the active segment that is
+    simply the end of what has been written, for a sealed one a torn tail.
+    """
+    with path.open("rb") as fh:
+        fh.seek(offset)
+        while True:
+            header = fh.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return
+            length, crc = _HEADER.unpack(header)
+            payload = fh.read(length)
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                raise _TornRecord(fh.tell())
+            offset += _HEADER.size + length
+            yield offset, decode_row(payload)
+
+
+class _TornRecord(Exception):
+    pass
+
+
+def claim_slot(base: Path) -> tuple[Path, int]:
+    """Lock the first free ``worker-N`` directory under ``base``; return it and the lock fd.
+
+    Each slot is written by exactly one process, so segment numbering and the
+    loader's clean-up never race with another worker. The lock dies with its
+    process, and a restarted worker reclaims the slot with any unloaded
+    segments still in it.
+    """
+    base.mkdir(parents=True, exist_ok=True)
+    for index in itertools.count():
+        directory = base / f"worker-{index}"
+        directory.mkdir(exist_ok=True)
+        fd = os.open(directory / _LOCK, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            continue
+        return directory, fd
+
+
+class AuditSpool:
+    """Segmented, checksummed append-only log of filter audit rows.
+
+    ``append`` returns once the record is on disk. Concurrent appends share one
+    fsync (group commit); ``fsync_interval_ms`` lets a sync wait briefly so more
+    records join the group. A new segment starts when the active one exceeds
+    ``segment_max_bytes`` and on every restart, so a torn tail from a crash is
+    always confined to a sealed segment.
+
+    ``base_directory`` may be shared by several worker processes: each spool
+    claims its own ``worker-N`` subdirectory (see :func:`claim_slot`), which
+    becomes ``directory``. Never point a spool or loader at another process's
+    slot.
+    """
+
+    def __init__(
+        self,
+        base_directory: str | Path,
+        segment_max_bytes: int = 64 * 1024 * 1024,
+        fsync_interval_ms: float = 2.0,
+    ) -> None:
+        self.base_directory = Path(base_directory).resolve()
+        self.directory, self._lock_fd = claim_slot(self.base_directory)
+        self.segment_max_bytes = segment_max_bytes
+        self.fsync_interval = fsync_interval_ms / 1000
+        existing = list_segments(self.directory)
+        self._seq = _segment_seq(existing[-1]) + 1 if existing else 1
+        self._fd = self._open_segment()
+        self._size = 0
+        self._written = 0
+        self._synced = 0
+        self._syncing = False
+        self._cond: asyncio.Condition | None = None
+
+    @property
+    def active_segment(self) -> Path:
+        return self.directory / _segment_name(self._seq)
+
+    def _open_segment(self) -> int:
+        return os.open(self.active_segment, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    async def append(self, row: dict[str, Any]) -> None:
+        await self.append_many([row])
+
+    async def append_many(self, rows: list[dict[str, Any]]) -> None:
+        if not rows:
+            return
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        data = b"".join(encode_record(row) for row in rows)
+        os.write(self._fd, data)
+        self._size += len(data)
+        self._written += len(rows)
+        SPOOL_APPENDS.inc(len(rows))
+        target = self._written
+        async with self._cond:
+            while self._synced < target:
+                if self._syncing:
+                    await self._cond.wait()
+                    continue
+                self._syncing = True
+                try:
+                    await self._group_sync()
+                finally:
+                    self._syncing = False
+                    self._cond.notify_all()
+
+    async def _group_sync(self) -> None:
+        assert self._cond is not None
+        if self.fsync_interval:
+            # Let other appends land in the page cache before paying for the fsync.
+            self._cond.release()
+            try:
+                await asyncio.sleep(self.fsync_interval)
+            finally:
+                await self._cond.acquire()
+        target, fd = self._written, self._fd
+        start = time.perf_counter()
+        await asyncio.get_running_loop().run_in_executor(None, os.fsync, fd)
+        SPOOL_FSYNC_SECONDS.observe(time.perf_counter() - start)
+        SPOOL_GROUP_SIZE.observe(target - self._synced)
+        self._synced = target
+        # Only seal a segment once everything written to it is durable.
+        if self._size >= self.segment_max_bytes and self._synced == self._written:
+            self._rotate()
+
+    def _rotate(self) -> None:
+        os.close(self._fd)
+        self._seq += 1
+        self._fd = self._open_segment()
+        self._size = 0
+
+    def close(self) -> None:
+        os.fsync(self._fd)
+        os.close(self._fd)
+        os.close(self._lock_fd)
+
+    def find(self, request_id: str) -> dict[str, Any] | None:
+        """Query fallback: look up an audit that has not been loaded into the database yet.
+
+        Reads every worker's slot, since the request may have been served by another process.
+        """
+        for directory in sorted(self.base_directory.glob(_SLOT_GLOB)):
+            for row in SpoolReader(directory).pending_rows():
+                if row["request_id"] == request_id:
+                    return row
+        return None
+
+
+class SpoolReader:
+    """Walks spooled records after the loader checkpoint."""
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory).resolve()
+
+    @property
+    def checkpoint_path(self) -> Path:
+        return self.directory / _CHECKPOINT
+
+    def checkpoint(self) -> tuple[int, int]:
+        """Return ``(segment seq, offset)`` of the first record not yet loaded."""
+        if not self.checkpoint_path.exists():
+            return 0, 0
+        data = json.loads(self.checkpoint_path.read_text(encoding="utf-8"))
+        return int(data["segment"]), int(data["offset"])
+
+    def save_checkpoint(self, seq: int, offset: int) -> None:
+        tmp = self.checkpoint_path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            json.dump({"segment": seq, "offset": offset}, fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.checkpoint_path)
+
+    def pending(self) -> Iterator[tuple[Path, int]]:
+        """Yield ``(segment, start offset)`` for every segment with unloaded data."""
+        seq, offset = self.checkpoint()
+        for segment in list_segments(self.directory):
+            segment_seq = _segment_seq(segment)
+            if segment_seq < seq:
+                continue
+            yield segment, offset if segment_seq == seq else 0
+
+    def pending_rows(self) -> Iterator[dict[str, Any]]:
+        for segment, offset in self.pending():
+            try:
+                for _, row in read_records(segment, offset):
+                    yield row
+            except _TornRecord:
+                continue
+
+
+class AuditSpoolLoader:
+    """Bulk-ingests spooled audits into ``filter_audits`` and resumes from a checkpoint.
+
+    Inserts ignore rows whose id already exists, so a crash between a commit
+    and the checkpoint write only replays rows harmlessly. Sealed segments are
+    deleted once fully loaded. ``directory`` must be the slot of the spool
+    writing to it, as only that process knows which segment is still active.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        session_factory: Callable[[], AsyncSession],
+        batch_size: int = 1000,
+        active_segment: Callable[[], Path] | None = None,
+    ) -> None:
+        self.reader = SpoolReader(directory)
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.active_segment = active_segment
+
+    def _is_active(self, segment: Path, segments: list[Path]) -> bool:
+        if self.active_segment is not None:
+            return segment == self.active_segment()
+        return segment == segments[-1]
+
+    async def load_once(self) -> int:
+        loaded = 0
+        segments = list_segments(self.reader.directory)
+        for segment, offset in list(self.reader.pending()):
+            seq = _segment_seq(segment)
+            # Decide before reading: a segment sealed by now receives no more appends.
+            active = self._is_active(segment, segments)
+            batch: list[dict[str, Any]] = []
+            end = offset
+            try:
+                for end_offset, row in read_records(segment, offset):
+                    batch.append(row)
+                    end = end_offset
+                    if len(batch) >= self.batch_size:
+                        loaded += await self._ingest(batch, seq, end)
+                        batch = []
+                torn = False
+            except _TornRecord:
+                torn = True
+            if batch:
+                loaded += await self._ingest(batch, seq, end)
+            if torn and not active:
+                SPOOL_CORRUPT.inc()
+                logger.warning("audit_spool.torn_segment", segment=segment.name, offset=end)
+            if not active:
+                self.reader.save_checkpoint(seq + 1, 0)
+                segment.unlink(missing_ok=True)
+        SPOOL_BACKLOG.set(self.backlog_bytes())
+        return loaded
+
+    def backlog_bytes(self) -> int:
+        total = 0
+        for segment, offset in self.reader.pending():
+            try:
+                total += max(segment.stat().st_size - offset, 0)
+            except FileNotFoundError:
+                continue
+        return total
+
+    async def _ingest(self, rows: list[dict[str, Any]], seq: int, end: int) -> int:
+        async with self.session_factory() as session:
+            stmt = _insert_ignore(session)(FilterAudit).on_conflict_do_nothing(index_elements=["id"])
+            await session.execute(stmt, rows)
+            await session.commit()
+        self.reader.save_checkpoint(seq, end)
+        SPOOL_LOADED.inc(len(rows))
+        return len(rows)
+
+    async def run(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                await self.load_once()
+            except Exception as exc:
+                logger.error("audit_spool.load_failed", error=str(exc))
+            await asyncio.sleep(interval_seconds)
+
+
+def _insert_ignore(session: AsyncSession):
+    if session.bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+_spool: AuditSpool | None = None
+_loader_task: asyncio.Task | None = None
+
+
+def get_audit_spool() -> AuditSpool | None:
+    """The process-wide spool when ``AUDIT_SPOOL__ENABLED`` is set, else ``None``."""
+    global _spool
+    settings = get_settings().audit_spool
+    if not settings.enabled:
+        return None
+    if _spool is None:
+        _spool = AuditSpool(
+            settings.directory,
+            segment_max_bytes=settings.segment_max_bytes,
+            fsync_interval_ms=settings.fsync_interval_ms,
+        )
+    return _spool
+
+
+def start_audit_loader() -> asyncio.Task | None:
+    global _loader_task
+    spool = get_audit_spool()
+    if spool is None:
+        return None
+    settings = get_settings().audit_spool
+    loader = AuditSpoolLoader(
+        spool.directory,
+        AsyncSessionLocal,
+        batch_size=settings.load_batch_size,
+        active_segment=lambda: spool.active_segment,
+    )
+    _loader_task = asyncio.create_task(loader.run(settings.load_interval_seconds))
+    return _loader_task
+
+
+async def stop_audit_loader() -> None:
+    global _loader_task, _spool
+    if _loader_task is not None:
+        _loader_task.cancel()
+        try:
+            await _loader_task
+        except asyncio.CancelledError:
+            pass
+        _loader_task = None
+    if _spool is not None:
+        _spool.close()
+        _spool = None
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.settings import get_settings
+from src.core.logging.config import get_logger
+from src.data.rollup_repo import rollups_for
+from src.data.term_index_repo import term_index_for
+from src.db.session import AsyncSessionLocal
+from src.models.analysis_log import AnalysisLog
+
+FlushHook = Callable[[AsyncSession, list[dict[str, Any]]], Awaitable[Any]]
+
+QUEUE_DEPTH = Gauge("dep_write_behind_queue_depth", "Rows waiting to be flushed", labelnames=("queue",))
+FLUSH_SECONDS = Histogram(
+    "dep_write_behind_flush_seconds", "Duration of one multi-row flush", labelnames=("queue",)
+)
+FLUSH_ROWS = Histogram(
+    "dep_write_behind_flush_rows",
+    "Rows written per flush",
+    labelnames=("queue",),
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500),
+)
+BACKPRESSURE = Counter(
+    "dep_write_behind_backpressure_total",
+    "Enqueues that had to wait because the queue was full",
+    labelnames=("queue",),
+)
+DROPPED_ROWS = Counter(
+    "dep_write_behind_dropped_rows_total",
+    "Rows dropped after a flush failed twice",
+    labelnames=("queue",),
+)
+
+
+def with_defaults(row: dict[str, Any]) -> dict[str, Any]:
+    """Fill the mixin defaults the database flush would have set, so rows are usable right away."""
+    now = datetime.utcnow()
+    row.setdefault("id", uuid.uuid4())
+    row.setdefault("created_at", now)
+    row.setdefault("updated_at", now)
+    return row
+
+
+class WriteBehindQueue:
+    """Bounded queue of rows flushed in the background with multi-row INSERTs.
+
+    A flush is triggered when ``batch_size`` rows are waiting or
+    ``flush_interval_ms`` has passed since the first pending row. ``put`` waits
+    while the queue is full (backpressure) and ``stop`` drains everything that
+    was accepted before returning.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        session_factory: Callable[[], AsyncSession],
+        max_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval_ms: int = 200,
+    ) -> None:
+        self.name = name
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_size = max_size
+        self._queue: asyncio.Queue[tuple[type, dict[str, Any]]] | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        self._hooks: dict[type, list[FlushHook]] = {}
+        self.logger = get_logger(__name__)
+
+    def __len__(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def on_flush(self, model: type, hook: FlushHook) -> None:
+        """Run ``hook(session, rows)`` in the same transaction as each flush of ``model`` rows."""
+        self._hooks.setdefault(model, []).append(hook)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name=f"write-behind-{self.name}")
+
+    async def put(self, model: type, row: dict[str, Any]) -> None:
+        if not self.running:
+            self.start()
+        assert self._queue is not None
+        if self._queue.full():
+            BACKPRESSURE.labels(self.name).inc()
+        await self._queue.put((model, row))
+        QUEUE_DEPTH.labels(self.name).set(self._queue.qsize())
+
+    async def stop(self) -> None:
+        """Flush everything queued so far, then stop the background task."""
+        if not self.running:
+            return
+        self._stopping = True
+        assert self._queue is not None and self._task is not None
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = 0 if self._stopping else deadline - time.monotonic()
+                if timeout <= 0:
+                    if queue.empty():
+                        break
+                    batch.append(queue.get_nowait())
+                    continue
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+                QUEUE_DEPTH.labels(self.name).set(queue.qsize())
+
+    async def _flush(self, batch: list[tuple[type, dict[str, Any]]]) -> None:
+        grouped: dict[type, list[dict[str, Any]]] = {}
+        for model, row in batch:
+            grouped.setdefault(model, []).append(row)
+        for attempt in (1, 2):
+            start = time.perf_counter()
+            try:
+                async with self.session_factory() as session:
+                    for model, rows in grouped.items():
+                        await session.execute(insert(model), rows)
+                        for hook in self._hooks.get(model, ()):
+                            await hook(session, rows)
+                    await session.commit()
+            except Exception as exc:
+                self.logger.error(
+                    "write_behind.flush_failed",
+                    queue=self.name,
+                    rows=len(batch),
+                    attempt=attempt,
+                    error=str(exc),
+                )
+                continue
+            FLUSH_SECONDS.labels(self.name).observe(time.perf_counter() - start)
+            FLUSH_ROWS.labels(self.name).observe(len(batch))
+            return
+        DROPPED_ROWS.labels(self.name).inc(len(batch))
+
+
+_write_behind: WriteBehindQueue | None = None
+
+
+def get_write_behind() -> WriteBehindQueue | None:
+    """The shared queue when ``WRITE_BEHIND__ENABLED`` is set, else ``None``."""
+    global _write_behind
+    settings = get_settings().write_behind
+    if not settings.enabled:
+        return None
+    if _write_behind is None:
+        _write_behind = WriteBehindQueue(
+            "db",
+            AsyncSessionLocal,
+            max_size=settings.max_queue_size,
+            batch_size=settings.batch_size,
+            flush_interval_ms=settings.flush_interval_ms,
+        )
+        if get_settings().rollups.enabled:
+            _write_behind.on_flush(
+                AnalysisLog, lambda session, rows: rollups_for(session).apply(rows)
+            )
+        if get_settings().term_index.enabled:
+            _write_behind.on_flush(
+                AnalysisLog, lambda session, rows: term_index_for(session).index(rows)
+            )
+    return _write_behind
+
+
+async def stop_write_behind() -> None:
+    global _write_behind
+    if _write_behind is not None:
+        await _write_behind.stop()
+        _write_behind = None
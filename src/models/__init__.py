@@ -1,12 +1,16 @@
 """ORM models exposed for Alembic autogeneration."""
 
 from .analysis_log import AnalysisLog
+from .analysis_log_term import AnalysisLogTerm
+from .analysis_rollup import AnalysisRollup
 from .chat_message import ChatMessage
 from .event_snapshot import EventSnapshot
 from .filter_audit import FilterAudit
 
 __all__ = [
     "AnalysisLog",
+    "AnalysisLogTerm",
+    "AnalysisRollup",
     "ChatMessage",
     "EventSnapshot",
     "FilterAudit",
@@ -1,4 +1,4 @@
-from sqlalchemy import JSON, Float, String
+from sqlalchemy import JSON, Float, Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.db.base import Base
@@ -9,6 +9,7 @@ class AnalysisLog(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     """Stores analyzer level telemetry for each processed text."""
 
     __tablename__ = "analysis_logs"
+    __table_args__ = (Index("ix_analysis_logs_created_at", "created_at"),)
 
     request_id: Mapped[str] = mapped_column(String(64), index=True)
     text_hash: Mapped[str] = mapped_column(String(128), index=True)
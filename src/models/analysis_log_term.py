@@ -0,0 +1,23 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.db.base import Base
+
+
+class AnalysisLogTerm(Base):
+    """Inverted index of `analysis_logs` text: one row per (term, log).
+
+    The composite primary key doubles as the lookup index, so a keyword with a
+    time window is a range scan on (term, created_at).
+    """
+
+    __tablename__ = "analysis_log_terms"
+
+    term: Mapped[str] = mapped_column(String(64), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    log_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("analysis_logs.id", ondelete="CASCADE"), primary_key=True
+    )
@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.db.base import Base
+from src.models.mixins import TimestampMixin, UUIDPrimaryKeyMixin
+
+
+class AnalysisRollup(UUIDPrimaryKeyMixin, TimestampMixin, Base):
+    """Per-bucket label counts and crisis aggregates of `analysis_logs`, by term.
+
+    The empty term aggregates every log; `#truncated` counts logs whose
+    terms were cut at the per-log cap. Rows are kept at minute and hour
+    resolution; coarser views are downsampled from the hour rows.
+    """
+
+    __tablename__ = "analysis_rollups"
+    __table_args__ = (
+        UniqueConstraint("resolution", "term", "bucket", "label", name="uq_analysis_rollups_key"),
+    )
+
+    resolution: Mapped[str] = mapped_column(String(8))
+    term: Mapped[str] = mapped_column(String(64))
+    bucket: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    label: Mapped[str] = mapped_column(String(32))
+    count: Mapped[int] = mapped_column(Integer, default=0)
+    crisis_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    crisis_max: Mapped[float] = mapped_column(Float, default=0.0)
+    high_risk_count: Mapped[int] = mapped_column(Integer, default=0)
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import JSON, DateTime, String
+from sqlalchemy import JSON, DateTime, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.db.base import Base
@@ -8,12 +8,25 @@ from src.models.mixins import TimestampMixin, UUIDPrimaryKeyMixin
 
 
 class EventSnapshot(UUIDPrimaryKeyMixin, TimestampMixin, Base):
+    """Latest computed event window per keyword, window length and resolution.
+
+    Upserted on every analysis, so polls of the same keyword with different
+    ``hours`` or ``resolution`` each extend their own snapshot.
+    """
+
     __tablename__ = "event_snapshots"
+    __table_args__ = (
+        Index("uq_event_snapshots_window", "keyword", "hours", "resolution", unique=True),
+    )
 
     keyword: Mapped[str] = mapped_column(String(128), index=True)
+    hours: Mapped[int] = mapped_column(Integer, default=6, server_default="6")
+    resolution: Mapped[str] = mapped_column(String(8), default="hour", server_default="hour")
     window_start: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     window_end: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     emotion_series: Mapped[list[dict]] = mapped_column(JSON)
     crisis_summary: Mapped[dict] = mapped_column(JSON)
     representative_quotes: Mapped[list[dict]] = mapped_column(JSON)
     network_graph: Mapped[dict] = mapped_column(JSON)
+    # Mergeable aggregates (counts, sums, buckets) so the next call only adds new logs.
+    state: Mapped[dict | None] = mapped_column(JSON, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import JSON, Boolean, String
+from sqlalchemy import JSON, Boolean, Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.db.base import Base
@@ -9,6 +9,7 @@ class FilterAudit(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     """Logs allow/deny decisions for `/api/filter`."""
 
     __tablename__ = "filter_audits"
+    __table_args__ = (Index("ix_filter_audits_created_at", "created_at"),)
 
     request_id: Mapped[str] = mapped_column(String(64), index=True)
     text_hash: Mapped[str] = mapped_column(String(128), index=True)
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+
+
+class SlowRule(BaseModel):
+    rule_id: str
+    samples: int
+    hits: int
+    mean_ms: float
+    max_ms: float
+    total_ms: float
+
+
+class RuleLintFinding(BaseModel):
+    rule_id: str
+    pattern: str
+    reason: str
+    elapsed_ms: float | None = None
+
+
+class RuleProfileResponse(BaseModel):
+    rule_version: str | None = None
+    rule_count: int
+    sample_rate: float
+    sampled_evaluations: int
+    slow_rules: list[SlowRule] = Field(default_factory=list)
+    lint_mode: str
+    lint_findings: list[RuleLintFinding] = Field(default_factory=list)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from typing import Annotated
+
 from pydantic import BaseModel, Field
 
-from src.core.nlp.types import AnalyzerResult, SentimentLabel
+from src.core.nlp.types import AnalyzerBatchItem, AnalyzerResult, SentimentLabel
 
 
 class AnalyzeTextRequest(BaseModel):
@@ -37,3 +39,36 @@ class AnalyzeTextResponse(BaseModel):
             rule_version=result.rule_version,
             latency_ms=result.latency_ms,
         )
+
+
+class AnalyzeBatchRequest(BaseModel):
+    texts: list[Annotated[str, Field(max_length=2048)]] = Field(..., min_length=1, max_length=500)
+
+
+class AnalyzeBatchItem(BaseModel):
+    index: int
+    result: AnalyzeTextResponse | None = None
+    error: str | None = None
+
+
+class AnalyzeBatchResponse(BaseModel):
+    items: list[AnalyzeBatchItem]
+    total: int
+    failed: int
+    latency_ms: float
+
+    @classmethod
+    def from_items(cls, items: list[AnalyzerBatchItem], latency_ms: float) -> "AnalyzeBatchResponse":
+        return cls(
+            items=[
+                AnalyzeBatchItem(
+                    index=item.index,
+                    result=AnalyzeTextResponse.from_result(item.result) if item.result else None,
+                    error=item.error,
+                )
+                for item in items
+            ],
+            total=len(items),
+            failed=sum(1 for item in items if item.error),
+            latency_ms=round(latency_ms, 2),
+        )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
+from typing import Literal
 
 from pydantic import BaseModel, Field, validator
 
@@ -8,6 +9,7 @@ from pydantic import BaseModel, Field, validator
 class EventRequest(BaseModel):
     keyword: str = Field(..., min_length=1, max_length=128)
     hours: int = Field(6, ge=1, le=72)
+    resolution: Literal["minute", "hour", "day"] = Field("hour", description="Emotion series bucket size")
 
 
 class EmotionPoint(BaseModel):
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import Literal
+from typing import TYPE_CHECKING, Annotated, Literal
 
 from pydantic import BaseModel, Field
 
 from src.core.nlp.types import AnalyzerResult
 
+if TYPE_CHECKING:
+    from src.services.filter import FilterBatchResult
+
 
 class FilterDecision(str, Enum):
     allow = "allow"
@@ -16,6 +19,14 @@ class FilterDecision(str, Enum):
 
 class FilterRequest(BaseModel):
     text: str = Field(..., min_length=1, max_length=2048)
+    bypass_cache: bool = Field(
+        False, description="Re-evaluate instead of serving a cached decision (audited re-checks)"
+    )
+
+
+class FilterBatchRequest(BaseModel):
+    texts: list[Annotated[str, Field(max_length=2048)]] = Field(..., min_length=1, max_length=500)
+    bypass_cache: bool = False
 
 
 class FilterEvidence(BaseModel):
@@ -60,3 +71,53 @@ class FilterResponse(BaseModel):
                 "rule_version": analyzer_result.rule_version,
             },
         )
+
+
+class FilterBatchItem(BaseModel):
+    index: int
+    result: FilterResponse | None = None
+    error: str | None = None
+
+
+class FilterBatchTimings(BaseModel):
+    rules_ms: float = 0.0
+    analysis_ms: float = 0.0
+    persist_ms: float = 0.0
+    total_ms: float = 0.0
+    per_item_ms: float = 0.0
+
+
+class FilterBatchResponse(BaseModel):
+    items: list[FilterBatchItem]
+    total: int
+    failed: int
+    cached: int
+    timings: FilterBatchTimings
+
+    @classmethod
+    def from_batch(cls, batch: "FilterBatchResult") -> "FilterBatchResponse":
+        items = [
+            FilterBatchItem(
+                index=entry.index,
+                result=FilterResponse.from_decision(
+                    entry.decision,
+                    entry.allow,
+                    [FilterEvidence(**match.model_dump()) for match in entry.matches],
+                    entry.analyzer_result,
+                )
+                if entry.error is None
+                else None,
+                error=entry.error,
+            )
+            for entry in batch.items
+        ]
+        return cls(
+            items=items,
+            total=len(items),
+            failed=sum(1 for item in items if item.error),
+            cached=batch.cached,
+            timings=FilterBatchTimings(
+                **batch.timings,
+                per_item_ms=round(batch.timings.get("total_ms", 0.0) / max(len(items), 1), 3),
+            ),
+        )
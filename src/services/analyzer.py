@@ -2,10 +2,25 @@ from __future__ import annotations
 
 from fastapi import Depends
 
+from src.core.nlp.document import Document, as_document
 from src.core.nlp.pipeline import NLPPipeline
-from src.core.nlp.types import AnalyzerResult
+from src.core.nlp.rule_matcher import RuleMatcher, get_rule_matcher
+from src.core.nlp.types import AnalyzerBatchItem, AnalyzerResult, build_request_id
+from src.core.singleflight import SingleFlight
 from src.data.analysis_log_repo import AnalysisLogRepository
+from src.data.rollup_repo import rollups_for
+from src.data.term_index_repo import term_index_for
 from src.db.session import get_session
+from src.db.write_behind import get_write_behind
+
+# Shared by every AnalyzerService in the process so identical texts arriving
+# together through analyze, filter and chat run the pipeline once. Values are
+# ``NLPPipeline.analyze_settled_async`` results.
+analysis_flight: SingleFlight[tuple[AnalyzerResult, bool]] = SingleFlight("analysis")
+
+
+def analysis_key(pipeline: NLPPipeline, doc: Document) -> str:
+    return f"{pipeline.version_token}:{doc.text_hash}"
 
 
 class AnalyzerService:
@@ -13,19 +28,61 @@ class AnalyzerService:
         self,
         pipeline: NLPPipeline | None = None,
         repo: AnalysisLogRepository | None = None,
+        rule_matcher: RuleMatcher | None = None,
     ) -> None:
         self.pipeline = pipeline or NLPPipeline()
         self.repo = repo
+        self.rule_matcher = rule_matcher or get_rule_matcher()
+
+    def stamp(self, result: AnalyzerResult) -> AnalyzerResult:
+        rule_version = self.rule_matcher.version or None
+        if result.rule_version == rule_version:
+            return result
+        return result.model_copy(update={"rule_version": rule_version})
+
+    async def analyze_text(self, text: str | Document) -> AnalyzerResult:
+        result, _ = await self.analyze_shared(text)
+        result = self.stamp(result)
+        await self.persist(result)
+        return result
 
-    async def analyze_text(self, text: str) -> AnalyzerResult:
-        result = self.pipeline.analyze(text)
+    async def analyze_shared(self, text: str | Document) -> tuple[AnalyzerResult, bool]:
+        """Join or start the process-wide analysis of ``text`` in ``analysis_flight``."""
+        doc = as_document(text)
+        (result, settled), shared = await analysis_flight.do(
+            analysis_key(self.pipeline, doc), lambda: self.pipeline.analyze_settled_async(doc)
+        )
+        if shared:
+            result = result.model_copy(update={"request_id": build_request_id(), "text": doc.text})
+        return result, settled
+
+    async def persist(self, result: AnalyzerResult) -> None:
         if self.repo is not None:
             await self.repo.create_from_result(result)
-        return result
+
+    async def analyze_keywords(self, text: str | Document) -> AnalyzerResult:
+        """Cheap keyword-only analysis; skips the LLM and is not persisted."""
+        return self.stamp(await self.pipeline.analyze_keywords_async(text))
+
+    async def analyze_batch(self, texts: list[str]) -> list[AnalyzerBatchItem]:
+        items = [
+            item if item.result is None else item.model_copy(update={"result": self.stamp(item.result)})
+            for item in await self.pipeline.analyze_batch_async(texts, analyze=self.analyze_shared)
+        ]
+        if self.repo is not None:
+            await self.repo.bulk_create_from_results(
+                [item.result for item in items if item.result is not None]
+            )
+        return items
 
 
 async def get_analyzer_service(
     session=Depends(get_session),
 ) -> AnalyzerService:
-    repo = AnalysisLogRepository(session)
+    repo = AnalysisLogRepository(
+        session,
+        writer=get_write_behind(),
+        rollups=rollups_for(session),
+        term_index=term_index_for(session),
+    )
     return AnalyzerService(repo=repo)
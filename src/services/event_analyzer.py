@@ -1,45 +1,162 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Callable
 
-from fastapi import Depends
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config.settings import AppSettings, get_settings
 from src.core.graph.builder import build_sentiment_graph
-from src.db.session import get_session
-from src.models.analysis_log import AnalysisLog
+from src.core.nlp.terms import single_term
+from src.db.session import AsyncSessionLocal
+from src.data.event_aggregate_repo import CrisisAggregate, EventAggregateRepository
 from src.data.event_snapshot_repo import EventSnapshotRepository
+from src.data.rollup_repo import Resolution, RollupCell, rollups_for
+from src.data.term_index_repo import term_index_for
+from src.models.event_snapshot import EventSnapshot
 from src.schemas.event import EventInsight, EmotionPoint, CrisisSummary, RepresentativeQuote
 
 
+@dataclass
+class EventWindow:
+    """Mergeable aggregates of one keyword window, persisted as the snapshot ``state``.
+
+    Counts and sums can be extended with newer logs and reduced by logs that
+    fell out of the window; the quotes are the window's top crisis logs.
+    ``settled_end`` is where the stored aggregates stop: logs after it are
+    counted live on every call and left for the next extension, because one
+    of them can still be joined by a late commit with an older ``created_at``.
+    """
+
+    hours: int
+    resolution: str
+    computed_at: datetime
+    count: int = 0
+    crisis_sum: float = 0.0
+    crisis_max: float = 0.0
+    high_risk_count: int = 0
+    buckets: dict[datetime, dict[str, int]] = field(default_factory=dict)
+    quotes: list[RepresentativeQuote] = field(default_factory=list)
+    settled_end: datetime | None = None
+
+    def add(
+        self, summary: CrisisAggregate, buckets: dict[datetime, dict[str, int]], sign: int = 1
+    ) -> None:
+        self.count += sign * summary.count
+        self.crisis_sum += sign * summary.avg_probability * summary.count
+        self.high_risk_count += sign * summary.high_risk_count
+        if sign > 0:
+            self.crisis_max = max(self.crisis_max, summary.max_probability)
+        self._add_buckets(buckets, sign)
+
+    def merge(self, later: "EventWindow") -> None:
+        """Fold in the aggregates and quotes of a disjoint, later window."""
+        self.count += later.count
+        self.crisis_sum += later.crisis_sum
+        self.high_risk_count += later.high_risk_count
+        self.crisis_max = max(self.crisis_max, later.crisis_max)
+        self._add_buckets(later.buckets, 1)
+        if later.quotes:
+            self.quotes = best_quotes(self.quotes + later.quotes)
+
+    def _add_buckets(self, buckets: dict[datetime, dict[str, int]], sign: int) -> None:
+        for bucket, labels in buckets.items():
+            cell = self.buckets.setdefault(bucket, {})
+            for label, count in labels.items():
+                cell[label] = cell.get(label, 0) + sign * count
+                if cell[label] <= 0:
+                    del cell[label]
+            if not cell:
+                del self.buckets[bucket]
+
+    def summary(self) -> CrisisSummary:
+        return CrisisSummary(
+            max_probability=self.crisis_max,
+            avg_probability=self.crisis_sum / self.count if self.count else 0.0,
+            high_risk_count=self.high_risk_count,
+        )
+
+    def to_state(self) -> dict:
+        return {
+            "hours": self.hours,
+            "resolution": self.resolution,
+            "computed_at": self.computed_at.isoformat(),
+            "settled_end": self.settled_end.isoformat() if self.settled_end else None,
+            "count": self.count,
+            "crisis_sum": self.crisis_sum,
+            "crisis_max": self.crisis_max,
+            "high_risk_count": self.high_risk_count,
+            "buckets": {bucket.isoformat(): labels for bucket, labels in self.buckets.items()},
+            "quotes": [
+                {**quote.model_dump(), "timestamp": quote.timestamp.isoformat()} for quote in self.quotes
+            ],
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot: EventSnapshot) -> "EventWindow":
+        state = snapshot.state
+        settled_end = state.get("settled_end")
+        return cls(
+            hours=state["hours"],
+            resolution=state["resolution"],
+            computed_at=datetime.fromisoformat(state["computed_at"]),
+            count=state["count"],
+            crisis_sum=state["crisis_sum"],
+            crisis_max=state["crisis_max"],
+            high_risk_count=state["high_risk_count"],
+            buckets={
+                datetime.fromisoformat(bucket): dict(labels)
+                for bucket, labels in state["buckets"].items()
+            },
+            quotes=[RepresentativeQuote(**quote) for quote in state.get("quotes", [])],
+            settled_end=datetime.fromisoformat(settled_end) if settled_end else None,
+        )
+
+
 class EventAnalyzerService:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
         self.snapshot_repo = EventSnapshotRepository(session)
+        self.aggregate_repo = EventAggregateRepository(session, term_index=term_index_for(session))
+        self.rollup_repo = rollups_for(session)
+        self.settings = get_settings().events
+        self.settle = timedelta(seconds=settle_seconds(get_settings()))
 
-    async def analyze_event(self, keyword: str, hours: int) -> EventInsight:
+    async def analyze_event(
+        self, keyword: str, hours: int, resolution: Resolution = "hour"
+    ) -> EventInsight:
         window_end = datetime.utcnow()
         window_start = window_end - timedelta(hours=hours)
-        stmt = select(AnalysisLog).where(AnalysisLog.created_at >= window_start)
-        if keyword:
-            stmt = stmt.where(AnalysisLog.text.ilike(f"%{keyword}%"))
-        stmt = stmt.order_by(AnalysisLog.created_at)
-        result = await self.session.execute(stmt)
-        logs = result.scalars().all()
-
-        if not logs:
-            snapshot = await self.snapshot_repo.get_latest(keyword)
+        snapshot = await self.snapshot_repo.get(keyword, hours, resolution)
+        term = single_term(keyword) if keyword else ""
+        if (
+            self.rollup_repo is not None
+            and term is not None
+            and not await self.rollup_repo.truncated_since(window_start)
+        ):
+            window = await self._compute_from_rollups(
+                keyword, term, window_start, window_end, hours, resolution
+            )
+            state = window.to_state()
+        else:
+            # A log can commit after a newer one (write-behind stamps created_at
+            # at enqueue; transactions overlap), so only logs before the settle
+            # point go into the stored state and the rest are recounted next time.
+            settled_end = max(window_start, window_end - self.settle)
+            window = await self._extend(
+                snapshot, keyword, window_start, settled_end, hours, resolution
+            )
+            if window is None:
+                window = await self._compute(keyword, window_start, settled_end, hours, resolution)
+            window.settled_end = settled_end
+            state = window.to_state()
+            window.merge(await self._compute(keyword, settled_end, window_end, hours, resolution))
+
+        if not window.count:
             if snapshot:
-                return EventInsight(
-                    keyword=keyword,
-                    window_start=snapshot.window_start,
-                    window_end=snapshot.window_end,
-                    emotion_series=[EmotionPoint(**point) for point in snapshot.emotion_series],
-                    crisis_summary=CrisisSummary(**snapshot.crisis_summary),
-                    representative_quotes=[RepresentativeQuote(**quote) for quote in snapshot.representative_quotes],
-                    network_graph=snapshot.network_graph,
-                )
+                return insight_from_snapshot(snapshot)
             return EventInsight(
                 keyword=keyword,
                 window_start=window_start,
@@ -50,13 +167,15 @@ class EventAnalyzerService:
                 network_graph={"nodes": [], "edges": []},
             )
 
-        emotion_series = build_emotion_series(logs, window_start, window_end)
-        crisis_summary = build_crisis_summary(logs)
-        quotes = build_representative_quotes(logs)
+        emotion_series = build_emotion_series(window.buckets, window_start, window_end)
+        crisis_summary = window.summary()
+        quotes = window.quotes
         graph = build_sentiment_graph([quote.model_dump() for quote in quotes])
 
         await self.snapshot_repo.save_snapshot(
             keyword=keyword,
+            hours=hours,
+            resolution=resolution,
             window_start=window_start,
             window_end=window_end,
             emotion_series=[
@@ -69,6 +188,7 @@ class EventAnalyzerService:
                 for quote in quotes
             ],
             network_graph=graph,
+            state=state,
         )
 
         return EventInsight(
@@ -81,13 +201,141 @@ class EventAnalyzerService:
             network_graph=graph,
         )
 
+    async def _compute(
+        self,
+        keyword: str,
+        window_start: datetime,
+        window_end: datetime,
+        hours: int,
+        resolution: str,
+    ) -> EventWindow:
+        window = EventWindow(hours=hours, resolution=resolution, computed_at=window_end)
+        repo = self.aggregate_repo
+        summary = await repo.crisis_summary(keyword, window_start, window_end=window_end)
+        if summary.count:
+            buckets = await repo.label_counts(
+                keyword, window_start, resolution, window_end=window_end
+            )
+            window.add(summary, buckets)
+            window.quotes = build_representative_quotes(
+                await repo.top_quotes(keyword, window_start, limit=5, window_end=window_end)
+            )
+        return window
+
+    async def _compute_from_rollups(
+        self,
+        keyword: str,
+        term: str,
+        window_start: datetime,
+        window_end: datetime,
+        hours: int,
+        resolution: Resolution,
+    ) -> EventWindow:
+        # O(buckets) rollup rows instead of every matching log.
+        cells = await self.rollup_repo.read(term, window_start, resolution)
+        window = EventWindow(hours=hours, resolution=resolution, computed_at=window_end)
+        window.add(
+            summarize_rollups(cells),
+            {
+                bucket: {label: cell.count for label, cell in labels.items()}
+                for bucket, labels in cells.items()
+            },
+        )
+        if window.count:
+            window.quotes = build_representative_quotes(
+                await self.aggregate_repo.top_quotes(term, window_start, limit=5, whole_term=True)
+            )
+        return window
+
+    async def _extend(
+        self,
+        snapshot: EventSnapshot | None,
+        keyword: str,
+        window_start: datetime,
+        window_end: datetime,
+        hours: int,
+        resolution: str,
+    ) -> EventWindow | None:
+        """Move the stored window forward: add logs since its settle point, drop logs before the new start.
+
+        Returns ``None`` when a full recomputation is needed instead.
+        """
+        if not self.settings.incremental_snapshots or snapshot is None or not snapshot.state:
+            return None
+        if snapshot.state.get("hours") != hours or snapshot.state.get("resolution") != resolution:
+            return None
+        window = EventWindow.from_snapshot(snapshot)
+        if window.settled_end is None:
+            # Computed from rollups up to "now": nothing marks where it is complete.
+            return None
+        previous_start = naive_utc(snapshot.window_start)
+        previous_end = naive_utc(window.settled_end)
+        if not window_start <= previous_end <= window_end:
+            return None
+        age = (window_end - naive_utc(window.computed_at)).total_seconds()
+        if age > self.settings.full_refresh_seconds:
+            return None
 
-def build_emotion_series(logs, window_start: datetime, window_end: datetime) -> list[EmotionPoint]:
-    buckets: dict[datetime, dict[str, int]] = {}
-    for log in logs:
-        bucket_time = log.created_at.replace(minute=0, second=0, microsecond=0)
-        bucket = buckets.setdefault(bucket_time, {"positive": 0, "neutral": 0, "negative": 0})
-        bucket[log.label] = bucket.get(log.label, 0) + 1
+        repo = self.aggregate_repo
+        if previous_start < window_start:
+            expired = await repo.crisis_summary(keyword, previous_start, window_end=window_start)
+            if expired.count:
+                if expired.max_probability >= window.crisis_max:
+                    # The maximum itself left the window and cannot be subtracted.
+                    return None
+                buckets = await repo.label_counts(
+                    keyword, previous_start, resolution, window_end=window_start
+                )
+                window.add(expired, buckets, sign=-1)
+
+        new_quotes: list[RepresentativeQuote] = []
+        added = await repo.crisis_summary(keyword, previous_end, window_end=window_end)
+        if added.count:
+            buckets = await repo.label_counts(
+                keyword, previous_end, resolution, window_end=window_end
+            )
+            window.add(added, buckets)
+            new_quotes = build_representative_quotes(
+                await repo.top_quotes(keyword, previous_end, limit=5, window_end=window_end)
+            )
+
+        if any(naive_utc(quote.timestamp) < window_start for quote in window.quotes):
+            # A quote expired; the next best one may be older than the stored five.
+            window.quotes = build_representative_quotes(
+                await repo.top_quotes(keyword, window_start, limit=5, window_end=window_end)
+            )
+        elif new_quotes:
+            window.quotes = best_quotes(window.quotes + new_quotes)
+        return window
+
+
+def best_quotes(quotes: list[RepresentativeQuote], limit: int = 5) -> list[RepresentativeQuote]:
+    return sorted(quotes, key=lambda quote: (-quote.crisis_probability, quote.timestamp))[:limit]
+
+
+def settle_seconds(settings: AppSettings) -> float:
+    """How far behind now the stored part of an event window ends; covers delayed write-behind flushes."""
+    lag = settings.events.settle_seconds
+    if settings.write_behind.enabled:
+        lag += settings.write_behind.flush_interval_ms / 1000
+    return lag
+
+
+def insight_from_snapshot(snapshot: EventSnapshot) -> EventInsight:
+    return EventInsight(
+        keyword=snapshot.keyword,
+        window_start=snapshot.window_start,
+        window_end=snapshot.window_end,
+        emotion_series=[EmotionPoint(**point) for point in snapshot.emotion_series],
+        crisis_summary=CrisisSummary(**snapshot.crisis_summary),
+        representative_quotes=[RepresentativeQuote(**quote) for quote in snapshot.representative_quotes],
+        network_graph=snapshot.network_graph,
+    )
+
+
+def build_emotion_series(
+    buckets: dict[datetime, dict[str, int]], window_start: datetime, window_end: datetime
+) -> list[EmotionPoint]:
     points = []
     for timestamp in sorted(buckets):
         bucket = buckets[timestamp]
@@ -107,30 +355,49 @@ def build_emotion_series(logs, window_start: datetime, window_end: datetime) ->
     return points
 
 
-def build_crisis_summary(logs) -> CrisisSummary:
-    probs = [log.crisis_probability for log in logs]
-    max_prob = max(probs)
-    avg_prob = sum(probs) / len(probs)
-    high_risk = len([p for p in probs if p >= 0.7])
-    return CrisisSummary(max_probability=max_prob, avg_probability=avg_prob, high_risk_count=high_risk)
-
-
-def build_representative_quotes(logs) -> list[RepresentativeQuote]:
-    sorted_logs = sorted(logs, key=lambda log: log.crisis_probability, reverse=True)
-    quotes = []
-    for log in sorted_logs[:5]:
-        quotes.append(
-            RepresentativeQuote(
-                text=log.text,
-                label=log.label,
-                crisis_probability=log.crisis_probability,
-                timestamp=log.created_at,
-            )
+def naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def summarize_rollups(cells: dict[datetime, dict[str, RollupCell]]) -> CrisisAggregate:
+    total = RollupCell()
+    for labels in cells.values():
+        for cell in labels.values():
+            total.merge(cell.count, cell.crisis_sum, cell.crisis_max, cell.high_risk_count)
+    return CrisisAggregate(
+        count=total.count,
+        max_probability=total.crisis_max,
+        avg_probability=total.crisis_sum / total.count if total.count else 0.0,
+        high_risk_count=total.high_risk_count,
+    )
+
+
+def build_representative_quotes(rows) -> list[RepresentativeQuote]:
+    return [
+        RepresentativeQuote(
+            text=row.text,
+            label=row.label,
+            crisis_probability=row.crisis_probability,
+            timestamp=row.created_at,
         )
-    return quotes
+        for row in rows
+    ]
+
+
+EventAnalyzerFactory = Callable[[], AbstractAsyncContextManager[EventAnalyzerService]]
+
+
+@asynccontextmanager
+async def open_event_analyzer_service() -> AsyncIterator[EventAnalyzerService]:
+    async with AsyncSessionLocal() as session:
+        yield EventAnalyzerService(session)
+
 
+def get_event_analyzer_factory() -> EventAnalyzerFactory:
+    """Open a service, and its session, only where an answer has to be computed.
 
-async def get_event_analyzer_service(
-    session: AsyncSession = Depends(get_session),
-) -> EventAnalyzerService:
-    return EventAnalyzerService(session)
+    With the precompute scheduler on, most requests are served without one.
+    """
+    return open_event_analyzer_service
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from datetime import datetime
+from typing import Callable
+
+from prometheus_client import Counter, Histogram
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config.settings import get_settings
+from src.core.cache import TTLCache
+from src.core.logging.config import get_logger
+from src.core.singleflight import SingleFlight
+from src.data.event_snapshot_repo import EventSnapshotRepository
+from src.data.rollup_repo import Resolution
+from src.db.session import AsyncSessionLocal
+from src.schemas.event import EventInsight
+from src.services.event_analyzer import EventAnalyzerService, insight_from_snapshot, naive_utc
+
+logger = get_logger(__name__)
+
+INSIGHT_REQUESTS = Counter(
+    "dep_event_insight_requests_total",
+    "Event insights served by source (memory, snapshot or computed)",
+    labelnames=("source",),
+)
+REFRESH_SECONDS = Histogram(
+    "dep_event_precompute_round_seconds", "Duration of one background refresh round"
+)
+REFRESH_FAILURES = Counter(
+    "dep_event_precompute_failures_total", "Background refreshes of one event window that failed"
+)
+
+EventKey = tuple[str, int, str]
+
+# Scores below this are forgotten after decaying; caps what a burst of one-off keywords can pin.
+_MIN_SCORE = 0.1
+_MAX_TRACKED = 4096
+
+
+class EventPrecomputeScheduler:
+    """Serves event insights from precomputed windows and keeps the hot ones fresh.
+
+    Every request bumps the score of its ``(keyword, hours, resolution)``;
+    scores decay each round and the highest ones are recomputed in the
+    background, so polling dashboards read from memory or ``event_snapshots``.
+    Requests and refreshes for the same window share one computation.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        interval_seconds: float = 30.0,
+        jitter_seconds: float = 5.0,
+        hot_keys: int = 20,
+        max_concurrency: int = 4,
+        fresh_seconds: float = 60.0,
+        decay: float = 0.5,
+        service_factory: Callable[[AsyncSession], EventAnalyzerService] = EventAnalyzerService,
+    ) -> None:
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.jitter_seconds = jitter_seconds
+        self.hot_keys = hot_keys
+        self.fresh_seconds = fresh_seconds
+        self.decay = decay
+        self.service_factory = service_factory
+        self.scores: dict[EventKey, float] = {}
+        self._insights: TTLCache[EventInsight] = TTLCache(
+            "event_insight", max_entries=max(hot_keys * 4, 64), ttl_seconds=fresh_seconds
+        )
+        self._flight: SingleFlight[EventInsight] = SingleFlight("event_insight")
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._task: asyncio.Task | None = None
+
+    async def get(self, keyword: str, hours: int, resolution: Resolution = "hour") -> EventInsight:
+        key = (keyword, hours, resolution)
+        self.track(key)
+        insight = self._insights.get(_cache_key(key))
+        if insight is not None:
+            INSIGHT_REQUESTS.labels("memory").inc()
+            return insight
+        insight, _ = await self._flight.do(_cache_key(key), lambda: self._load(key, refresh=False))
+        return insight
+
+    def track(self, key: EventKey) -> None:
+        if key not in self.scores and len(self.scores) >= _MAX_TRACKED:
+            return
+        self.scores[key] = self.scores.get(key, 0.0) + 1.0
+
+    def hottest(self) -> list[EventKey]:
+        return sorted(self.scores, key=self.scores.__getitem__, reverse=True)[: self.hot_keys]
+
+    async def refresh_once(self) -> int:
+        """Recompute the hottest windows, then decay every score; returns the windows refreshed."""
+        hot = self.hottest()
+        start = time.perf_counter()
+        results = await asyncio.gather(*(self._refresh(key) for key in hot))
+        REFRESH_SECONDS.observe(time.perf_counter() - start)
+        self.scores = {
+            key: score * self.decay
+            for key, score in self.scores.items()
+            if score * self.decay >= _MIN_SCORE
+        }
+        return sum(results)
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds + random.uniform(0, self.jitter_seconds))
+            try:
+                await self.refresh_once()
+            except Exception as exc:
+                logger.error("event.precompute_round_failed", error=str(exc))
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh(self, key: EventKey) -> bool:
+        async with self._semaphore:
+            try:
+                await self._flight.do(_cache_key(key), lambda: self._load(key, refresh=True))
+            except Exception as exc:
+                REFRESH_FAILURES.inc()
+                logger.warning("event.precompute_failed", keyword=key[0], hours=key[1], error=str(exc))
+                return False
+        return True
+
+    async def _load(self, key: EventKey, refresh: bool) -> EventInsight:
+        keyword, hours, resolution = key
+        async with self.session_factory() as session:
+            insight = None if refresh else await self._fresh_snapshot(session, key)
+            if insight is not None:
+                INSIGHT_REQUESTS.labels("snapshot").inc()
+            else:
+                service = self.service_factory(session)
+                insight = await service.analyze_event(keyword, hours, resolution)
+                INSIGHT_REQUESTS.labels("computed").inc()
+        self._insights.set(_cache_key(key), insight)
+        return insight
+
+    async def _fresh_snapshot(self, session: AsyncSession, key: EventKey) -> EventInsight | None:
+        """The stored snapshot when it covers this window and is recent, e.g. refreshed by another worker."""
+        keyword, hours, resolution = key
+        snapshot = await EventSnapshotRepository(session).get(keyword, hours, resolution)
+        if snapshot is None or not snapshot.state:
+            return None
+        age = (datetime.utcnow() - naive_utc(snapshot.window_end)).total_seconds()
+        if age > self.fresh_seconds:
+            return None
+        return insight_from_snapshot(snapshot)
+
+
+def _cache_key(key: EventKey) -> str:
+    keyword, hours, resolution = key
+    return f"{hours}:{resolution}:{keyword}"
+
+
+_scheduler: EventPrecomputeScheduler | None = None
+
+
+def get_event_precompute() -> EventPrecomputeScheduler | None:
+    global _scheduler
+    settings = get_settings().events
+    if not settings.precompute_enabled:
+        return None
+    if _scheduler is None:
+        _scheduler = EventPrecomputeScheduler(
+            AsyncSessionLocal,
+            interval_seconds=settings.precompute_interval_seconds,
+            jitter_seconds=settings.precompute_jitter_seconds,
+            hot_keys=settings.precompute_hot_keys,
+            max_concurrency=settings.precompute_max_concurrency,
+            fresh_seconds=settings.precompute_fresh_seconds,
+            decay=settings.precompute_decay,
+        )
+    return _scheduler
+
+
+def start_event_precompute() -> EventPrecomputeScheduler | None:
+    scheduler = get_event_precompute()
+    if scheduler is not None:
+        scheduler.start()
+    return scheduler
+
+
+async def stop_event_precompute() -> None:
+    global _scheduler
+    if _scheduler is not None:
+        await _scheduler.stop()
+        _scheduler = None
@@ -1,44 +1,147 @@
 from __future__ import annotations
 
+import asyncio
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Callable
+
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config.settings import get_settings
+from src.core.logging.config import get_logger
+from src.core.nlp.decision_cache import CachedDecision, DecisionCache, get_decision_cache
+from src.core.nlp.document import Document
+from src.core.nlp.pipeline import KeywordScores
 from src.core.nlp.rule_matcher import RuleMatcher
-from src.core.nlp.types import AnalyzerResult
+from src.core.nlp.types import AnalyzerResult, RuleMatch, build_request_id
+from src.core.stage_graph import StageContext, StageGraph, StageRun
 from src.data.analysis_log_repo import AnalysisLogRepository
 from src.data.filter_audit_repo import FilterAuditRepository
-from src.db.session import get_session
+from src.data.rollup_repo import rollups_for
+from src.data.term_index_repo import term_index_for
+from src.db.audit_spool import get_audit_spool
+from src.db.session import AsyncSessionLocal, get_session
+from src.db.write_behind import get_write_behind
 from src.schemas.filter import FilterDecision
-from src.services.analyzer import AnalyzerService, get_analyzer_service
+from src.services.analyzer import (
+    AnalyzerService,
+    analysis_flight,
+    analysis_key,
+    get_analyzer_service,
+)
+
+logger = get_logger(__name__)
+
+# Deferred analyses outlive the request; keep references so they are not collected.
+_background_tasks: set[asyncio.Task] = set()
+# Process-wide cap on deferred analyses running at once, per event loop and limit.
+_deferred_slots: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[int, asyncio.Semaphore]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _deferred_semaphore(limit: int) -> asyncio.Semaphore:
+    slots = _deferred_slots.setdefault(asyncio.get_running_loop(), {})
+    if limit not in slots:
+        slots[limit] = asyncio.Semaphore(limit)
+    return slots[limit]
+
+
+@dataclass
+class FilterBatchEntry:
+    index: int
+    decision: FilterDecision | None = None
+    allow: bool | None = None
+    reason: str | None = None
+    matches: list[RuleMatch] = field(default_factory=list)
+    analyzer_result: AnalyzerResult | None = None
+    stages: list[str] = field(default_factory=list)
+    error: str | None = None
+
+
+@dataclass
+class FilterBatchResult:
+    items: list[FilterBatchEntry]
+    timings: dict[str, float]
+    cached: int = 0
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
 
 
 class FilterService:
+    """Filtering as a stage graph over rules, keyword models and the LLM.
+
+    Independent stages run concurrently, so latency tracks the slowest stage.
+    When a rule match carries one of the configured decisive actions the LLM
+    stage is cancelled and the full analysis (LLM call and analysis log) is
+    deferred to a bounded pool of background tasks or skipped. The stages that actually ran
+    are recorded in the audit snapshot.
+    """
+
     def __init__(
         self,
         analyzer: AnalyzerService,
         audit_repo: FilterAuditRepository | None = None,
         rule_matcher: RuleMatcher | None = None,
+        session_factory: Callable[[], AsyncSession] | None = None,
+        decision_cache: DecisionCache | None = None,
     ) -> None:
+        settings = get_settings().filter
         self.analyzer = analyzer
         self.audit_repo = audit_repo
-        self.rule_matcher = rule_matcher or RuleMatcher()
+        self.rule_matcher = rule_matcher or analyzer.rule_matcher
+        self.session_factory = session_factory
+        self.decision_cache = decision_cache if decision_cache is not None else get_decision_cache()
+        self.short_circuit_actions = set(settings.short_circuit_actions)
+        self.defer_analysis = settings.defer_analysis
+        self.deferred_concurrency = settings.deferred_concurrency
+        self.deferred_max_pending = settings.deferred_max_pending
 
-    async def filter_text(self, text: str) -> tuple[FilterDecision, bool, list, AnalyzerResult]:
-        analyzer_result = await self.analyzer.analyze_text(text)
-        matches = self.rule_matcher.match(text)
-        crisis_prob = analyzer_result.crisis.probability
+    def is_decisive(self, matches: list[RuleMatch]) -> bool:
+        return any(match.action in self.short_circuit_actions for match in matches)
 
+    @staticmethod
+    def decide(
+        matches: list[RuleMatch], analyzer_result: AnalyzerResult
+    ) -> tuple[FilterDecision, bool, str]:
         if matches:
-            decision = FilterDecision.review
-            allow = False
-            reason = "Matched content rules"
-        elif crisis_prob > 0.7:
-            decision = FilterDecision.block
-            allow = False
-            reason = "High crisis probability"
+            return FilterDecision.review, False, "Matched content rules"
+        if analyzer_result.crisis.probability > 0.7:
+            return FilterDecision.block, False, "High crisis probability"
+        return FilterDecision.allow, True, "Clean"
+
+    @property
+    def decision_version(self) -> str:
+        return f"{self.analyzer.pipeline.version_token}:{self.rule_matcher.version}"
+
+    async def filter_text(
+        self, text: str, bypass_cache: bool = False
+    ) -> tuple[FilterDecision, bool, list, AnalyzerResult]:
+        """Decide on ``text``; ``bypass_cache`` forces a fresh evaluation (and refreshes the cache)."""
+        doc = Document.from_text(text)
+        version = self.decision_version
+        if self.decision_cache is not None and not bypass_cache:
+            cached = self.decision_cache.get(doc.text_hash, version)
+            if cached is not None:
+                return await self._serve_cached(doc, cached)
+
+        run = await (await self.build_graph(doc)).run()
+        matches: list[RuleMatch] = run.results["rules"]
+        analyzer_result: AnalyzerResult = run.results["analysis"]
+
+        stages = run.completed()
+        if run.ran("llm") or "llm" not in run.status:
+            # Full analysis (or a cache hit of one): log it like analyze_text does.
+            if self.analyzer.repo is not None:
+                await self.analyzer.persist(analyzer_result)
+                stages.append("analysis_log")
         else:
-            decision = FilterDecision.allow
-            allow = True
-            reason = "Clean"
+            stages.append(self._defer_full_analysis(doc))
+        decision, allow, reason = self.decide(matches, analyzer_result)
 
         if self.audit_repo is not None:
             await self.audit_repo.create(
@@ -49,13 +152,257 @@ class FilterService:
                 allow=allow,
                 matched_rules=[match.model_dump() for match in matches],
                 analyzer_result=analyzer_result,
+                stages=stages,
+                stage_ms=run.durations_ms,
+            )
+        if self.decision_cache is not None and (self.is_decisive(matches) or self._settled(run)):
+            self.decision_cache.set(
+                doc.text_hash,
+                version,
+                CachedDecision(decision, allow, reason, matches, analyzer_result),
             )
         return decision, allow, matches, analyzer_result
 
+    async def filter_batch(self, texts: list[str], bypass_cache: bool = False) -> FilterBatchResult:
+        """Filter a page of texts with one ruleset snapshot, batched analysis and bulk writes.
+
+        Items come back in input order; empty texts are reported as item errors.
+        """
+        start = time.perf_counter()
+        timings: dict[str, float] = {}
+        version = self.decision_version
+        entries: list[FilterBatchEntry | None] = [None] * len(texts)
+        pending: list[tuple[int, Document]] = []
+        cache_hits = 0
+        for index, text in enumerate(texts):
+            if not text.strip():
+                entries[index] = FilterBatchEntry(index=index, error="Text is empty")
+                continue
+            doc = Document.from_text(text)
+            cached = None
+            if self.decision_cache is not None and not bypass_cache:
+                cached = self.decision_cache.get(doc.text_hash, version)
+            if cached is None:
+                pending.append((index, doc))
+                continue
+            cache_hits += 1
+            entries[index] = FilterBatchEntry(
+                index=index,
+                decision=cached.decision,
+                allow=cached.allow,
+                reason=cached.reason,
+                matches=list(cached.matches),
+                analyzer_result=cached.analyzer_result.model_copy(
+                    update={"request_id": build_request_id(), "text": doc.text, "latency_ms": 0.0}
+                ),
+                stages=["decision_cache"],
+            )
+
+        phase = time.perf_counter()
+        all_matches = await self.rule_matcher.match_many_async([doc for _, doc in pending])
+        timings["rules_ms"] = _elapsed_ms(phase)
+
+        phase = time.perf_counter()
+        decisive = [self.is_decisive(matches) for matches in all_matches]
+        full_docs = [doc for (_, doc), short in zip(pending, decisive) if not short]
+        short_docs = [doc for (_, doc), short in zip(pending, decisive) if short]
+        full_items, short_results = await asyncio.gather(
+            # Through analysis_flight, like filter_text: concurrent single calls on a text join in.
+            self.analyzer.pipeline.analyze_batch_async(
+                [doc.text for doc in full_docs], analyze=self.analyzer.analyze_shared
+            ),
+            asyncio.gather(*(self.analyzer.pipeline.analyze_keywords_async(doc) for doc in short_docs)),
+        )
+        timings["analysis_ms"] = _elapsed_ms(phase)
+
+        full_iter = iter(full_items)
+        short_iter = iter(short_results)
+        analysis_logs: list[AnalyzerResult] = []
+        for (index, doc), matches, short in zip(pending, all_matches, decisive):
+            if short:
+                analyzer_result = self.analyzer.stamp(next(short_iter))
+                stages = ["rules", "keywords", self._defer_full_analysis(doc)]
+                settled = True
+            else:
+                item = next(full_iter)
+                if item.result is None:
+                    entries[index] = FilterBatchEntry(index=index, error=item.error)
+                    continue
+                analyzer_result = self.analyzer.stamp(item.result)
+                analysis_logs.append(analyzer_result)
+                stages = ["rules", "analyzer"]
+                settled = item.settled
+            decision, allow, reason = self.decide(matches, analyzer_result)
+            entries[index] = FilterBatchEntry(
+                index=index,
+                decision=decision,
+                allow=allow,
+                reason=reason,
+                matches=matches,
+                analyzer_result=analyzer_result,
+                stages=stages,
+            )
+            # Like filter_text: a keyword fallback for a failed LLM call is not cached.
+            if self.decision_cache is not None and settled:
+                self.decision_cache.set(
+                    doc.text_hash,
+                    version,
+                    CachedDecision(decision, allow, reason, matches, analyzer_result),
+                )
+
+        phase = time.perf_counter()
+        if self.analyzer.repo is not None and analysis_logs:
+            await self.analyzer.repo.bulk_create_from_results(analysis_logs)
+        decided = [entry for entry in entries if entry is not None and entry.decision is not None]
+        if self.audit_repo is not None:
+            await self.audit_repo.bulk_create(
+                [
+                    FilterAuditRepository.build_row(
+                        request_id=entry.analyzer_result.request_id,
+                        text_hash=entry.analyzer_result.text_hash,
+                        decision=entry.decision.value,
+                        reason=entry.reason,
+                        allow=entry.allow,
+                        matched_rules=[match.model_dump() for match in entry.matches],
+                        analyzer_result=entry.analyzer_result,
+                        stages=entry.stages,
+                    )
+                    for entry in decided
+                ]
+            )
+        timings["persist_ms"] = _elapsed_ms(phase)
+        timings["total_ms"] = _elapsed_ms(start)
+        logger.info(
+            "filter.batch",
+            size=len(texts),
+            evaluated=len(pending),
+            cached=cache_hits,
+            **timings,
+        )
+        return FilterBatchResult(
+            items=[entry for entry in entries if entry is not None],
+            timings=timings,
+            cached=cache_hits,
+        )
+
+    def _settled(self, run: StageRun) -> bool:
+        """False when the decision rests on a keyword fallback for a failed LLM call."""
+        if "llm" not in run.status or not self.analyzer.pipeline.llm.enabled:
+            return True
+        return run.ran("llm") and run.results["llm"][1]
+
+    async def _serve_cached(
+        self, doc: Document, cached: CachedDecision
+    ) -> tuple[FilterDecision, bool, list, AnalyzerResult]:
+        analyzer_result = cached.analyzer_result.model_copy(
+            update={"request_id": build_request_id(), "text": doc.text, "latency_ms": 0.0}
+        )
+        if self.audit_repo is not None:
+            await self.audit_repo.create(
+                request_id=analyzer_result.request_id,
+                text_hash=analyzer_result.text_hash,
+                decision=cached.decision.value,
+                reason=cached.reason,
+                allow=cached.allow,
+                matched_rules=[match.model_dump() for match in cached.matches],
+                analyzer_result=analyzer_result,
+                stages=["decision_cache"],
+            )
+        return cached.decision, cached.allow, list(cached.matches), analyzer_result
+
+    async def build_graph(self, doc: Document) -> StageGraph:
+        """Rules, keyword models and the LLM call run concurrently.
+
+        The LLM stage joins ``analysis_flight`` with the keyword scores already
+        being computed, so identical concurrent filter and analyze calls share
+        one analysis. A decisive rule hit cancels the LLM stage, and the
+        analysis stage then assembles a keyword-only result.
+        """
+        pipeline = self.analyzer.pipeline
+        start = time.perf_counter()
+        graph = StageGraph("filter")
+
+        async def rules(ctx: StageContext) -> list[RuleMatch]:
+            matches = await self.rule_matcher.match_async(doc)
+            if self.is_decisive(matches):
+                ctx.cancel("llm")
+            return matches
+
+        graph.stage("rules", rules)
+        cached = await pipeline.cached_result_async(doc, start)
+        if cached is not None:
+
+            async def cached_analysis(ctx: StageContext) -> AnalyzerResult:
+                return self.analyzer.stamp(cached)
+
+            return graph.stage("analysis", cached_analysis)
+
+        scores: asyncio.Future[KeywordScores] | None = None
+
+        def keyword_scores() -> asyncio.Future[KeywordScores]:
+            nonlocal scores
+            if scores is None:
+                scores = pipeline.score_keywords_async(doc)
+            return scores
+
+        async def keywords(ctx: StageContext) -> KeywordScores:
+            return await keyword_scores()
+
+        async def llm(ctx: StageContext) -> tuple[AnalyzerResult, bool]:
+            # Shielded: cancelling the shared analysis must not cancel the keywords stage.
+            (result, settled), shared = await analysis_flight.do(
+                analysis_key(pipeline, doc),
+                lambda: pipeline.analyze_settled_async(doc, keywords=asyncio.shield(keyword_scores())),
+            )
+            if shared:
+                result = result.model_copy(update={"request_id": build_request_id(), "text": doc.text})
+            return result, settled
+
+        async def analysis(ctx: StageContext) -> AnalyzerResult:
+            full = ctx["llm"]
+            if full is not None:
+                return self.analyzer.stamp(full[0])
+            result = pipeline.assemble(doc, ctx["keywords"], None, start)
+            return self.analyzer.stamp(await pipeline.remember_async(result, None))
+
+        graph.stage("keywords", keywords)
+        graph.stage("llm", llm)
+        graph.stage("analysis", analysis, after=("keywords",), optional=("llm",))
+        return graph
+
+    def _defer_full_analysis(self, doc: Document) -> str:
+        if not self.defer_analysis or self.session_factory is None:
+            return "analysis_skipped"
+        if len(_background_tasks) >= self.deferred_max_pending:
+            logger.warning("filter.deferred_analysis_dropped", text_hash=doc.text_hash)
+            return "analysis_skipped"
+        task = asyncio.create_task(self._run_deferred_analysis(doc))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+        return "analysis_deferred"
+
+    async def _run_deferred_analysis(self, doc: Document) -> None:
+        # A batch of decisive items must not open a session and an LLM call each at once.
+        try:
+            async with _deferred_semaphore(self.deferred_concurrency), self.session_factory() as session:
+                analyzer = AnalyzerService(
+                    pipeline=self.analyzer.pipeline,
+                    repo=AnalysisLogRepository(
+                        session,
+                        writer=get_write_behind(),
+                        rollups=rollups_for(session),
+                        term_index=term_index_for(session),
+                    ),
+                    rule_matcher=self.analyzer.rule_matcher,
+                )
+                await analyzer.analyze_text(doc)
+        except Exception as exc:
+            logger.warning("filter.deferred_analysis_failed", text_hash=doc.text_hash, error=str(exc))
+
 
 async def get_filter_service(
     analyzer: AnalyzerService = Depends(get_analyzer_service),
     session=Depends(get_session),
 ) -> FilterService:
-    audit_repo = FilterAuditRepository(session)
-    return FilterService(analyzer=analyzer, audit_repo=audit_repo)
+    audit_repo = FilterAuditRepository(session, spool=get_audit_spool())
+    return FilterService(analyzer=analyzer, audit_repo=audit_repo, session_factory=AsyncSessionLocal)
@@ -31,3 +31,22 @@ def test_analyze_text_empty(monkeypatch):
     response = client.post("/api/analyze_text", json={"text": "   "})
     assert response.status_code == 422
     app.dependency_overrides.clear()
+
+
+def test_analyze_batch_endpoint(monkeypatch):
+    app.dependency_overrides[get_analyzer_service] = override_service
+    client = TestClient(app)
+    client.headers.update({"x-api-key": get_settings().security.api_key})
+
+    response = client.post(
+        "/api/analyze_batch", json={"texts": ["I love this", "  ", "I hate this"]}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["index"] for item in body["items"]] == [0, 1, 2]
+    assert body["items"][0]["result"]["label"] == "positive"
+    assert body["items"][1]["error"] == "Text is empty"
+    assert body["items"][2]["result"]["label"] == "negative"
+    assert body["failed"] == 1
+    app.dependency_overrides.clear()
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 
 from fastapi.testclient import TestClient
@@ -5,11 +6,11 @@ from fastapi.testclient import TestClient
 from src.app import app
 from src.config.settings import get_settings
 from src.schemas.event import EventInsight, EmotionPoint, CrisisSummary, RepresentativeQuote
-from src.services.event_analyzer import EventAnalyzerService, get_event_analyzer_service
+from src.services.event_analyzer import get_event_analyzer_factory
 
 
 class DummyEventAnalyzer:
-    async def analyze_event(self, keyword: str, hours: int) -> EventInsight:
+    async def analyze_event(self, keyword: str, hours: int, resolution: str = "hour") -> EventInsight:
         now = datetime.utcnow()
         return EventInsight(
             keyword=keyword,
@@ -28,12 +29,17 @@ class DummyEventAnalyzer:
         )
 
 
-def override_event_service() -> EventAnalyzerService:
-    return DummyEventAnalyzer()  # type: ignore[return-value]
+@asynccontextmanager
+async def open_dummy_service():
+    yield DummyEventAnalyzer()
+
+
+def override_event_service():
+    return open_dummy_service
 
 
 def test_analyze_event_endpoint(monkeypatch):
-    app.dependency_overrides[get_event_analyzer_service] = override_event_service
+    app.dependency_overrides[get_event_analyzer_factory] = override_event_service
     client = TestClient(app)
     client.headers.update({"x-api-key": get_settings().security.api_key})
 
@@ -45,9 +51,28 @@ def test_analyze_event_endpoint(monkeypatch):
 
 
 def test_analyze_event_validation(monkeypatch):
-    app.dependency_overrides[get_event_analyzer_service] = override_event_service
+    app.dependency_overrides[get_event_analyzer_factory] = override_event_service
     client = TestClient(app)
     client.headers.update({"x-api-key": get_settings().security.api_key})
     response = client.post("/api/analyze_event", json={"keyword": "  ", "hours": 4})
     assert response.status_code == 422
     app.dependency_overrides.clear()
+
+
+def test_analyze_event_precomputed_opens_no_service(monkeypatch):
+    from src.api.routers import event as event_router
+
+    class Scheduler:
+        async def get(self, keyword: str, hours: int, resolution: str = "hour") -> EventInsight:
+            return await DummyEventAnalyzer().analyze_event(keyword, hours, resolution)
+
+    def unused_service():
+        raise AssertionError("a precomputed answer must not open a service")
+
+    monkeypatch.setattr(event_router, "get_event_precompute", lambda: Scheduler())
+    app.dependency_overrides[get_event_analyzer_factory] = lambda: unused_service
+    client = TestClient(app)
+    client.headers.update({"x-api-key": get_settings().security.api_key})
+    response = client.post("/api/analyze_event", json={"keyword": "earthquake", "hours": 4})
+    assert response.status_code == 200
+    app.dependency_overrides.clear()
@@ -33,3 +33,35 @@ def test_filter_empty(monkeypatch):
     response = client.post("/api/filter", json={"text": "   "})
     assert response.status_code == 422
     app.dependency_overrides.clear()
+
+
+def test_admin_rule_profile():
+    client = TestClient(app)
+    client.headers.update({"x-api-key": get_settings().security.api_key})
+
+    response = client.get("/api/admin/rules/profile", params={"limit": 5})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["rule_count"] >= 1
+    assert body["rule_version"]
+    assert isinstance(body["slow_rules"], list)
+    assert body["lint_mode"] in {"off", "warn", "quarantine", "reject"}
+
+
+def test_filter_batch_endpoint():
+    app.dependency_overrides[get_filter_service] = override_filter_service
+    client = TestClient(app)
+    client.headers.update({"x-api-key": get_settings().security.api_key})
+
+    response = client.post(
+        "/api/filter_batch", json={"texts": ["I feel like suicide now", " ", "nice weather"]}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["index"] for item in body["items"]] == [0, 1, 2]
+    assert body["total"] == 3 and body["failed"] == 1
+    assert body["items"][0]["result"]["decision"] == "review"
+    assert body["timings"]["total_ms"] >= 0
+    app.dependency_overrides.clear()
@@ -2,6 +2,7 @@ import pytest
 import pytest_asyncio
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
+from src.core.nlp.pipeline import NLPPipeline
 from src.core.nlp.types import SentimentLabel
 from src.db.base import Base
 from src.services.analyzer import AnalyzerService
@@ -30,3 +31,56 @@ async def test_analyzer_service_logs_results(session):
     stored = await repo.get_by_request_id(result.request_id)
     assert stored is not None
     assert stored.label == SentimentLabel.positive.value
+    assert result.rule_version == service.rule_matcher.version
+    assert stored.rule_version == result.rule_version
+
+
+@pytest.mark.asyncio
+async def test_analyzer_service_batch_bulk_inserts(session):
+    repo = AnalysisLogRepository(session)
+    service = AnalyzerService(repo=repo)
+
+    items = await service.analyze_batch(["I love this", "", "terrible day"])
+
+    assert [item.index for item in items] == [0, 1, 2]
+    assert items[1].result is None and items[1].error
+    for item in (items[0], items[2]):
+        stored = await repo.get_by_request_id(item.result.request_id)
+        assert stored is not None
+        assert stored.text == item.result.text
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_texts_share_one_analysis(tmp_path):
+    import asyncio
+
+    # File-backed database with one session per caller, as with concurrent HTTP requests.
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    make_session = async_sessionmaker(engine, expire_on_commit=False)
+    sessions = [make_session() for _ in range(3)]
+    pipeline = NLPPipeline()
+    calls = 0
+    analyze_settled_async = pipeline.analyze_settled_async
+
+    async def slow_analyze(text):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return await analyze_settled_async(text)
+
+    pipeline.analyze_settled_async = slow_analyze
+    services = [AnalyzerService(pipeline=pipeline, repo=AnalysisLogRepository(s)) for s in sessions]
+
+    results = await asyncio.gather(*(svc.analyze_text("viral repost 42") for svc in services))
+
+    assert calls == 1
+    assert len({result.request_id for result in results}) == 3
+    async with make_session() as session:
+        repo = AnalysisLogRepository(session)
+        for result in results:
+            assert await repo.get_by_request_id(result.request_id) is not None
+    for s in sessions:
+        await s.close()
+    await engine.dispose()
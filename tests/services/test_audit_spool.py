@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.core.nlp.pipeline import NLPPipeline
+from src.data.filter_audit_repo import FilterAuditRepository
+from src.db.audit_spool import AuditSpool, AuditSpoolLoader, SpoolReader, list_segments
+from src.db.base import Base
+from src.models.filter_audit import FilterAudit
+
+
+def _row(result, decision="allow"):
+    return FilterAuditRepository.build_row(
+        request_id=result.request_id,
+        text_hash=result.text_hash,
+        decision=decision,
+        reason="test",
+        allow=decision == "allow",
+        matched_rules=[],
+        analyzer_result=result,
+    )
+
+
+async def _count(session_factory) -> int:
+    async with session_factory() as session:
+        return await session.scalar(select(func.count()).select_from(FilterAudit))
+
+
+@pytest.mark.asyncio
+async def test_spool_loads_resumes_and_serves_unloaded_audits(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'audit.db'}", future=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    spool = AuditSpool(tmp_path / "spool", segment_max_bytes=2048, fsync_interval_ms=1)
+    spool_dir = spool.directory
+    pipeline = NLPPipeline()
+    results = [pipeline.analyze(f"audit message {i}") for i in range(30)]
+
+    async with session_factory() as session:
+        repo = FilterAuditRepository(session, spool=spool)
+        # Concurrent appends share group fsyncs; small segments force rotation.
+        await asyncio.gather(*(repo.bulk_create([_row(result)]) for result in results[:20]))
+        await repo.bulk_create([_row(result) for result in results[20:]])
+        assert len(list_segments(spool_dir)) > 1
+
+        # Not loaded yet: served from the spool.
+        pending = await repo.get_by_request_id(results[5].request_id)
+        assert pending is not None and pending.decision == "allow"
+        assert await _count(session_factory) == 0
+
+    loader = AuditSpoolLoader(
+        spool_dir, session_factory, batch_size=7, active_segment=lambda: spool.active_segment
+    )
+    assert await loader.load_once() == 30
+    assert await _count(session_factory) == 30
+    assert list_segments(spool_dir) == [spool.active_segment]
+
+    # A crash after the commit but before the checkpoint replays rows without duplicates.
+    spool.close()
+    reader = SpoolReader(spool_dir)
+    reader.save_checkpoint(0, 0)
+    restarted = AuditSpool(tmp_path / "spool", fsync_interval_ms=0)
+    # The slot was released on close, so the restarted spool resumes it.
+    assert restarted.directory == spool_dir
+    # The previous segment is now sealed; give it a torn tail as a crash would.
+    with list_segments(spool_dir)[0].open("ab") as fh:
+        fh.write(b"\x00\x00\x01\x00torn")
+    async with session_factory() as session:
+        repo = FilterAuditRepository(session, spool=restarted)
+        await repo.bulk_create([_row(pipeline.analyze("after restart"), decision="block")])
+    resumed = AuditSpoolLoader(
+        spool_dir, session_factory, active_segment=lambda: restarted.active_segment
+    )
+    await resumed.load_once()
+    assert await _count(session_factory) == 31
+    restarted.close()
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_spools_sharing_a_directory_claim_separate_slots(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'audit.db'}", future=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    first = AuditSpool(tmp_path / "spool", fsync_interval_ms=0)
+    second = AuditSpool(tmp_path / "spool", fsync_interval_ms=0)
+    assert first.directory != second.directory
+    pipeline = NLPPipeline()
+    first_result, second_result = pipeline.analyze("from worker 0"), pipeline.analyze("from worker 1")
+    async with session_factory() as session:
+        await FilterAuditRepository(session, spool=first).bulk_create([_row(first_result)])
+        await FilterAuditRepository(session, spool=second).bulk_create([_row(second_result)])
+
+    # Either worker can serve the other's unloaded audit.
+    assert first.find(second_result.request_id) is not None
+
+    loader = AuditSpoolLoader(
+        first.directory, session_factory, active_segment=lambda: first.active_segment
+    )
+    assert await loader.load_once() == 1
+    # The other worker's live segment is untouched.
+    assert list_segments(second.directory) == [second.active_segment]
+    assert second.find(second_result.request_id) is not None
+    first.close()
+    second.close()
+    await engine.dispose()
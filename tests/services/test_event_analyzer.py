@@ -44,3 +44,142 @@ async def test_event_analyzer_builds_series(session):
     assert insight.emotion_series
     assert insight.representative_quotes
     assert insight.network_graph["nodes"]
+
+
+@pytest.mark.asyncio
+async def test_event_analyzer_aggregates_in_sql(session):
+    service = EventAnalyzerService(session)
+    # Stamp the rows safely before the settle point, whatever the wall clock.
+    now = datetime.utcnow() - service.settle - timedelta(minutes=5)
+    rows = [
+        ("quake positive", "positive", 0.1, now),
+        ("quake negative", "negative", 0.9, now),
+        ("quake neutral", "neutral", 0.75, now - timedelta(hours=1)),
+        ("quake worse", "negative", 0.95, now - timedelta(hours=1)),
+        ("unrelated", "negative", 1.0, now),
+        ("quake too old", "negative", 1.0, now - timedelta(hours=10)),
+    ]
+    for text, label, prob, created_at in rows:
+        session.add(
+            AnalysisLog(
+                request_id=text,
+                text_hash=text,
+                text=text,
+                label=label,
+                empathy_score=0.0,
+                crisis_probability=prob,
+                evidence=[],
+                model_version="test",
+                created_at=created_at,
+            )
+        )
+    await session.commit()
+
+    insight = await service.analyze_event("quake", hours=6)
+
+    assert insight.crisis_summary.max_probability == 0.95
+    assert insight.crisis_summary.avg_probability == pytest.approx((0.1 + 0.9 + 0.75 + 0.95) / 4)
+    assert insight.crisis_summary.high_risk_count == 3
+    assert [point.timestamp.hour for point in insight.emotion_series] == [
+        (now - timedelta(hours=1)).hour,
+        now.hour,
+    ]
+    assert insight.emotion_series[-1].positive == 0.5
+    assert insight.emotion_series[-1].negative == 0.5
+    assert [quote.text for quote in insight.representative_quotes] == [
+        "quake worse",
+        "quake negative",
+        "quake neutral",
+        "quake positive",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_event_snapshot_extends_previous_window(session, monkeypatch):
+    from src.config.settings import get_settings
+    from src.models.event_snapshot import EventSnapshot
+    from src.services import event_analyzer
+
+    now = datetime.utcnow()
+    rows = [
+        ("flood warning upstream", "negative", 0.2, now - timedelta(hours=6, minutes=30)),
+        ("flood shelters opened", "positive", 0.9, now - timedelta(hours=3)),
+        ("flood water receding", "neutral", 0.5, now - timedelta(minutes=30)),
+        ("flood volunteers needed", "negative", 0.75, now - timedelta(minutes=10)),
+    ]
+    for text, label, prob, created_at in rows:
+        session.add(
+            AnalysisLog(
+                request_id=text,
+                text_hash=text,
+                text=text,
+                label=label,
+                empathy_score=0.0,
+                crisis_probability=prob,
+                evidence=[],
+                model_version="test",
+                created_at=created_at,
+            )
+        )
+    await session.commit()
+
+    class FrozenClock(datetime):
+        current = now - timedelta(hours=1)
+
+        @classmethod
+        def utcnow(cls):
+            return cls.current
+
+    monkeypatch.setattr(event_analyzer, "datetime", FrozenClock)
+    monkeypatch.setattr(get_settings().events, "full_refresh_seconds", 7200)
+    service = EventAnalyzerService(session)
+    lag = service.settle
+    earlier = await service.analyze_event("flood", hours=6)
+    assert earlier.crisis_summary.max_probability == 0.9
+    assert len(earlier.representative_quotes) == 2
+
+    # A log stamped just before the previous call commits only after it, as a
+    # delayed write-behind flush would; it lies after the stored settle point.
+    session.add(
+        AnalysisLog(
+            request_id="late",
+            text_hash="late",
+            text="flood late report",
+            label="neutral",
+            empathy_score=0.0,
+            crisis_probability=0.4,
+            evidence=[],
+            model_version="test",
+            created_at=now - timedelta(hours=1) - lag / 2,
+        )
+    )
+    await session.commit()
+
+    # An hour later: the oldest log expires and new ones arrive.
+    FrozenClock.current = now
+    queries = []
+    original = service.aggregate_repo.crisis_summary
+
+    async def tracking(keyword, window_start, *, window_end=None):
+        queries.append((window_start, window_end))
+        return await original(keyword, window_start, window_end=window_end)
+
+    monkeypatch.setattr(service.aggregate_repo, "crisis_summary", tracking)
+    extended = await service.analyze_event("flood", hours=6)
+    assert (now - timedelta(hours=1) - lag, now - lag) in queries
+    assert all(start != now - timedelta(hours=6) for start, _ in queries)
+    assert "flood late report" in [quote.text for quote in extended.representative_quotes]
+
+    monkeypatch.setattr(get_settings().events, "incremental_snapshots", False)
+    full = await EventAnalyzerService(session).analyze_event("flood", hours=6)
+    assert extended.crisis_summary.high_risk_count == full.crisis_summary.high_risk_count == 2
+    assert extended.crisis_summary.avg_probability == pytest.approx(full.crisis_summary.avg_probability)
+    assert extended.emotion_series == full.emotion_series
+    assert extended.representative_quotes == full.representative_quotes
+    snapshots = (await session.execute(select(EventSnapshot))).scalars().all()
+    assert len(snapshots) == 1
+
+    # Another window length of the same keyword gets its own snapshot.
+    await EventAnalyzerService(session).analyze_event("flood", hours=3)
+    snapshots = (await session.execute(select(EventSnapshot))).scalars().all()
+    assert sorted((snapshot.hours, snapshot.resolution) for snapshot in snapshots) == [(3, "hour"), (6, "hour")]
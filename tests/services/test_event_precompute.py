@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.data.analysis_log_repo import AnalysisLogRepository
+from src.db.base import Base
+from src.services.analyzer import AnalyzerService
+from src.services.event_analyzer import EventAnalyzerService
+from src.services.event_precompute import EventPrecomputeScheduler
+
+
+class CountingEventAnalyzer(EventAnalyzerService):
+    calls: list[str] = []
+
+    async def analyze_event(self, keyword, hours, resolution="hour"):
+        self.calls.append(keyword)
+        await asyncio.sleep(0.05)
+        return await super().analyze_event(keyword, hours, resolution)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_coalesces_requests_and_refreshes_hot_keywords(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'events.db'}", future=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as session:
+        analyzer = AnalyzerService(repo=AnalysisLogRepository(session))
+        for text in ("earthquake near the coast", "earthquake aftershock tonight", "flood warning"):
+            await analyzer.analyze_text(text)
+
+    CountingEventAnalyzer.calls = []
+    scheduler = EventPrecomputeScheduler(
+        session_factory, hot_keys=1, service_factory=CountingEventAnalyzer
+    )
+    first, second, third = await asyncio.gather(
+        *(scheduler.get("earthquake", 6) for _ in range(3))
+    )
+    assert CountingEventAnalyzer.calls == ["earthquake"]
+    assert first == second == third
+    assert len(first.representative_quotes) == 2
+
+    # Served from memory until the next refresh.
+    assert await scheduler.get("earthquake", 6) == first
+    await scheduler.get("flood", 6)
+    assert CountingEventAnalyzer.calls == ["earthquake", "flood"]
+
+    # Only the hottest window is recomputed; requests meanwhile still read memory.
+    refreshed, served = await asyncio.gather(scheduler.refresh_once(), scheduler.get("earthquake", 6))
+    assert refreshed == 1
+    assert CountingEventAnalyzer.calls == ["earthquake", "flood", "earthquake"]
+    assert scheduler.scores[("earthquake", 6, "hour")] == 2.5
+
+    # Another worker with an empty memory reads the fresh snapshot instead of recomputing.
+    other = EventPrecomputeScheduler(session_factory, service_factory=CountingEventAnalyzer)
+    from_snapshot = await other.get("earthquake", 6)
+    assert len(CountingEventAnalyzer.calls) == 3
+    assert from_snapshot.representative_quotes == served.representative_quotes
+    await other.get("earthquake", 12)
+    assert CountingEventAnalyzer.calls[-1] == "earthquake"
+    await engine.dispose()
@@ -1,10 +1,18 @@
+import asyncio
+import time
+
 import pytest
 import pytest_asyncio
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
+from src.core.cache import TTLCache
+from src.core.nlp.analysis_cache import AnalysisCache
+from src.core.nlp.decision_cache import DecisionCache
+from src.core.nlp.pipeline import NLPPipeline
+from src.core.nlp.rule_matcher import RuleMatcher
 from src.core.nlp.types import SentimentLabel
 from src.db.base import Base
-from src.services.filter import FilterService
+from src.services.filter import FilterService, _background_tasks
 from src.schemas.filter import FilterDecision
 from src.services.analyzer import AnalyzerService
 from src.data.filter_audit_repo import FilterAuditRepository
@@ -39,3 +47,207 @@ async def test_filter_service_flags_matches(session):
     stored = await audit_repo.get_by_request_id(analyzer_result.request_id)
     assert stored is not None
     assert stored.allow is False
+
+
+@pytest.mark.asyncio
+async def test_filter_service_short_circuits_on_decisive_rule(session, monkeypatch):
+    analyzer_service = AnalyzerService(repo=AnalysisLogRepository(session))
+    audit_repo = FilterAuditRepository(session)
+    service = FilterService(analyzer=analyzer_service, audit_repo=audit_repo)
+
+    async def slow_llm(text):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(analyzer_service.pipeline.llm, "classify_async", slow_llm)
+
+    start = time.perf_counter()
+    decision, allow, matches, analyzer_result = await service.filter_text(
+        "I keep thinking about suicide"
+    )
+
+    assert time.perf_counter() - start < 2
+    assert decision == FilterDecision.review
+    assert not allow
+    assert any(match.action == "escalate" for match in matches)
+    stored = await audit_repo.get_by_request_id(analyzer_result.request_id)
+    assert stored.analyzer_snapshot["stages"] == ["rules", "keywords", "analysis", "analysis_skipped"]
+    assert await analyzer_service.repo.get_by_request_id(analyzer_result.request_id) is None
+
+
+@pytest.mark.asyncio
+async def test_filter_service_runs_independent_stages_concurrently(session, monkeypatch):
+    analyzer_service = AnalyzerService(repo=AnalysisLogRepository(session))
+    service = FilterService(analyzer=analyzer_service, audit_repo=FilterAuditRepository(session))
+    original_match = service.rule_matcher.match_async
+
+    async def slow_llm(text):
+        await asyncio.sleep(0.3)
+
+    async def slow_rules(doc):
+        await asyncio.sleep(0.3)
+        return await original_match(doc)
+
+    monkeypatch.setattr(analyzer_service.pipeline.llm, "classify_async", slow_llm)
+    monkeypatch.setattr(service.rule_matcher, "match_async", slow_rules)
+
+    start = time.perf_counter()
+    decision, _, _, analyzer_result = await service.filter_text("what a calm and ordinary afternoon")
+
+    assert time.perf_counter() - start < 0.55
+    assert decision == FilterDecision.allow
+    assert await analyzer_service.repo.get_by_request_id(analyzer_result.request_id) is not None
+
+
+@pytest.mark.asyncio
+async def test_filter_decision_cache_hits_bypass_and_rule_reload(session, tmp_path):
+    rule_file = tmp_path / "rules.yaml"
+    rule_file.write_text(
+        "rules:\n  - id: FIRST\n    action: review\n    patterns:\n      - {type: contains, value: pineapple}\n",
+        encoding="utf-8",
+    )
+    matcher = RuleMatcher(rules_path=str(tmp_path))
+    cache = DecisionCache(TTLCache("decision-test", max_entries=10, ttl_seconds=60))
+    matcher.on_reload(lambda version: cache.invalidate("rules_reloaded"))
+    audit_repo = FilterAuditRepository(session)
+    service = FilterService(
+        analyzer=AnalyzerService(repo=None, rule_matcher=matcher),
+        audit_repo=audit_repo,
+        decision_cache=cache,
+    )
+    text = "pineapple on pizza again"
+
+    first = await service.filter_text(text)
+    second = await service.filter_text(text)
+    assert second[0] == first[0] == FilterDecision.review
+    assert second[3].request_id != first[3].request_id
+    audit = await audit_repo.get_by_request_id(second[3].request_id)
+    assert audit.analyzer_snapshot["stages"] == ["decision_cache"]
+
+    bypassed = await service.filter_text(text, bypass_cache=True)
+    audit = await audit_repo.get_by_request_id(bypassed[3].request_id)
+    assert "rules" in audit.analyzer_snapshot["stages"]
+
+    rule_file.write_text("rules: []\n", encoding="utf-8")
+    assert matcher.reload_if_changed()
+    assert len(cache.memory) == 0
+    decision, allow, matches, _ = await service.filter_text(text)
+    assert decision == FilterDecision.allow and allow and not matches
+
+
+@pytest.mark.asyncio
+async def test_filter_batch_keeps_order_and_bulk_writes_audits(session):
+    analyzer_service = AnalyzerService(repo=AnalysisLogRepository(session))
+    audit_repo = FilterAuditRepository(session)
+    service = FilterService(
+        analyzer=analyzer_service,
+        audit_repo=audit_repo,
+        decision_cache=DecisionCache(TTLCache("decision-batch", max_entries=10, ttl_seconds=60)),
+    )
+    texts = ["I hate you, you are a 废物", "", "a lovely quiet walk", "I hate you, you are a 废物"]
+
+    batch = await service.filter_batch(texts)
+
+    assert [entry.index for entry in batch.items] == [0, 1, 2, 3]
+    assert batch.items[1].error == "Text is empty"
+    assert batch.items[0].decision == FilterDecision.review
+    assert batch.items[2].decision == FilterDecision.allow
+    assert set(batch.timings) == {"rules_ms", "analysis_ms", "persist_ms", "total_ms"}
+    for entry in (batch.items[0], batch.items[2], batch.items[3]):
+        assert await audit_repo.get_by_request_id(entry.analyzer_result.request_id) is not None
+
+    again = await service.filter_batch(texts[:1])
+    assert again.cached == 1
+    assert again.items[0].stages == ["decision_cache"]
+
+
+@pytest.mark.asyncio
+async def test_filter_batch_does_not_cache_llm_fallbacks(session, monkeypatch):
+    analyzer_service = AnalyzerService(repo=None)
+    cache = DecisionCache(TTLCache("decision-fallback", max_entries=10, ttl_seconds=60))
+    service = FilterService(analyzer=analyzer_service, decision_cache=cache)
+
+    async def failed_llm(text):
+        return None
+
+    monkeypatch.setattr(analyzer_service.pipeline.llm, "enabled", True)
+    monkeypatch.setattr(analyzer_service.pipeline.llm, "classify_async", failed_llm)
+
+    batch = await service.filter_batch(["a fallback-only quiet evening", "I keep thinking about suicide"])
+
+    assert batch.items[0].decision == FilterDecision.allow
+    again = await service.filter_batch(["a fallback-only quiet evening", "I keep thinking about suicide"])
+    # The decisive rule hit is cached; the keyword fallback is evaluated again.
+    assert again.cached == 1
+    assert again.items[0].stages == ["rules", "analyzer"]
+    assert again.items[1].stages == ["decision_cache"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_filter_and_analyze_share_one_analysis(session, monkeypatch):
+    analyzer_service = AnalyzerService(repo=None)
+    pipeline = analyzer_service.pipeline
+    calls = 0
+    analyze_settled_async = pipeline.analyze_settled_async
+
+    async def slow_analyze(text, keywords=None):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return await analyze_settled_async(text, keywords=keywords)
+
+    monkeypatch.setattr(pipeline, "analyze_settled_async", slow_analyze)
+    services = [
+        FilterService(
+            analyzer=analyzer_service,
+            decision_cache=DecisionCache(TTLCache(f"decision-flight-{i}", max_entries=10, ttl_seconds=60)),
+        )
+        for i in range(3)
+    ]
+    text = "a shared and perfectly ordinary sentence"
+
+    first, second, analyzed, batch = await asyncio.gather(
+        services[0].filter_text(text),
+        services[1].filter_text(text),
+        analyzer_service.analyze_text(text),
+        services[2].filter_batch([text]),
+    )
+
+    assert calls == 1
+    assert first[0] == second[0] == batch.items[0].decision == FilterDecision.allow
+    request_ids = {first[3].request_id, second[3].request_id, analyzed.request_id}
+    assert len(request_ids | {batch.items[0].analyzer_result.request_id}) == 4
+
+
+@pytest.mark.asyncio
+async def test_deferred_analyses_run_with_bounded_concurrency(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    # A private cache, so the deferred analyses cannot be served from an earlier result.
+    pipeline = NLPPipeline(cache=AnalysisCache(TTLCache("analysis-deferred", max_entries=10, ttl_seconds=60)))
+    analyzer_service = AnalyzerService(pipeline=pipeline, repo=None)
+    service = FilterService(
+        analyzer=analyzer_service,
+        session_factory=async_sessionmaker(engine, expire_on_commit=False),
+        decision_cache=DecisionCache(TTLCache("decision-deferred", max_entries=10, ttl_seconds=60)),
+    )
+    service.defer_analysis = True
+    service.deferred_concurrency = 2
+    running = peak = 0
+
+    async def slow_llm(text):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+
+    monkeypatch.setattr(pipeline.llm, "enabled", True)
+    monkeypatch.setattr(pipeline.llm, "classify_async", slow_llm)
+
+    batch = await service.filter_batch([f"I keep thinking about suicide {i}" for i in range(6)])
+
+    assert all("analysis_deferred" in entry.stages for entry in batch.items)
+    await asyncio.gather(*list(_background_tasks))
+    assert peak == 2
+    await engine.dispose()
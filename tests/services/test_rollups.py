@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from scripts.backfill_rollups import backfill
+from src.config.settings import get_settings
+from src.data.analysis_log_repo import AnalysisLogRepository
+from src.data.rollup_repo import AnalysisRollupRepository
+from src.db.base import Base
+from src.models.analysis_log import AnalysisLog
+from src.models.analysis_rollup import AnalysisRollup
+from src.services.analyzer import AnalyzerService
+from src.services.event_analyzer import EventAnalyzerService
+
+TEXTS = [
+    "earthquake relief is arriving, feeling hopeful",
+    "earthquake aftershocks again, I feel hopeless and want to give up",
+    "东京地震 people are scared",
+    "flood water rising near the school",
+]
+
+
+async def _rollup_rows(session_factory):
+    async with session_factory() as session:
+        rows = await session.execute(
+            select(
+                AnalysisRollup.resolution,
+                AnalysisRollup.term,
+                AnalysisRollup.bucket,
+                AnalysisRollup.label,
+                AnalysisRollup.count,
+                AnalysisRollup.high_risk_count,
+            )
+        )
+        return sorted(rows.all())
+
+
+@pytest.mark.asyncio
+async def test_rollups_match_raw_aggregation_and_backfill(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'rollups.db'}", future=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as session:
+        repo = AnalysisLogRepository(session, rollups=AnalysisRollupRepository(session))
+        analyzer = AnalyzerService(repo=repo)
+        for text in TEXTS[:2]:
+            await analyzer.analyze_text(text)
+        await analyzer.analyze_batch(TEXTS[2:])
+    maintained = await _rollup_rows(session_factory)
+    assert ("hour", "earthquake") in {(row.resolution, row.term) for row in maintained}
+    assert ("minute", "地震") in {(row.resolution, row.term) for row in maintained}
+
+    # Rebuilding from the raw logs yields the same rollups.
+    assert await backfill(session_factory, None, batch_size=3, max_terms=64) == len(TEXTS)
+    assert await _rollup_rows(session_factory) == maintained
+
+    # Move one log back a day so the series spans several buckets, then rebuild.
+    async with session_factory() as session:
+        first = await session.scalar(select(AnalysisLog.id).order_by(AnalysisLog.created_at))
+        await session.execute(
+            update(AnalysisLog)
+            .where(AnalysisLog.id == first)
+            .values(created_at=datetime.utcnow() - timedelta(hours=30))
+        )
+        await session.commit()
+    await backfill(session_factory, None, batch_size=100, max_terms=64)
+
+    async with session_factory() as session:
+        raw = await EventAnalyzerService(session).analyze_event("earthquake", hours=48)
+        monkeypatch.setattr(get_settings().rollups, "enabled", True)
+        service = EventAnalyzerService(session)
+        assert service.rollup_repo is not None
+        rolled = await service.analyze_event("earthquake", hours=48)
+        daily = await service.analyze_event("earthquake", hours=48, resolution="day")
+        cjk = await service.analyze_event("地震", hours=1)
+        # A lone ideograph is not a rollup term of "东京地震"; it is served from the raw logs.
+        ideograph = await service.analyze_event("震", hours=1)
+
+    assert rolled.crisis_summary == raw.crisis_summary
+    assert rolled.emotion_series == raw.emotion_series
+    assert len(rolled.emotion_series) == 2
+    assert all(point.timestamp.hour == 0 for point in daily.emotion_series)
+    assert cjk.crisis_summary.high_risk_count == 0 and cjk.emotion_series
+    assert ideograph.representative_quotes and ideograph.emotion_series == cjk.emotion_series
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_rollup_path_matches_raw_for_quotes_and_truncated_logs(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'rollups.db'}", future=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(get_settings().rollups, "enabled", True)
+    monkeypatch.setattr(get_settings().rollups, "max_terms_per_log", 4)
+
+    async with session_factory() as session:
+        repo = AnalysisLogRepository(session, rollups=AnalysisRollupRepository(session, max_terms=4))
+        analyzer = AnalyzerService(repo=repo)
+        # "earthquake" contains "quake" only as a substring.
+        await analyzer.analyze_text("earthquake, I want help")
+        await analyzer.analyze_text("small quake felt downtown")
+
+        service = EventAnalyzerService(session)
+        rolled = await service.analyze_event("quake", hours=1)
+        assert [quote.text for quote in rolled.representative_quotes] == ["small quake felt downtown"]
+
+        # Past the four-term cap: the rollups cannot count "quake" for this log.
+        await analyzer.analyze_text("one two three four five quake")
+        assert await service.rollup_repo.truncated_since(datetime.utcnow() - timedelta(hours=1))
+        served = await service.analyze_event("quake", hours=1)
+        monkeypatch.setattr(get_settings().rollups, "enabled", False)
+        raw = await EventAnalyzerService(session).analyze_event("quake", hours=1)
+
+    assert "one two three four five quake" in [quote.text for quote in served.representative_quotes]
+    assert served.emotion_series == raw.emotion_series
+    assert served.crisis_summary == raw.crisis_summary
+    await engine.dispose()
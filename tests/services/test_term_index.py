@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.data.analysis_log_repo import AnalysisLogRepository
+from src.data.event_aggregate_repo import EventAggregateRepository
+from src.data.term_index_repo import TermIndexRepository
+from src.db.base import Base
+from src.models.analysis_log import AnalysisLog
+from src.models.analysis_log_term import AnalysisLogTerm
+from src.services.analyzer import AnalyzerService
+
+TEXTS = [
+    "Earthquake near the coast, rescue teams arriving",
+    "another earthquake aftershock tonight",
+    "the coast guard reports calm seas",
+    "东京发生地震，救援队已出发",
+    "地震过后大家都很害怕",
+]
+
+
+@pytest_asyncio.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async_session = async_sessionmaker(engine, expire_on_commit=False)
+    async with async_session() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_term_index_resolves_keywords_like_ilike(session):
+    repo = AnalysisLogRepository(session, term_index=TermIndexRepository(session))
+    analyzer = AnalyzerService(repo=repo)
+    await analyzer.analyze_text(TEXTS[0])
+    await analyzer.analyze_batch(TEXTS[1:])
+    terms = set(await session.scalars(select(AnalysisLogTerm.term)))
+    assert {"earthquake", "coast", "地震", "东京"} <= terms
+
+    # Age one earthquake log out of the window; the index prunes it by created_at.
+    old = await session.scalar(select(AnalysisLog.id).where(AnalysisLog.text == TEXTS[1]))
+    aged = datetime.utcnow() - timedelta(hours=10)
+    await session.execute(update(AnalysisLog).where(AnalysisLog.id == old).values(created_at=aged))
+    await session.execute(
+        update(AnalysisLogTerm).where(AnalysisLogTerm.log_id == old).values(created_at=aged)
+    )
+    await session.commit()
+
+    window_start = datetime.utcnow() - timedelta(hours=6)
+    scan = EventAggregateRepository(session)
+    indexed = EventAggregateRepository(session, term_index=TermIndexRepository(session))
+    keywords = ("earthquake", "Earthquake", "coast", "地震", "东京发生", "震", "怕", "rescue teams", "teams rescue")
+    for keyword in keywords:
+        expected = await scan.crisis_summary(keyword, window_start)
+        actual = await indexed.crisis_summary(keyword, window_start)
+        assert actual == expected, keyword
+    assert (await indexed.crisis_summary("earthquake", window_start)).count == 1
+    assert (await indexed.crisis_summary("teams rescue", window_start)).count == 0
+    assert (await indexed.crisis_summary("震", window_start)).count == 2
+    # Latin keywords match whole words through the index, unlike an ilike scan.
+    assert (await scan.crisis_summary("quake", window_start)).count == 1
+    assert (await indexed.crisis_summary("quake", window_start)).count == 0
@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.core.nlp.pipeline import NLPPipeline
+from src.data.analysis_log_repo import AnalysisLogRepository
+from src.data.chat_message_repo import ChatMessageRepository
+from src.db.base import Base
+from src.db.write_behind import WriteBehindQueue
+from src.models.analysis_log import AnalysisLog
+from src.models.chat_message import ChatMessage
+
+
+@pytest.mark.asyncio
+async def test_write_behind_batches_and_drains_on_stop(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'wb.db'}", future=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    writer = WriteBehindQueue(
+        "test", session_factory, max_size=8, batch_size=5, flush_interval_ms=50
+    )
+
+    async with session_factory() as session:
+        analysis_repo = AnalysisLogRepository(session, writer=writer)
+        chat_repo = ChatMessageRepository(session, writer=writer)
+        pipeline = NLPPipeline()
+        for i in range(12):
+            log = await analysis_repo.create_from_result(pipeline.analyze(f"message number {i}"))
+            assert log.id is not None and log.created_at is not None
+        message = await chat_repo.add_message(
+            ChatMessage(room_id="r", user_id="u", text="hi", sentiment="neutral", crisis_probability=0.0)
+        )
+        assert message.created_at is not None
+
+    await writer.stop()
+    assert not writer.running
+
+    async with session_factory() as session:
+        logs = await session.scalar(select(func.count()).select_from(AnalysisLog))
+        chats = await session.scalar(select(func.count()).select_from(ChatMessage))
+    assert (logs, chats) == (12, 1)
+    await engine.dispose()
@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+from src.core.cache import SQLiteCache, TTLCache
+from src.core.nlp.analysis_cache import AnalysisCache
+from src.core.nlp.pipeline import NLPPipeline
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache("test", max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_pipeline_serves_repeats_from_cache(tmp_path):
+    cache = AnalysisCache(
+        TTLCache("test", max_entries=10, ttl_seconds=60),
+        SQLiteCache("test", str(tmp_path / "cache.db"), ttl_seconds=60),
+    )
+    pipeline = NLPPipeline(cache=cache)
+
+    first = pipeline.analyze("I love this project")
+    second = pipeline.analyze("I love this project ")
+
+    assert second.request_id != first.request_id
+    assert second.text == "I love this project "
+    assert second.sentiment == first.sentiment
+
+    # A fresh worker sharing only the disk tier still hits.
+    other = AnalysisCache(TTLCache("test", 10, 60), cache.disk)
+    assert other.get(first.text_hash, pipeline.version_token) is not None
+
+
+def test_new_version_invalidates_entries(tmp_path):
+    cache = AnalysisCache(
+        TTLCache("test", max_entries=10, ttl_seconds=60),
+        SQLiteCache("test", str(tmp_path / "cache.db"), ttl_seconds=60),
+    )
+    result = NLPPipeline(cache=cache).analyze("hello there")
+    cache.set(result, "v1")
+
+    assert cache.get(result.text_hash, "v2") is None
+    assert cache.get(result.text_hash, "v1") is None
+    assert len(cache.memory) == 0
+
+
+@pytest.mark.asyncio
+async def test_async_path_uses_disk_tier_off_the_event_loop(tmp_path, monkeypatch):
+    disk = SQLiteCache("test", str(tmp_path / "cache.db"), ttl_seconds=60)
+    threads = []
+    for name in ("get", "set"):
+        original = getattr(disk, name)
+
+        def tracked(*args, _original=original):
+            threads.append(threading.current_thread())
+            return _original(*args)
+
+        monkeypatch.setattr(disk, name, tracked)
+    pipeline = NLPPipeline(cache=AnalysisCache(TTLCache("test", 10, 60), disk))
+
+    first = await pipeline.analyze_async("I love this project")
+    # A fresh worker sharing only the disk tier reads it on a thread as well.
+    other = NLPPipeline(cache=AnalysisCache(TTLCache("test", 10, 60), disk))
+    second = await other.analyze_async("I love this project")
+
+    assert second.sentiment == first.sentiment
+    assert len(threads) >= 3
+    assert threading.main_thread() not in threads
@@ -0,0 +1,48 @@
+from src.core.nlp.lexicon import KeywordAutomaton, LexiconEngine
+from src.core.nlp.model_registry import ModelRegistry
+from src.core.nlp.pipeline import CrisisDetector, EmpathyScorer, SentimentClassifier
+
+
+def test_automaton_finds_overlapping_patterns():
+    automaton = KeywordAutomaton()
+    ids = {word: automaton.add(word) for word in ["he", "she", "his", "hers", "伤害"]}
+    automaton.compile()
+
+    found = automaton.find_ids("ushers 伤害")
+
+    assert found == {ids["he"], ids["she"], ids["hers"], ids["伤害"]}
+
+
+def test_engine_keeps_manifest_order_and_duplicates():
+    engine = LexiconEngine()
+    engine.add_terms("demo", "positive", ["Love", "great", "love"])
+    engine.compile()
+
+    hits = engine.scan("GREAT, I LOVE it")
+
+    assert hits.terms("demo", "positive") == ["Love", "great", "love"]
+    assert hits.count("demo", "negative") == 0
+
+
+def test_scorers_match_substring_semantics():
+    registry = ModelRegistry()
+    sentiment = SentimentClassifier(registry)
+    empathy = EmpathyScorer(registry)
+    crisis = CrisisDetector(registry)
+    text = "So sorry, I hate this and want to KILL MYSELF now 伤心"
+
+    scores = {"positive": 0.1, "neutral": 0.1, "negative": 0.1}
+    for label, keywords in sentiment.manifest["keywords"].items():
+        for kw in keywords:
+            if kw.lower() in text.lower():
+                scores[label] += 1.0
+    total = sum(scores.values())
+    result = sentiment.predict(text)
+    assert {label.value: value for label, value in result.scores.items()} == {
+        label: value / total for label, value in scores.items()
+    }
+
+    assert empathy.score(text).rationale == "Detected empathic cues: sorry"
+    match = crisis.predict(text)
+    assert match.evidence == ["kill myself"]
+    assert match.metadata["probability"] == 0.5
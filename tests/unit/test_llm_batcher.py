@@ -0,0 +1,77 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.config.settings import LLMSettings
+from src.core.nlp.llm_batcher import LLMBatcher
+from src.core.nlp.llm_transport import LLMTransport
+from src.core.nlp.pipeline import NLPPipeline
+
+
+def openai_stub(requests: list):
+    """OpenAI-compatible /chat/completions stub answering batch prompts."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        items = json.loads(body["messages"][1]["content"])
+        requests.append(items)
+        results = [
+            {"index": item["index"], "label": "negative", "crisis_probability": 0.9}
+            for item in items
+            if "malformed" not in item["text"]
+        ]
+        content = json.dumps({"results": results})
+        return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+    return handler
+
+
+def make_batcher(requests: list, **kwargs) -> LLMBatcher:
+    settings = LLMSettings(base_url="http://llm.test/v1", api_key="secret")
+    transport = LLMTransport(settings, async_transport=httpx.MockTransport(openai_stub(requests)))
+    return LLMBatcher(transport, model="stub", **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_request():
+    requests: list = []
+    batcher = make_batcher(requests, max_batch_size=8, max_wait_ms=20)
+
+    results = await asyncio.gather(*(batcher.classify(f"text {i}") for i in range(5)))
+
+    assert len(requests) == 1
+    assert [item["text"] for item in requests[0]] == [f"text {i}" for i in range(5)]
+    assert all(result.label == "negative" for result in results)
+
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_without_waiting():
+    requests: list = []
+    batcher = make_batcher(requests, max_batch_size=2, max_wait_ms=10_000)
+
+    await asyncio.wait_for(
+        asyncio.gather(*(batcher.classify(str(i)) for i in range(4))), timeout=1
+    )
+
+    assert [len(items) for items in requests] == [2, 2]
+
+
+@pytest.mark.asyncio
+async def test_malformed_item_falls_back_to_keywords():
+    requests: list = []
+    pipeline = NLPPipeline()
+    pipeline.cache = None
+    pipeline.llm.enabled = True
+    pipeline.llm.batch_enabled = True
+    pipeline.llm._batcher = make_batcher(requests, max_batch_size=8, max_wait_ms=5)
+
+    good, bad = await asyncio.gather(
+        pipeline.analyze_async("all fine"),
+        pipeline.analyze_async("malformed but I love it"),
+    )
+
+    assert len(requests) == 1
+    assert good.crisis.probability == 0.9
+    assert bad.sentiment.label.value == "positive"
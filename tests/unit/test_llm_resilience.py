@@ -0,0 +1,81 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from src.config.settings import LLMSettings
+from src.core.circuit_breaker import CircuitBreaker, CircuitState
+from src.core.nlp.llm_classifier import LLMClassifier
+from src.core.nlp.llm_transport import LLMTransport
+
+OK = {"choices": [{"message": {"content": json.dumps({"label": "positive", "crisis_probability": 0.1})}}]}
+
+
+def make_classifier(handler, **settings) -> LLMClassifier:
+    llm_settings = LLMSettings(base_url="http://llm.test/v1", api_key="secret", **settings)
+    transport = LLMTransport(
+        llm_settings,
+        transport=httpx.MockTransport(handler),
+        async_transport=httpx.MockTransport(handler),
+    )
+    classifier = LLMClassifier(transport=transport)
+    classifier.enabled = True
+    classifier.batch_enabled = False
+    classifier.breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout_seconds=0.05)
+    return classifier
+
+
+def test_breaker_opens_and_half_opens():
+    breaker = CircuitBreaker("unit", failure_threshold=2, reset_timeout_seconds=0.01)
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.open and not breaker.allow_request()
+
+    time.sleep(0.02)
+    assert breaker.try_acquire_probe()
+    assert not breaker.try_acquire_probe()
+    breaker.record_success()
+    assert breaker.state is CircuitState.closed
+
+
+def test_transport_retries_transient_status():
+    statuses = iter([503, 200])
+
+    def handler(request):
+        status = next(statuses)
+        return httpx.Response(status, json=OK if status == 200 else {})
+
+    classifier = make_classifier(handler, retry_attempts=2)
+
+    assert classifier.classify("hi").label == "positive"
+    assert classifier.transport.stats()["requests"] == 2
+
+
+@pytest.mark.asyncio
+async def test_budget_exceeded_falls_back_and_opens_breaker():
+    slow = True
+
+    async def handler(request):
+        if slow:
+            await asyncio.sleep(1)
+        return httpx.Response(200, json=OK)
+
+    classifier = make_classifier(handler)
+    classifier.budget = 0.05
+
+    started = time.perf_counter()
+    assert await classifier.classify_async("one") is None
+    assert await classifier.classify_async("two") is None
+    assert time.perf_counter() - started < 0.5
+    assert classifier.breaker.state is CircuitState.open
+
+    # Open circuit answers immediately; after the reset timeout a background probe closes it.
+    slow = False
+    await asyncio.sleep(0.06)
+    assert await classifier.classify_async("three") is None
+    await asyncio.sleep(0.05)
+    assert classifier.breaker.state is CircuitState.closed
+    assert (await classifier.classify_async("four")).label == "positive"
@@ -0,0 +1,67 @@
+import json
+import time
+
+import httpx
+import pytest
+
+from src.config.settings import LLMSettings
+from src.core.nlp.llm_classifier import LLMClassifier
+from src.core.nlp.llm_transport import LLMTransport
+
+
+def completion(payload: dict) -> httpx.Response:
+    return httpx.Response(
+        200, json={"choices": [{"message": {"content": json.dumps(payload)}}]}
+    )
+
+
+def make_transport(handler) -> LLMTransport:
+    settings = LLMSettings(base_url="http://llm.test/v1", api_key="secret")
+    return LLMTransport(
+        settings,
+        transport=httpx.MockTransport(handler),
+        async_transport=httpx.MockTransport(handler),
+    )
+
+
+@pytest.mark.asyncio
+async def test_classifier_reuses_shared_transport():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return completion({"label": "negative", "crisis_probability": 0.8})
+
+    transport = make_transport(handler)
+    classifier = LLMClassifier(transport=transport)
+    classifier.enabled = True
+
+    assert classifier.classify("one").label == "negative"
+    assert (await classifier.classify_async("two")).crisis_probability == 0.8
+
+    assert [r.url.path for r in seen] == ["/v1/chat/completions"] * 2
+    assert seen[0].headers["authorization"] == "Bearer secret"
+    assert transport.stats()["requests"] == 2
+    await transport.aclose()
+    assert transport.client.is_closed and transport.async_client.is_closed
+
+
+def test_sync_retries_stay_within_latency_budget():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request.extensions["timeout"]["read"])
+        time.sleep(0.04)
+        raise httpx.ReadTimeout("slow", request=request)
+
+    settings = LLMSettings(base_url="http://llm.test/v1", api_key="secret", retry_attempts=10)
+    transport = LLMTransport(settings, transport=httpx.MockTransport(handler))
+    classifier = LLMClassifier(transport=transport)
+    classifier.enabled = True
+    classifier.budget = 0.1
+
+    start = time.perf_counter()
+    assert classifier.classify("slow") is None
+    assert time.perf_counter() - start < 0.3
+    assert 1 <= len(attempts) < 10
+    assert all(timeout <= 0.1 for timeout in attempts)
@@ -1,3 +1,7 @@
+import asyncio
+
+import pytest
+
 from src.core.nlp.pipeline import NLPPipeline
 from src.core.nlp.types import SentimentLabel
 
@@ -21,3 +25,46 @@ def test_pipeline_crisis_detection():
     assert result.crisis.probability >= 0.5
     assert "suicide" in result.crisis.indicators
     assert any(chunk.label == "crisis" for chunk in result.evidence)
+
+
+def test_pipeline_accepts_prebuilt_document():
+    from src.core.nlp.document import Document
+
+    pipeline = NLPPipeline()
+    doc = Document.from_text("Great  news,   I LOVE it")
+    result = pipeline.analyze(doc)
+
+    assert [token.text for token in doc.tokens] == ["Great", "news,", "I", "LOVE", "it"]
+    assert doc.tokens[1].start == 7
+    assert result.text_hash == doc.text_hash
+    assert {chunk.text for chunk in result.evidence} == {"Great", "LOVE"}
+
+
+@pytest.mark.asyncio
+async def test_analyze_async_keeps_event_loop_responsive():
+    from src.core.nlp.llm_classifier import LLMClassificationResult
+
+    pipeline = NLPPipeline()
+    pipeline.cache = None
+    pipeline.llm.enabled = True
+
+    async def slow_classify(text):
+        await asyncio.sleep(0.2)
+        return LLMClassificationResult(label="negative", crisis_probability=0.9)
+
+    pipeline.llm.classify_async = slow_classify
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    result = await pipeline.analyze_async("I feel hopeless")
+    task.cancel()
+
+    assert result.sentiment.label == SentimentLabel.negative
+    assert result.crisis.probability == 0.9
+    assert ticks >= 5
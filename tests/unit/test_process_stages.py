@@ -0,0 +1,71 @@
+import pytest
+
+from src.config.settings import get_settings
+from src.core.nlp import process_stages
+from src.core.nlp.document import Document
+from src.core.nlp.pipeline import NLPPipeline
+from src.core.nlp.process_stages import StagePool, shutdown_stage_pool
+from src.core.nlp.rule_matcher import RuleMatcher
+from src.core.nlp.rule_profiler import rule_profiler
+
+
+def test_stage_pool_matches_in_process_results():
+    pipeline = NLPPipeline()
+    matcher = RuleMatcher()
+    text = "I feel hopeless and want to kill myself, nobody can help"
+    pool = StagePool(max_workers=1)
+    try:
+        keywords = pool.submit_keywords(pipeline, text).result(timeout=60)
+        matches, _ = pool.submit_rules(matcher, text, None).result(timeout=60)
+    finally:
+        pool.shutdown()
+
+    expected = pipeline.score_keywords(Document.from_text(text))
+    assert keywords.sentiment == expected.sentiment
+    assert keywords.crisis == expected.crisis
+    assert [m.rule_id for m in matches] == [m.rule_id for m in matcher.match(text)]
+
+
+@pytest.mark.asyncio
+async def test_rule_matcher_match_async_thread_mode():
+    matcher = RuleMatcher()
+    matches = await matcher.match_async("they will kill myself immediately")
+    assert "CRISIS_LANGUAGE" in {m.rule_id for m in matches}
+
+
+@pytest.mark.asyncio
+async def test_process_mode_reports_profiles_and_warms_pool_on_reload(tmp_path, monkeypatch):
+    rules_dir = tmp_path / "rules"
+    rules_dir.mkdir()
+    rule = "rules:\n  - id: {id}\n    patterns:\n      - type: regex\n        value: 'kill\\s+myself'\n"
+    (rules_dir / "crisis.yaml").write_text(rule.format(id="FIRST"))
+    monkeypatch.setattr(get_settings().pipeline, "execution_mode", "process")
+    monkeypatch.setattr(get_settings().pipeline, "process_workers", 1)
+    rule_profiler.reset()
+    try:
+        matcher = RuleMatcher(rules_path=str(rules_dir), cache_dir=None)
+        matcher.profile_sample_rate = 1.0
+        matches = await matcher.match_async("they will kill myself immediately")
+        assert [m.rule_id for m in matches] == ["FIRST"]
+        # The worker's sampled timing and hit reach the parent's profiler.
+        assert rule_profiler.sampled_evaluations == 1
+        assert dict(rule_profiler.top())["FIRST"].hits == 1
+
+        spawned = []
+        original = process_stages.ProcessPoolExecutor
+
+        def tracking(*args, **kwargs):
+            spawned.append(kwargs["initargs"][1])
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(process_stages, "ProcessPoolExecutor", tracking)
+        (rules_dir / "crisis.yaml").write_text(rule.format(id="SECOND"))
+        assert matcher.reload()
+        # The pool was rebuilt for the new rules by the reload, not by a request.
+        assert [[r["id"] for r in rules] for rules in spawned] == [["SECOND"]]
+        matches = await matcher.match_async("they will kill myself immediately")
+        assert [m.rule_id for m in matches] == ["SECOND"]
+        assert len(spawned) == 1
+    finally:
+        shutdown_stage_pool()
+        rule_profiler.reset()
@@ -0,0 +1,86 @@
+import pytest
+
+from src.core.nlp.rule_linter import RuleLinter, RuleLintError
+from src.core.nlp.rule_matcher import RuleMatcher, load_ruleset
+from src.core.nlp.rule_profiler import RuleProfiler
+
+LINTED_RULES = """
+rules:
+  - id: SAFE
+    action: review
+    patterns:
+      - type: regex
+        value: '\\bself\\s*harm\\b'
+  - id: CATASTROPHIC
+    action: review
+    patterns:
+      - type: contains
+        value: needle
+      - type: regex
+        value: '(a+)+$'
+  - id: BACKTRACKING
+    action: review
+    patterns:
+      - type: regex
+        value: '(?:a|aa)+c'
+"""
+
+
+def test_linter_flags_super_linear_regexes():
+    findings = RuleLinter(budget_ms=10, timeout_ms=1000).lint(
+        [
+            {"id": "A", "patterns": [{"type": "regex", "value": r"\d{3}-\d{4}"}]},
+            {"id": "B", "patterns": [{"type": "regex", "value": r"(\w+\s?)*$"}]},
+            {"id": "C", "patterns": [{"type": "regex", "value": r"(?:a|aa)+c"}]},
+            {"id": "D", "patterns": [{"type": "regex", "value": r"(\d{3}-)+\d{4}"}]},
+            {"id": "E", "patterns": [{"type": "regex", "value": r"(?:\bfoo\s+){2,}bar"}]},
+        ]
+    )
+    flagged = {finding.rule_id: finding.reason for finding in findings}
+    # Nested quantifiers alone are not a verdict; only the benchmark flags.
+    assert set(flagged) == {"B", "C"}
+    assert flagged["B"] in {"super-linear backtracking", "benchmark timed out"}
+    assert flagged["C"] in {"super-linear backtracking", "benchmark timed out"}
+
+
+def test_rule_matcher_quarantines_and_rejects(tmp_path):
+    (tmp_path / "rules.yaml").write_text(LINTED_RULES, encoding="utf-8")
+
+    matcher = RuleMatcher(rules_path=str(tmp_path), lint_mode="quarantine")
+    assert [rule["id"] for rule in matcher.rules] == ["SAFE", "CATASTROPHIC"]
+    assert matcher.rules[1]["patterns"] == [{"type": "contains", "value": "needle"}]
+    assert {finding.rule_id for finding in matcher.lint_findings} == {"CATASTROPHIC", "BACKTRACKING"}
+
+    # With no previous ruleset to keep, reject mode fails startup instead of
+    # serving with zero rules.
+    with pytest.raises(RuleLintError):
+        RuleMatcher(rules_path=str(tmp_path), lint_mode="reject")
+    with pytest.raises(RuleLintError):
+        load_ruleset(tmp_path, linter=RuleLinter(), lint_mode="reject")
+
+    # A later rejected reload keeps the published ruleset.
+    (tmp_path / "rules.yaml").write_text(LINTED_RULES.split("  - id: CATASTROPHIC")[0], encoding="utf-8")
+    rejecting = RuleMatcher(rules_path=str(tmp_path), lint_mode="reject")
+    version = rejecting.version
+    (tmp_path / "rules.yaml").write_text(LINTED_RULES, encoding="utf-8")
+    assert rejecting.reload() is False
+    assert rejecting.version == version
+    assert [rule["id"] for rule in rejecting.rules] == ["SAFE"]
+
+
+def test_sampled_matches_record_per_rule_timings():
+    matcher = RuleMatcher(
+        rules=[
+            {"id": "R1", "patterns": [{"type": "regex", "value": r"foo\d+"}]},
+            {"id": "R2", "patterns": [{"type": "contains", "value": "bar"}]},
+        ]
+    )
+    matcher.profiler = RuleProfiler()
+    matcher.profile_sample_rate = 1.0
+
+    matches = matcher.match("foo42 bar")
+
+    assert [m.rule_id for m in matches] == ["R1", "R2"]
+    top = dict(matcher.profiler.top())
+    assert top["R1"].samples == 1 and top["R1"].hits == 1
+    assert matcher.profiler.sampled_evaluations == 1
@@ -1,4 +1,8 @@
-from src.core.nlp.rule_matcher import RuleMatcher
+import re
+import time
+
+from src.core.nlp import rule_matcher as rule_matcher_module
+from src.core.nlp.rule_matcher import RuleMatcher, RuleWatcher
 
 
 def test_rule_matcher_detects_crisis():
@@ -46,5 +50,122 @@ rules:
 """,
         encoding="utf-8",
     )
+    # match() never touches the filesystem; changes are picked up explicitly
+    # (or by the background RuleWatcher).
+    assert not matcher.match("something bar here")
+    assert matcher.reload_if_changed()
     matches = matcher.match("something bar here")
     assert matches
+
+
+RULE_TEMPLATE = """
+rules:
+  - id: WATCHED
+    action: review
+    patterns:
+      - type: contains
+        value: {value}
+"""
+
+
+def _wait_for(predicate, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_rule_watcher_swaps_ruleset_in_background(tmp_path):
+    rule_file = tmp_path / "rules.yaml"
+    rule_file.write_text(RULE_TEMPLATE.format(value="alpha"), encoding="utf-8")
+    matcher = RuleMatcher(rules_path=str(tmp_path))
+    old_version = matcher.version
+    watcher = RuleWatcher(matcher, poll_interval=0.1)
+    watcher.start()
+    try:
+        time.sleep(0.2)
+        rule_file.write_text(RULE_TEMPLATE.format(value="omega"), encoding="utf-8")
+        assert _wait_for(lambda: matcher.version != old_version)
+    finally:
+        watcher.stop()
+    assert not watcher.running
+    assert matcher.match("omega here")
+    assert not matcher.match("alpha here")
+
+
+def test_rule_matcher_keeps_ruleset_when_reload_fails(tmp_path):
+    rule_file = tmp_path / "rules.yaml"
+    rule_file.write_text(RULE_TEMPLATE.format(value="alpha"), encoding="utf-8")
+    matcher = RuleMatcher(rules_path=str(tmp_path))
+    rule_file.write_text("rules: [unclosed", encoding="utf-8")
+    assert not matcher.reload_if_changed()
+    assert matcher.match("alpha here")
+
+
+def _naive_match(rules, text):
+    matched = []
+    for rule in rules:
+        evidence = []
+        for pattern in rule.get("patterns", []):
+            value = pattern.get("value", "")
+            if not value:
+                continue
+            if pattern.get("type", "contains") == "contains" and value.lower() in text.lower():
+                evidence.append(value)
+            elif pattern.get("type") == "regex" and re.search(value, text, flags=re.IGNORECASE):
+                evidence.append(value)
+        if evidence:
+            matched.append((rule["id"], evidence))
+    return matched
+
+
+def test_compiled_rules_match_naive_evaluation():
+    rules = []
+    for i in range(120):
+        rules.append(
+            {
+                "id": f"R{i}",
+                "patterns": [
+                    {"type": "contains", "value": f"Word{i % 17}"},
+                    {"type": "regex", "value": rf"\bterm{i % 23}\b"},
+                    {"type": "regex", "value": r"(ab)\1" if i == 5 else rf"x{i}y+"},
+                    {"type": "contains", "value": ""},
+                ],
+            }
+        )
+    rules.append({"id": "SHARED", "patterns": [{"type": "contains", "value": "word3"}]})
+    matcher = RuleMatcher(rules=rules)
+    texts = [
+        "WORD3 and term4 appear here",
+        "x7yyy abab word16",
+        "nothing relevant",
+        "term22 Word0 x119y",
+    ]
+    for text in texts:
+        got = [(m.rule_id, m.evidence) for m in matcher.match(text)]
+        assert got == _naive_match(rules, text)
+
+
+def test_rule_version_is_content_hash_and_compiled_ruleset_cached(tmp_path, monkeypatch):
+    rules_dir = tmp_path / "rules"
+    rules_dir.mkdir()
+    (rules_dir / "rules.yaml").write_text(RULE_TEMPLATE.format(value="alpha"), encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+
+    first = RuleMatcher(rules_path=str(rules_dir), cache_dir=str(cache_dir))
+    assert len(first.version) == 16
+    assert list(cache_dir.glob("ruleset-*.pickle"))
+
+    def fail_parse(sources):
+        raise AssertionError("compiled ruleset should come from the disk cache")
+
+    monkeypatch.setattr(rule_matcher_module, "parse_rules", fail_parse)
+    second = RuleMatcher(rules_path=str(rules_dir), cache_dir=str(cache_dir))
+    assert second.version == first.version
+    assert second.match("alpha here")
+
+    # Touching a file without changing its content keeps the version.
+    (rules_dir / "rules.yaml").write_text(RULE_TEMPLATE.format(value="alpha"), encoding="utf-8")
+    assert not second.reload_if_changed()
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from src.core.stage_graph import StageGraph
+
+
+@pytest.mark.asyncio
+async def test_stage_graph_dependencies_cancellation_and_failures():
+    async def fast(ctx):
+        ctx.cancel("slow")
+        return 1
+
+    async def slow(ctx):
+        await asyncio.sleep(10)
+        return 2
+
+    async def combine(ctx):
+        return (ctx["fast"], ctx["slow"])
+
+    async def needs_slow(ctx):
+        return "unreachable"
+
+    graph = (
+        StageGraph("test")
+        .stage("fast", fast)
+        .stage("slow", slow)
+        .stage("combine", combine, after=("fast",), optional=("slow",))
+        .stage("needs_slow", needs_slow, after=("slow",))
+    )
+    run = await asyncio.wait_for(graph.run(), timeout=2)
+
+    assert run.results["combine"] == (1, None)
+    assert run.status == {
+        "fast": "done",
+        "slow": "cancelled",
+        "combine": "done",
+        "needs_slow": "skipped",
+    }
+
+    async def boom(ctx):
+        raise RuntimeError("stage failed")
+
+    with pytest.raises(RuntimeError):
+        await StageGraph("test").stage("boom", boom).run()